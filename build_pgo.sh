@@ -0,0 +1,27 @@
+#!/bin/bash
+# PGO（プロファイル誘導最適化）2段ビルド
+# 1. 計測ビルド → 2. 代表ワークロード実行 → 3. プロファイル適用ビルド
+
+set -e
+
+echo "PGO Build - Profile Guided Optimization"
+echo "======================================="
+echo ""
+
+echo "[1/3] Instrumented build (GB_PGO=generate)..."
+rm -rf pgo build
+GB_PGO=generate uv run python setup.py build_ext --inplace
+
+echo ""
+echo "[2/3] Training run (mooneye timer tests as workload)..."
+# 実際のオペコード分布でディスパッチループの分岐プロファイルを採取する
+uv run python scripts/testing/mooneye_test_runner.py || true
+
+echo ""
+echo "[3/3] Optimized rebuild (GB_PGO=use)..."
+rm -rf build
+GB_PGO=use uv run python setup.py build_ext --inplace
+
+echo ""
+echo "======================================="
+echo "PGO build completed"
@@ -5,8 +5,23 @@ Analyze boot ROM transition and initial game ROM execution
 
 import sys
 import time
+from array import array
+from bisect import bisect_right
+
 from src.gameboy.emulator import GameBoy
 
+# PC範囲の分類テーブル。if/elifカスケード（最大6回のPython比較）を
+# bisect（C実装の二分探索1回）+タプル添字に置き換える
+_PC_RANGE_BOUNDS = (0x0100, 0x8000, 0xA000, 0xC000, 0xE000)
+_PC_RANGE_LABELS = (
+    "Boot ROM (0x0000-0x00FF)",
+    "Game ROM (0x0100-0x7FFF)",
+    "VRAM (0x8000-0x9FFF)",
+    "External RAM (0xA000-0xBFFF)",
+    "Work RAM (0xC000-0xDFFF)",
+    "High RAM (0xE000+)",
+)
+
 def analyze_boot_rom_transition():
     """Analyze boot ROM transition to game ROM"""
     print("🔄 Analyzing boot ROM transition and game ROM initialization...")
@@ -20,68 +35,71 @@ def analyze_boot_rom_transition():
     # Track key events
     boot_disable_detected = False
     boot_disable_cycle = 0
-    pc_transitions = []
+    # PC遷移のトレースバッファ: タプルのリスト（イベントごとに
+    # Pythonタプルを確保するAoS）ではなく、型付き配列3本のSoAで持つ。
+    # ラベル文字列ではなく範囲インデックスを記録し、整形は最後だけ
+    transition_cycles = array('Q')  # 発生サイクル
+    transition_pcs = array('H')     # 発生時のPC
+    transition_ranges = array('B')  # _PC_RANGE_LABELSのインデックス
     
     print(f"🚀 Running for {max_cycles:,} cycles...")
     print("Monitoring boot ROM disable and PC transitions...")
     print()
     
     start_time = time.time()
-    last_pc_range = None
-    
-    try:
-        while cycles < max_cycles:
-            # Check boot ROM disable register (0xFF50)
-            boot_disable = gameboy.memory.read_byte(0xFF50)
-            if not boot_disable_detected and boot_disable != 0:
-                boot_disable_detected = True
-                boot_disable_cycle = cycles
-                print(f"🔓 Boot ROM disabled at cycle {cycles:,}, PC: 0x{gameboy.cpu.pc:04X}")
-            
-            current_pc = gameboy.cpu.pc
-            
-            # Determine PC range
-            if current_pc < 0x0100:
-                pc_range = "Boot ROM (0x0000-0x00FF)"
-            elif current_pc < 0x8000:
-                pc_range = "Game ROM (0x0100-0x7FFF)"
-            elif current_pc < 0xA000:
-                pc_range = "VRAM (0x8000-0x9FFF)"
-            elif current_pc < 0xC000:
-                pc_range = "External RAM (0xA000-0xBFFF)"
-            elif current_pc < 0xE000:
-                pc_range = "Work RAM (0xC000-0xDFFF)"
-            else:
-                pc_range = "High RAM (0xE000+)"
-            
-            # Track PC range transitions
-            if pc_range != last_pc_range:
-                pc_transitions.append((cycles, current_pc, pc_range))
-                print(f"📍 PC transition at cycle {cycles:,}: 0x{current_pc:04X} ({pc_range})")
-                last_pc_range = pc_range
-            
-            step_cycles = gameboy.step()
-            cycles += step_cycles
-            
-            # Progress every 500k cycles
-            if cycles % 500000 == 0:
-                elapsed = time.time() - start_time
-                speed = cycles / elapsed / 1000000
-                print(f"{cycles//1000:3d}k cycles - PC: 0x{current_pc:04X} - {speed:.1f}M/s - Range: {pc_range}")
-                
-                if elapsed > 5:  # 5 second timeout
-                    print("⏰ 5 second timeout reached")
-                    break
-                    
-    except KeyboardInterrupt:
-        print("⏸️ Interrupted by user")
-    except Exception as e:
-        print(f"💥 Error: {e}")
-        import traceback
-        traceback.print_exc()
-    
+    last_range_idx = -1
+    next_progress = 500_000  # 次に進捗を表示する累積サイクル数
+
+    # ホットループにはtry/exceptを被せない（tryブロックは一部の
+    # ピープホール最適化を無効にする）。例外処理は__main__側の
+    # 外側ラッパーに寄せ、エラーはそのまま伝播させる
+    while cycles < max_cycles:
+        # Boot ROM無効化の検出: 0xFF50のread_byte()ポーリングではなく
+        # MMUが書き込み時に記録するboot_disabled_cycleを直接参照する
+        if not boot_disable_detected and gameboy.memory.boot_disabled_cycle >= 0:
+            boot_disable_detected = True
+            boot_disable_cycle = gameboy.memory.boot_disabled_cycle
+            print(f"🔓 Boot ROM disabled at cycle {boot_disable_cycle:,}, PC: 0x{gameboy.cpu.pc:04X}")
+
+        current_pc = gameboy.cpu.pc
+
+        # Determine PC range (二分探索1回でインデックスを得る。
+        # 比較は整数どうしで行い、ラベル文字列は表示時のみ引く)
+        range_idx = bisect_right(_PC_RANGE_BOUNDS, current_pc)
+
+        # Track PC range transitions
+        if range_idx != last_range_idx:
+            transition_cycles.append(cycles)
+            transition_pcs.append(current_pc)
+            transition_ranges.append(range_idx)
+            print(f"📍 PC transition at cycle {cycles:,}: 0x{current_pc:04X} ({_PC_RANGE_LABELS[range_idx]})")
+            last_range_idx = range_idx
+
+        step_cycles = gameboy.step()
+        cycles += step_cycles
+
+        # Progress every 500k cycles
+        # 剰余演算は毎stepのムダ（step_cycles>1でちょうどの値を
+        # 跨ぐと報告を落とす）。しきい値との整数比較1回に置き換える
+        if cycles >= next_progress:
+            next_progress += 500_000
+            elapsed = time.time() - start_time
+            speed = cycles / elapsed / 1000000
+            print(f"{cycles//1000:3d}k cycles - PC: 0x{current_pc:04X} - {speed:.1f}M/s - Range: {_PC_RANGE_LABELS[range_idx]}")
+
+            if elapsed > 5:  # 5 second timeout
+                print("⏰ 5 second timeout reached")
+                break
+
+
     elapsed = time.time() - start_time
     final_pc = gameboy.cpu.pc
+
+    # ウォームアップ済み状態を書き出す（font_analysis.py等が復元して
+    # 同じ2Mサイクルの前段を払い直さずに済む）
+    with open("post_boot.snap", "wb") as f:
+        f.write(gameboy.snapshot())
+    print("💾 Saved post-boot state to post_boot.snap")
     
     print(f"\n📊 Boot ROM Analysis Results:")
     print(f"   Total cycles: {cycles:,}")
@@ -94,26 +112,21 @@ def analyze_boot_rom_transition():
         print(f"   Time to boot disable: {boot_disable_cycle / 4194304 * 1000:.1f}ms")
     
     print(f"\n🗺️  PC Transition Summary:")
-    for i, (cycle, pc, range_name) in enumerate(pc_transitions):
-        print(f"   {i+1}. Cycle {cycle:,}: PC 0x{pc:04X} -> {range_name}")
+    for i, (cycle, pc, range_idx) in enumerate(
+            zip(transition_cycles, transition_pcs, transition_ranges)):
+        print(f"   {i+1}. Cycle {cycle:,}: PC 0x{pc:04X} -> {_PC_RANGE_LABELS[range_idx]}")
     
     # Check ROM header information
     print(f"\n📋 Game ROM Header Analysis:")
     
     # ROM title (0x0134-0x0143)
-    title = ""
-    for addr in range(0x0134, 0x0144):
-        char_code = gameboy.memory.read_byte(addr)
-        if 32 <= char_code <= 126:
-            title += chr(char_code)
-        else:
-            break
+    # 1バイトずつのread_byte()×16ではなく、ROM配列のスライス1回で読む
+    raw_title = bytes(gameboy.memory.rom[0x0134:0x0144])
+    title = raw_title.split(b'\x00', 1)[0].decode('ascii', 'replace')
     print(f"   Title: '{title.strip()}'")
-    
+
     # Entry point (0x0100-0x0103)
-    entry_point = []
-    for addr in range(0x0100, 0x0104):
-        entry_point.append(gameboy.memory.read_byte(addr))
+    entry_point = bytes(gameboy.memory.rom[0x0100:0x0104])
     print(f"   Entry point: {' '.join(f'0x{b:02X}' for b in entry_point)}")
     
     # Cartridge type
@@ -133,16 +146,18 @@ def analyze_boot_rom_transition():
         print(f"\n🎮 Game ROM Execution Analysis:")
         
         # Look for signs of initialization
-        lcdc = gameboy.memory.read_byte(0xFF40)
+        # MMIOの観測はread_byte()のメソッドチェーン（タイマーレジスタは
+        # timer.tick()の副作用も伴う）ではなく、裏の属性を直接読む
+        lcdc = gameboy.memory.io[0x40]
         print(f"   LCDC register: 0x{lcdc:02X} ({'LCD ON' if lcdc & 0x80 else 'LCD OFF'})")
-        
+
         # Check if interrupts are set up
-        ie = gameboy.memory.read_byte(0xFFFF)
-        ime = gameboy.cpu.ime
+        ie = gameboy.memory.ie
+        ime = gameboy.cpu.interrupt_master_enable
         print(f"   Interrupts: IE=0x{ie:02X}, IME={ime}")
-        
+
         # Check timer setup
-        tac = gameboy.memory.read_byte(0xFF07)
+        tac = gameboy.timer.TAC
         print(f"   Timer: TAC=0x{tac:02X} ({'ON' if tac & 0x04 else 'OFF'})")
         
         # Check if game ROM has written anything to VRAM
@@ -160,4 +175,11 @@ def analyze_boot_rom_transition():
         print(f"\n❓ Unclear state: PC=0x{final_pc:04X}, Boot disabled={boot_disable_detected}")
 
 if __name__ == "__main__":
-    analyze_boot_rom_transition()
\ No newline at end of file
+    try:
+        analyze_boot_rom_transition()
+    except KeyboardInterrupt:
+        print("⏸️ Interrupted by user")
+    except Exception as e:
+        print(f"💥 Error: {e}")
+        import traceback
+        traceback.print_exc()
\ No newline at end of file
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+オペコード実装カバレッジ / サイクル数アナライザ
+
+cpu.pyを正規表現でスキャンする代わりに、
+- 実装状況: 生成済みディスパッチテーブルを直接検査（O(1)、文字列解析なし）
+- サイクル数: ast.parseによる構造解析（バックトラックなし）
+で解析する。
+"""
+
+import ast
+import functools
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+sys.path.append('src')
+
+from gameboy.memory import Memory
+from gameboy.cpu import CPU
+
+CPU_SOURCE_PATH = 'src/gameboy/cpu.py'
+
+# LR35902に存在しないオペコード
+INVALID_OPCODES = frozenset(
+    (0xD3, 0xDB, 0xDD, 0xE3, 0xE4, 0xEB, 0xEC, 0xED, 0xF4, 0xFC, 0xFD))
+
+# 有効オペコードの256ビットマスク（SWAR: 集合演算を整数ビット演算で行う）
+VALID_MASK = ((1 << 256) - 1) ^ sum(1 << op for op in INVALID_OPCODES)
+
+
+def iter_bits(mask):
+    """立っているビット位置を昇順でyield"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def analyze_dispatch_table():
+    """ディスパッチテーブルから実装済み/未実装オペコードのビットマスクを抽出
+
+    Returns:
+        (implemented_mask, missing_mask) — 256ビット整数の対
+    """
+    cpu = CPU(Memory())
+
+    implemented_mask = 0
+    for opcode, handler in enumerate(cpu.opcode_table):
+        if getattr(handler, '__name__', '') != '_op_unimplemented':
+            implemented_mask |= 1 << opcode
+
+    implemented_mask &= VALID_MASK
+    missing_mask = VALID_MASK & ~implemented_mask
+    return implemented_mask, missing_mask
+
+
+# 条件分岐命令の期待サイクル (taken, not taken) — Blargg/Pan Docs準拠。
+# cpu.pyの条件分岐はccファクトリ（NZ/Z/NC/C共通のクロージャ生成）に
+# 集約されているので、ファミリごとに1エントリ
+CONDITIONAL_CYCLES = {
+    '_make_jr_cc': (12, 8),
+    '_make_jp_cc': (16, 12),
+    '_make_call_cc': (24, 12),
+    '_make_ret_cc': (20, 8),
+}
+
+
+def _cycle_adds(node):
+    """ノード配下の self.cycles += 定数 を合計"""
+    total = 0
+    for stmt in ast.walk(node):
+        if (isinstance(stmt, ast.AugAssign)
+                and isinstance(stmt.op, ast.Add)
+                and isinstance(stmt.target, ast.Attribute)
+                and stmt.target.attr == 'cycles'
+                and isinstance(stmt.value, ast.Constant)):
+            total += stmt.value.value
+    return total
+
+
+def extract_cycle_counts(source):
+    """各_op_*ハンドラとccファクトリのself.cycles += N を AST走査で収集
+
+    条件分岐命令はif/else枝を別々に集計し (taken, not_taken) の対を
+    返す。先頭マッチだけ取って片側を落とすことはしない。
+
+    Returns:
+        {メソッド名: [加算値, ...]} — 分岐命令は[taken, not_taken]
+    """
+    tree = ast.parse(source)
+    cycles = {}
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef):
+            continue
+
+        if node.name in CONDITIONAL_CYCLES:
+            # ccファクトリは内側のhandler定義を解析対象にし、
+            # 本体直下の if (f & mask)... / else を taken / not taken に分離
+            body = node.body
+            for stmt in node.body:
+                if isinstance(stmt, ast.FunctionDef):
+                    body = stmt.body
+                    break
+            base = 0
+            taken = not_taken = 0
+            for stmt in body:
+                if isinstance(stmt, ast.If) and stmt.orelse:
+                    taken = _cycle_adds(ast.Module(stmt.body, []))
+                    not_taken = sum(_cycle_adds(s) for s in stmt.orelse)
+                else:
+                    base += _cycle_adds(stmt)
+            cycles[node.name] = [base + taken, base + not_taken]
+        elif node.name.startswith('_op_'):
+            counts = []
+            for stmt in ast.walk(node):
+                if (isinstance(stmt, ast.AugAssign)
+                        and isinstance(stmt.op, ast.Add)
+                        and isinstance(stmt.target, ast.Attribute)
+                        and stmt.target.attr == 'cycles'
+                        and isinstance(stmt.value, ast.Constant)):
+                    counts.append(stmt.value.value)
+            if counts:
+                cycles[node.name] = counts
+
+    return cycles
+
+
+@functools.lru_cache(maxsize=1)
+def _cycle_counts_cached(mtime):
+    """mtimeをキーにしたプロセス内メモ化 + コンテンツハッシュのファイルキャッシュ
+
+    pre-commitフック等で繰り返し起動されるケース向けに、解析結果を
+    cpu.pyのblake2bハッシュをキーに/tmpへJSONで永続化する。ソースが
+    変わらない限り再解析せず、AST走査(数十ms)をプロセスをまたいで回避。
+    """
+    with open(CPU_SOURCE_PATH, 'rb') as f:
+        content = f.read()
+
+    # blake2b: 暗号強度は不要で速度優先（~200KBのソースに十分）
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    cache_path = f'/tmp/gb_emu_opcode_coverage_{digest}.json'
+
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)
+
+    result = extract_cycle_counts(content.decode())
+    with open(cache_path, 'w') as f:
+        json.dump(result, f)
+    return result
+
+
+def get_cycle_counts():
+    """cpu.pyのハンドラ別サイクル数（変更がない限り再解析しない）"""
+    return _cycle_counts_cached(os.path.getmtime(CPU_SOURCE_PATH))
+
+
+# ハンドラ名の先頭トークン → 表示カテゴリ（1パス分類用）
+CATEGORY = {
+    'ld': 'load', 'ldh': 'load',
+    'add': 'arith', 'adc': 'arith', 'sub': 'arith', 'sbc': 'arith',
+    'and': 'arith', 'xor': 'arith', 'or': 'arith', 'cp': 'arith',
+    'inc': 'arith', 'dec': 'arith', 'daa': 'arith', 'cpl': 'arith',
+    'jp': 'jump', 'jr': 'jump', 'call': 'jump', 'ret': 'jump',
+    'reti': 'jump', 'rst': 'jump',
+    'push': 'stack', 'pop': 'stack',
+}
+CATEGORY_ORDER = ('load', 'arith', 'jump', 'stack', 'misc')
+
+
+def classify(handler_name):
+    """_op_xxx_yyy / _make_xxx_cc の先頭トークンからカテゴリを1回で決定"""
+    prefix = 4 if handler_name.startswith('_op_') else 6
+    head = handler_name[prefix:].split('_', 1)[0]
+    return CATEGORY.get(head, 'misc')
+
+
+def main():
+    print("🔍 オペコードカバレッジ解析")
+    print("=" * 60)
+
+    implemented_mask, missing_mask = analyze_dispatch_table()
+    total_valid = VALID_MASK.bit_count()
+    implemented_count = implemented_mask.bit_count()
+
+    print(f"実装済み: {implemented_count}/{total_valid} "
+          f"({implemented_count / total_valid:.1%})")
+
+    if missing_mask:
+        print(f"\n❌ 未実装オペコード ({missing_mask.bit_count()}個):")
+        for opcode in iter_bits(missing_mask):
+            print(f"  0x{opcode:02X}")
+    else:
+        print("✅ 有効なオペコードはすべて実装済み")
+
+    print("\n⏱️  サイクル数レポート（カテゴリ別）:")
+    cycle_counts = get_cycle_counts()
+
+    # 1パスでカテゴリに振り分けてから表示（カテゴリ数×全走査を回避）
+    buckets = defaultdict(list)
+    for name, counts in cycle_counts.items():
+        buckets[classify(name)].append((name, counts))
+
+    mismatches = []
+    for category in CATEGORY_ORDER:
+        if not buckets[category]:
+            continue
+        print(f"  [{category}]")
+        for name, counts in sorted(buckets[category]):
+            if name in CONDITIONAL_CYCLES:
+                taken, not_taken = counts
+                expected = CONDITIONAL_CYCLES[name]
+                mark = "" if (taken, not_taken) == expected else " ⚠️"
+                if mark:
+                    mismatches.append((name, (taken, not_taken), expected))
+                print(f"    {name}: taken={taken}T / not_taken={not_taken}T"
+                      f"{mark}")
+            elif len(counts) == 1:
+                print(f"    {name}: {counts[0]}T")
+            else:
+                # マイクロコード分割（フェーズごとの加算）
+                print(f"    {name}: {'+'.join(str(c) for c in counts)}T "
+                      f"(合計{sum(counts)}T)")
+
+    if mismatches:
+        print(f"\n⚠️  期待サイクルと不一致の分岐命令: {len(mismatches)}個")
+        for name, actual, expected in mismatches:
+            print(f"    {name}: 実装{actual} 期待{expected}")
+    else:
+        print("\n✅ 条件分岐命令のtaken/not takenサイクルはすべて期待値と一致")
+
+
+if __name__ == "__main__":
+    main()
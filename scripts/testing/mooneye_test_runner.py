@@ -53,8 +53,12 @@ class MooneyeTestRunner:
         
         return overall_success, success_rate
     
-    def run_test(self, rom_path, max_cycles=50_000_000):
-        """単一のMooneyeテストを実行"""
+    def run_test(self, rom_path, max_cycles=50_000_000, gb=None):
+        """単一のMooneyeテストを実行
+
+        gbに既存インスタンスを渡すとreset()して使い回す（テスト群
+        実行時にGameBoy/pygame初期化の固定費をROM間で償却する）
+        """
         test_name = os.path.basename(rom_path).replace('.gb', '')
         print(f'\n🧪 Mooneye Test: {test_name}')
         print('=' * 60)
@@ -64,32 +68,25 @@ class MooneyeTestRunner:
             return False, 0.0
         
         try:
-            gb = GameBoy(debug=False)
+            if gb is None:
+                gb = GameBoy(debug=False)
+            else:
+                gb.reset()
             gb.load_rom(rom_path)
             
-            cycles = 0
-            last_opcode = None
-            
-            while cycles < max_cycles:
-                # オペコード0x40 (LD B,B) を監視
-                current_pc = gb.cpu.pc
-                if current_pc < len(gb.memory.rom):
-                    current_opcode = gb.memory.rom[current_pc]
-                    
-                    # 0x40 (LD B,B) でMooneyeテスト完了
-                    if current_opcode == 0x40 and last_opcode != 0x40:
-                        print(f"🎯 テスト完了検出 (LD B,B): {cycles:,} サイクル")
-                        break
-                    
-                    last_opcode = current_opcode
-                
-                gb.step()
-                cycles = gb.cpu.cycles
-                
-                # 進捗表示
-                if cycles % 10_000_000 == 0:
-                    print(f"[{cycles//1_000_000:2d}M] 実行中... PC: 0x{gb.cpu.pc:04X}")
-            
+            # オペコード0x40 (LD B,B) でMooneyeテスト完了。
+            # 監視はネイティブ側のバッチループ（run_until）に畳み込み、
+            # 10Mサイクルごとに戻って進捗を表示する
+            cpu = gb.cpu  # ループ外で束縛（バッチごとのドット参照を削減）
+            while cpu.cycles < max_cycles:
+                budget = min(cpu.cycles + 10_000_000, max_cycles)
+                event = gb.run_until(budget, opcode_watch=0x40)
+                if event == "opcode":
+                    print(f"🎯 テスト完了検出 (LD B,B): {cpu.cycles:,} サイクル")
+                    break
+                print(f"[{cpu.cycles//1_000_000:2d}M] 実行中... PC: 0x{cpu.pc:04X}")
+            cycles = cpu.cycles
+
             print(f"\n📊 実行完了: {cycles:,} サイクル")
             
             # フィボナッチ判定
@@ -126,21 +123,24 @@ class MooneyeTestRunner:
         
         success_count = 0
         total_count = 0
-        
+
+        # GameBoyは1個だけ作り、テストごとにreset()で使い回す
+        gb = GameBoy(debug=False)
+
         # 優先テスト実行
         for test_name in priority_tests:
             test_path = os.path.join(timer_test_dir, test_name)
             if os.path.exists(test_path):
-                success, rate = self.run_test(test_path)
+                success, rate = self.run_test(test_path, gb=gb)
                 success_count += success
                 total_count += 1
-        
+
         # その他のタイマーテスト
         all_timer_tests = [f for f in os.listdir(timer_test_dir) if f.endswith('.gb')]
         for test_name in all_timer_tests:
             if test_name not in priority_tests:
                 test_path = os.path.join(timer_test_dir, test_name)
-                success, rate = self.run_test(test_path, max_cycles=30_000_000)  # 短めのタイムアウト
+                success, rate = self.run_test(test_path, max_cycles=30_000_000, gb=gb)  # 短めのタイムアウト
                 success_count += success
                 total_count += 1
         
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Cythonビルドスクリプト
+
+ホットパスのモジュール（cpu/memory/timer）はCythonのpure Pythonモード
+アノテーション（cython.int等）を付けてあるので、このスクリプトで
+拡張モジュールにコンパイルすると型注釈がCの整数演算に落ちる。
+
+    pip install -e .[build]
+    python setup.py build_ext --inplace
+
+コンパイルしなくても通常のPythonモジュールとしてそのまま動く。
+
+最適化フラグ: 常時-O3と-flto（リンク時最適化）を付ける。
+さらにGB_PGO環境変数でプロファイル誘導最適化（PGO）を2段ビルドできる:
+
+    GB_PGO=generate python setup.py build_ext --inplace  # 計測ビルド
+    （代表的ワークロードを実行: 例 mooneye_test_runner.py）
+    GB_PGO=use python setup.py build_ext --inplace       # 適用ビルド
+
+手順は build_pgo.sh にまとめてある。ディスパッチループは実際の
+オペコード分布で分岐予測が効くため、PGOの効果が出やすい。
+"""
+
+import os
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    raise SystemExit(
+        "Cythonが見つかりません。`pip install -e .[build]` を実行してください。")
+
+# pure Pythonモードで注釈済みのホットパスのみコンパイル対象にする
+HOT_MODULES = [
+    "src/gameboy/cpu.py",
+    "src/gameboy/memory.py",
+    "src/gameboy/timer.py",
+    "src/gameboy/ppu.py",
+    "src/gameboy/apu.py",
+]
+
+# 最適化・PGOフラグの組み立て（プロファイルは./pgoに採取）
+extra_compile_args = ["-O3", "-flto"]
+extra_link_args = ["-flto"]
+_pgo = os.getenv("GB_PGO")
+if _pgo == "generate":
+    extra_compile_args.append("-fprofile-generate=./pgo")
+    extra_link_args.append("-fprofile-generate=./pgo")
+elif _pgo == "use":
+    # -fprofile-correction: マルチスレッド採取時のカウンタ揺らぎを許容
+    extra_compile_args += ["-fprofile-use=./pgo", "-fprofile-correction"]
+    extra_link_args.append("-fprofile-use=./pgo")
+
+ext_modules = [
+    Extension(
+        path[:-3].replace("/", "."),
+        [path],
+        # スレッド状態取得と関数呼び出しの高速パスを有効化
+        define_macros=[
+            ("CYTHON_FAST_THREAD_STATE", 1),
+            ("CYTHON_FAST_PYCALL", 1),
+        ],
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
+    )
+    for path in HOT_MODULES
+]
+
+setup(
+    ext_modules=cythonize(
+        ext_modules,
+        nthreads=os.cpu_count() or 1,  # モジュール単位でCython変換を並列化
+        compiler_directives={
+            "language_level": "3",
+            "boundscheck": False,
+            "wraparound": False,
+        },
+        annotate=True,  # *.htmlで残存Pythonオブジェクト操作を確認できる
+    ),
+)
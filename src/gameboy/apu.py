@@ -9,7 +9,6 @@ import pygame
 import numpy as np
 import threading
 import time
-from collections import deque
 
 try:
     import cython
@@ -24,25 +23,68 @@ except ImportError:
         bint = bool
 
 
+# 1出力サンプルあたりのCPUサイクル数（44.1kHz換算、整数）
+_CYCLES_PER_SAMPLE: cython.int = 4194304 // 44100
+
+# Duty cycle patterns (4種×8ステップ) - 全SquareChannelで共有
+_DUTY_LUT = np.array([
+    [0, 0, 0, 0, 0, 0, 0, 1],  # 12.5%
+    [1, 0, 0, 0, 0, 0, 0, 1],  # 25%
+    [1, 0, 0, 0, 0, 1, 1, 1],  # 50%
+    [0, 1, 1, 1, 1, 1, 1, 0],  # 75%
+], dtype=np.int64)
+
+# duty比×デューティ位置×音量 → 出力振幅の前計算テーブル (4,8,16)。
+# サンプル生成時の乗算2回をテーブル参照1回に畳む
+_DUTY_VOL_LUT = (_DUTY_LUT[:, :, None]
+                 * np.arange(16, dtype=np.int64)[None, None, :] * 2000)
+
+
+def _lfsr_output_table(seven_bit):
+    """リセット状態からのLFSR出力ビット列を1周期分生成する
+
+    LFSRは決定的で周期が短い（15bit: 32767, 7bit: 127）ので、出力を
+    周期まるごと前計算しておけば実行時は位置のインデックス参照だけで
+    済む。7bitモードではbit6が毎更新で上書きされるため下位7bitが独立に
+    巡回し、周期127・過渡なしで閉じる。
+    """
+    size = 127 if seven_bit else 32767
+    out = np.empty(size, dtype=np.int64)
+    lfsr = 0x7F if seven_bit else 0x7FFF
+    for i in range(size):
+        out[i] = (~lfsr) & 1  # 出力はbit0の反転
+        result = (lfsr & 1) ^ ((lfsr >> 1) & 1)
+        lfsr >>= 1
+        if seven_bit:
+            lfsr = (lfsr & ~0x40) | (result << 6)
+        else:
+            lfsr |= result << 14
+    return out
+
+
+_LFSR15_OUT = _lfsr_output_table(False)
+_LFSR7_OUT = _lfsr_output_table(True)
+
+
 class APU:
     def __init__(self, memory, debug: cython.bint = False):
         self.memory = memory
         self.debug: cython.bint = debug
         
         # 🎵 高品質音声設定 - 44.1kHz対応
-        self.sample_rate = 44100     # Game Boy準拠の高品質サンプルレート
-        self.buffer_size = 1024      # より大きなバッファで安定性向上
-        self.channels = 2            # ステレオ出力
+        self.sample_rate: cython.int = 44100     # Game Boy準拠の高品質サンプルレート
+        self.buffer_size: cython.int = 1024      # より大きなバッファで安定性向上
+        self.channels: cython.int = 2            # ステレオ出力
         
         # Game Boy audio timing - 正確な計算
-        self.gb_sample_rate = 4194304 // 95  # ~44kHz (Game Boy実機相当)
-        self.cycles_per_sample = 4194304 // self.sample_rate  # 95.09サイクル/サンプル
-        self.cycle_counter = 0
+        self.gb_sample_rate: cython.int = 4194304 // 95  # ~44kHz (Game Boy実機相当)
+        self.cycles_per_sample: cython.int = 4194304 // self.sample_rate  # 95.09サイクル/サンプル
+        self.cycle_counter: cython.longlong = 0
         
         # 🎵 Frame Sequencer実装 (512Hz)
-        self.frame_sequencer_counter = 0
-        self.frame_sequencer_step = 0  # 0-7の8ステップサイクル
-        self.cycles_per_frame = 4194304 // 512  # 8192サイクル
+        self.frame_sequencer_counter: cython.longlong = 0
+        self.frame_sequencer_step: cython.int = 0  # 0-7の8ステップサイクル
+        self.cycles_per_frame: cython.int = 4194304 // 512  # 8192サイクル
         
         # Audio channels
         self.channel1 = SquareChannel(1, debug=debug)  # Square wave with sweep
@@ -51,16 +93,20 @@ class APU:
         self.channel4 = NoiseChannel(debug=debug)      # Noise channel
         
         # Master control
-        self.enabled = False
-        self.left_volume = 7
-        self.right_volume = 7
+        self.enabled: cython.bint = False
+        self.left_volume: cython.int = 7
+        self.right_volume: cython.int = 7
         
         # Output mixing
-        self.left_enables = 0x00   # Which channels go to left speaker
-        self.right_enables = 0x00  # Which channels go to right speaker
-        
-        # Audio buffer
-        self.audio_buffer = deque(maxlen=self.buffer_size * 4)
+        self.left_enables: cython.int = 0x00   # Which channels go to left speaker
+        self.right_enables: cython.int = 0x00  # Which channels go to right speaker
+        
+        # Audio ring buffer (L,R交互のint16、単一生産者/単一消費者)。
+        # 読み書き位置は単調増加のサンプル数で持ち、差分が滞留量になる
+        self._ring_size: cython.int = self.buffer_size * 4
+        self._ring = np.zeros(self._ring_size, dtype=np.int16)
+        self._write_idx: cython.longlong = 0
+        self._read_idx: cython.longlong = 0
 
         # Batch processing: APUは割り込みを発生させないため大きな値
         self._cycles_to_interrupt = 0x7FFFFFFFFFFFFFFF  # 最大値
@@ -93,35 +139,38 @@ class APU:
     
     def _audio_thread(self):
         """Audio playback thread"""
-        # Create a single sound object to avoid creating new ones constantly
-        dummy_array = np.zeros((self.buffer_size, 2), dtype=np.int16)
-        current_sound = pygame.sndarray.make_sound(dummy_array)
-        
+        # Soundは1個だけ確保し、sndarray.samples()が返すゼロコピー
+        # ビュー経由で毎ブロック中身を書き換えて使い回す
+        # （make_sound毎回呼び出しのSDLチャンク確保+コピーをなくす）
+        block: cython.int = self.buffer_size * 2  # Stereo
+        sound = pygame.sndarray.make_sound(
+            np.zeros((self.buffer_size, 2), dtype=np.int16))
+        play_buffer = pygame.sndarray.samples(sound).reshape(-1)
+        channel = pygame.mixer.Channel(0)
+
         while self.audio_running:
-            if len(self.audio_buffer) >= self.buffer_size * 2:  # Stereo
-                # Get audio data from buffer
-                samples = []
-                for _ in range(self.buffer_size * 2):
-                    if self.audio_buffer:
-                        samples.append(self.audio_buffer.popleft())
-                    else:
-                        samples.append(0)
-                
-                # Convert to pygame sound (reshape for stereo)
+            available = self._write_idx - self._read_idx
+            if available >= block:
+                # リングから1ブロック分をSoundバッファへ直接コピー
+                # （折り返しは2スライス）
+                rp = self._read_idx % self._ring_size
+                first = min(block, self._ring_size - rp)
+                play_buffer[:first] = self._ring[rp:rp + first]
+                if block > first:
+                    play_buffer[first:] = self._ring[:block - first]
+                self._read_idx += block
+
                 try:
-                    audio_array = np.array(samples, dtype=np.int16).reshape(-1, 2)
-                    sound = pygame.sndarray.make_sound(audio_array)
-                    
                     # Only play if the previous sound finished or if the queue is getting full
-                    if not pygame.mixer.get_busy() or len(self.audio_buffer) > self.buffer_size * 4:
-                        pygame.mixer.Sound.play(sound)
-                        
+                    if not channel.get_busy() or available > self._ring_size:
+                        channel.queue(sound)
+
                 except Exception as e:
                     if self.debug:
                         print(f"Audio error: {e}")
                     time.sleep(0.1)  # Longer delay on error
                     continue
-            
+
             time.sleep(0.01)  # Small delay to prevent busy waiting
     
     def step(self, cpu_cycles):
@@ -129,20 +178,29 @@ class APU:
         if not self.enabled:
             return
             
-        self.cycle_counter += cpu_cycles
-        
-        # 🎵 Frame Sequencer更新 (512Hz)
-        self.frame_sequencer_counter += cpu_cycles
-        while self.frame_sequencer_counter >= self.cycles_per_frame:
-            self.frame_sequencer_counter -= self.cycles_per_frame
-            self._update_frame_sequencer()
-        
-        # Generate samples when enough cycles have passed
-        while self.cycle_counter >= self.cycles_per_sample:
-            self.cycle_counter -= self.cycles_per_sample
-            self._generate_sample()
+        # 次イベント方式: Frame Sequencer境界(8192サイクル)でサンプル
+        # 生成を区切る。2本の並列whileループが消えるうえ、エンベロープや
+        # 長さカウンタの更新がバッチ途中のサンプルにも正しい位置で効く
+        remaining = cpu_cycles
+        while remaining > 0:
+            until_frame = self.cycles_per_frame - self.frame_sequencer_counter
+            chunk = remaining if remaining < until_frame else until_frame
+            self.cycle_counter += chunk
+            self.frame_sequencer_counter += chunk
+
+            # サンプルは何個分進んだかを求めてnumpyでまとめて生成する
+            n = self.cycle_counter // self.cycles_per_sample
+            if n > 0:
+                self.cycle_counter -= n * self.cycles_per_sample
+                self._generate_samples_batch(n)
+
+            # 🎵 Frame Sequencer更新 (512Hz)
+            if self.frame_sequencer_counter >= self.cycles_per_frame:
+                self.frame_sequencer_counter -= self.cycles_per_frame
+                self._update_frame_sequencer()
+            remaining -= chunk
+
 
-    
     def _update_frame_sequencer(self):
         """Frame Sequencer更新 - Game Boy準拠の512Hz制御"""
         step = self.frame_sequencer_step
@@ -168,48 +226,65 @@ class APU:
         # 次のステップへ
         self.frame_sequencer_step = (self.frame_sequencer_step + 1) % 8
     
-    def _generate_sample(self):
-        """Generate one audio sample"""
-        # Update all channels
-        self.channel1.step()
-        self.channel2.step() 
-        self.channel3.step()
-        self.channel4.step()
-        
-        # Mix channels
-        left_sample = 0
-        right_sample = 0
-        
-        if self.left_enables & 0x01:  # Channel 1 to left
-            left_sample += self.channel1.get_sample()
-        if self.left_enables & 0x02:  # Channel 2 to left
-            left_sample += self.channel2.get_sample()
-        if self.left_enables & 0x04:  # Channel 3 to left
-            left_sample += self.channel3.get_sample()
-        if self.left_enables & 0x08:  # Channel 4 to left
-            left_sample += self.channel4.get_sample()
-            
-        if self.right_enables & 0x01:  # Channel 1 to right
-            right_sample += self.channel1.get_sample()
-        if self.right_enables & 0x02:  # Channel 2 to right
-            right_sample += self.channel2.get_sample()
-        if self.right_enables & 0x04:  # Channel 3 to right
-            right_sample += self.channel3.get_sample()
-        if self.right_enables & 0x08:  # Channel 4 to right
-            right_sample += self.channel4.get_sample()
-        
+    def _generate_samples_batch(self, n):
+        """Generate n audio samples at once
+
+        サンプル単位のPythonループ（4チャンネルのstep/get_sampleと
+        スカラのミキシング・クランプで約10演算×44100回/秒）を、
+        バッチあたり数個のnumpy呼び出しに置き換える。
+        """
+        # 無音の短絡: 鳴っているチャンネルがどのスピーカーにも
+        # 繋がっていなければ、サンプル計算を全部飛ばしてゼロを積む
+        # （ゲームは無音区間が長いので効く）
+        active_mask: cython.int = (
+            (1 if self.channel1.enabled else 0)
+            | (2 if self.channel2.enabled else 0)
+            | (4 if self.channel3.enabled else 0)
+            | (8 if self.channel4.enabled else 0))
+        if (active_mask & (self.left_enables | self.right_enables)) == 0:
+            self._ring_write(np.zeros(n * 2, dtype=np.int16))
+            return
+
+        # Update all channels and get their sample arrays.
+        # NR51でどこにも繋がっていないチャンネルは生成ごと省略する
+        # （スカラ0はミキシング式でそのままブロードキャストされる）
+        le = self.left_enables
+        re = self.right_enables
+        routed: cython.int = (le | re) & active_mask
+        s1 = self.channel1.sample_batch(n) if routed & 1 else 0
+        s2 = self.channel2.sample_batch(n) if routed & 2 else 0
+        s3 = self.channel3.sample_batch(n) if routed & 4 else 0
+        s4 = self.channel4.sample_batch(n) if routed & 8 else 0
+
+        # Mix channels: NR51の各ビットを0/1の係数にしてブランチレスに合成
+        left = (s1 * (le & 1) + s2 * ((le >> 1) & 1)
+                + s3 * ((le >> 2) & 1) + s4 * ((le >> 3) & 1))
+        right = (s1 * (re & 1) + s2 * ((re >> 1) & 1)
+                 + s3 * ((re >> 2) & 1) + s4 * ((re >> 3) & 1))
+
         # Apply master volume
-        left_sample = (left_sample * (self.left_volume + 1)) // 8
-        right_sample = (right_sample * (self.right_volume + 1)) // 8
-        
-        # Clamp to 16-bit range
-        left_sample = max(-32768, min(32767, left_sample))
-        right_sample = max(-32768, min(32767, right_sample))
-        
-        # Add to buffer
-        if len(self.audio_buffer) < self.audio_buffer.maxlen - 2:
-            self.audio_buffer.append(left_sample)
-            self.audio_buffer.append(right_sample)
+        left = left * (self.left_volume + 1) // 8
+        right = right * (self.right_volume + 1) // 8
+
+        # Clamp to 16-bit range and interleave (L, R, L, R, ...)
+        interleaved = np.empty(n * 2, dtype=np.int64)
+        interleaved[0::2] = left
+        interleaved[1::2] = right
+        np.clip(interleaved, -32768, 32767, out=interleaved)
+
+        self._ring_write(interleaved)
+
+    def _ring_write(self, interleaved):
+        """リングに収まるぶんだけスライス代入で積む（あふれる分は捨てる）"""
+        free = self._ring_size - (self._write_idx - self._read_idx)
+        count = min(len(interleaved), free - (free & 1))  # L/R対を崩さない
+        if count > 0:
+            wp = self._write_idx % self._ring_size
+            first = min(count, self._ring_size - wp)
+            self._ring[wp:wp + first] = interleaved[:first]
+            if count > first:
+                self._ring[:count - first] = interleaved[first:count]
+            self._write_idx += count
     
     def write_register(self, address, value):
         """Write to APU register"""
@@ -227,7 +302,7 @@ class APU:
             
         elif address == 0xFF26:  # NR52 - Sound on/off
             old_enabled = self.enabled
-            self.enabled = bool(value & 0x80)
+            self.enabled = (value >> 7) & 1  # 0/1: boolコール不要でシフト合成も正しい
             
             if not self.enabled:
                 # Disable all channels
@@ -311,67 +386,74 @@ class APU:
 
 class SquareChannel:
     def __init__(self, channel_num, debug=False):
-        self.channel_num = channel_num
-        self.debug = debug
-        self.enabled = False
+        self.channel_num: cython.int = channel_num
+        self.debug: cython.bint = debug
+        self.enabled: cython.bint = False
         
         # Wave generation
-        self.frequency = 0
-        self.duty_cycle = 0  # 0=12.5%, 1=25%, 2=50%, 3=75%
-        self.phase = 0
+        self.frequency: cython.int = 0
+        self.duty_cycle: cython.int = 0  # 0=12.5%, 1=25%, 2=50%, 3=75%
+        # 実機同様の整数タイマー: (2048-frequency)*4 CPUサイクルごとに
+        # デューティ位置が1進む（浮動小数の位相蓄積は使わない）
+        self.timer: cython.int = 0
+        self.duty_step: cython.int = 0
         
         # Envelope
-        self.envelope_volume = 0
-        self.envelope_direction = 0  # 0=decrease, 1=increase
-        self.envelope_period = 0
-        self.envelope_counter = 0
-        self.current_volume = 0
+        self.envelope_volume: cython.int = 0
+        self.envelope_direction: cython.int = 0  # 0=decrease, 1=increase
+        self.envelope_period: cython.int = 0
+        self.envelope_counter: cython.int = 0
+        self.current_volume: cython.int = 0
         
         # Length counter
-        self.length_enabled = False
-        self.length_counter = 0
+        self.length_enabled: cython.bint = False
+        self.length_counter: cython.int = 0
         
         # Sweep (Channel 1 only)
-        self.sweep_enabled = (channel_num == 1)
-        self.sweep_period = 0
-        self.sweep_direction = 0  # 0=increase, 1=decrease  
-        self.sweep_shift = 0
-        self.sweep_counter = 0
-        
-        # Duty cycle patterns
-        self.duty_patterns = [
-            [0, 0, 0, 0, 0, 0, 0, 1],  # 12.5%
-            [1, 0, 0, 0, 0, 0, 0, 1],  # 25%
-            [1, 0, 0, 0, 0, 1, 1, 1],  # 50%
-            [0, 1, 1, 1, 1, 1, 1, 0],  # 75%
-        ]
+        self.sweep_enabled: cython.bint = (channel_num == 1)
+        self.sweep_period: cython.int = 0
+        self.sweep_direction: cython.int = 0  # 0=increase, 1=decrease  
+        self.sweep_shift: cython.int = 0
+        self.sweep_counter: cython.int = 0
         
     def reset(self):
         """Reset channel to default state"""
         self.enabled = False
-        self.phase = 0
+        self.timer = 0
+        self.duty_step = 0
         self.current_volume = 0
         self.envelope_counter = 0
         self.length_counter = 0
         self.sweep_counter = 0
     
-    def step(self):
-        """Update channel state - 高精度周波数計算"""
+    def sample_batch(self, n):
+        """nサンプル分をまとめて生成する - 整数タイマー駆動
+
+        実機と同じく (2048-frequency)*4 サイクル周期のカウントダウンで
+        デューティ位置を進める。サンプルkまでの進み数は
+        (k*サイクル/サンプル + period - timer) // period の閉形式で
+        求まるので、位置列はarange1本から整数演算だけで出せる。
+        """
         if not self.enabled:
-            return
-            
-        # 🎵 正確な周波数計算 - Game Boy準拠
-        if self.frequency > 0:
-            # Game Boy式: Period = (2048-frequency)*4
-            period = (2048 - self.frequency) * 4
-            if period > 0:
-                freq_hz = 4194304 / period  # Game Boy クロック周波数
-                phase_increment = (freq_hz * 8) / 44100  # 8ステップ/デューティサイクル
-                self.phase += phase_increment
-                if self.phase >= 8:
-                    self.phase -= 8
+            return np.zeros(n, dtype=np.int64)
+
+        # Game Boy式: Period = (2048-frequency)*4
+        period: cython.int = (2048 - self.frequency) * 4
+        timer: cython.int = self.timer
+        if timer <= 0:
+            timer = period
+        consumed = np.arange(1, n + 1) * _CYCLES_PER_SAMPLE
+        advances = (consumed + (period - timer)) // period
+        total: cython.int = int(advances[-1])
+        duty_index = (self.duty_step + advances) & 7
+        self.duty_step = (self.duty_step + total) & 7
+        self.timer = timer + total * period - n * _CYCLES_PER_SAMPLE
+
+        if self.current_volume == 0:
+            return np.zeros(n, dtype=np.int64)
+        # 前計算済みLUTから振幅を直接引く
+        return _DUTY_VOL_LUT[self.duty_cycle, duty_index, self.current_volume]
 
-    
     def update_length_counter(self):
         """Length Counter更新 - Frame Sequencerから呼び出し"""
         if self.length_enabled and self.length_counter > 0:
@@ -404,19 +486,6 @@ class SquareChannel:
         if self.frequency > 2047:
             self.enabled = False
     
-    def get_sample(self):
-        """Get current audio sample"""
-        if not self.enabled or self.current_volume == 0:
-            return 0
-            
-        # Get duty cycle output
-        duty_index = int(self.phase) % 8
-        duty_output = self.duty_patterns[self.duty_cycle][duty_index]
-        
-        # Apply volume
-        sample = duty_output * self.current_volume * 2000  # Scale for audible output
-        return sample
-    
     def write_register(self, address, value):
         """Write to channel register"""
         offset = address - (0xFF10 if self.channel_num == 1 else 0xFF16)
@@ -441,7 +510,7 @@ class SquareChannel:
             
         elif offset == 4:  # NR14/NR24 - Frequency high and control
             self.frequency = (self.frequency & 0xFF) | ((value & 0x07) << 8)
-            self.length_enabled = bool(value & 0x40)
+            self.length_enabled = (value >> 6) & 1
             
             if value & 0x80:  # Trigger
                 self.enabled = True
@@ -449,7 +518,8 @@ class SquareChannel:
                     self.length_counter = 64
                 self.current_volume = self.envelope_volume
                 self.envelope_counter = 0
-                self.phase = 0
+                self.timer = 0
+                self.duty_step = 0
     
     def read_register(self, address):
         """Read from channel register - Game Boy準拠の読み戻し値"""
@@ -477,86 +547,79 @@ class SquareChannel:
 
 class WaveChannel:
     def __init__(self, debug=False):
-        self.debug = debug
-        self.enabled = False
-        self.dac_enabled = False
+        self.debug: cython.bint = debug
+        self.enabled: cython.bint = False
+        self.dac_enabled: cython.bint = False
         
         # Wave generation
-        self.frequency = 0
-        self.phase = 0
-        self.volume_level = 0  # 0=mute, 1=100%, 2=50%, 3=25%
+        self.frequency: cython.int = 0
+        # 実機同様の整数タイマー: (2048-frequency)*2 CPUサイクルごとに
+        # Wave RAM上の再生位置（0-31）が1進む
+        self.timer: cython.int = 0
+        self.position: cython.int = 0
+        self.volume_level: cython.int = 0  # 0=mute, 1=100%, 2=50%, 3=25%
         
         # Length counter
-        self.length_enabled = False
-        self.length_counter = 0
+        self.length_enabled: cython.bint = False
+        self.length_counter: cython.int = 0
         
         # Wave RAM (32 4-bit samples)
-        self.wave_ram = [0] * 16  # 16 bytes = 32 4-bit samples
+        self.wave_ram = bytearray(16)  # 16 bytes = 32 4-bit samples
+        # 書き込み時にニブル展開したサンプル列。Wave RAMの更新は稀なので
+        # バッチ生成のたびに16バイトを展開し直すより書き込み側で持つ
+        self.wave_samples = np.zeros(32, dtype=np.int64)
         
     def reset(self):
         """Reset channel to default state"""
         self.enabled = False
-        self.phase = 0
+        self.timer = 0
+        self.position = 0
         self.length_counter = 0
         
-    def step(self):
-        """Update channel state - 高精度周波数計算"""
+    def sample_batch(self, n):
+        """nサンプル分をまとめて生成する - 整数タイマー駆動
+
+        実機と同じく (2048-frequency)*2 サイクル周期のカウントダウンで
+        再生位置を進める（進み数の閉形式はSquareChannelと同じ）。
+        Wave RAMのニブル列は一度だけ展開し、位置列で一括参照する。
+        """
         if not self.enabled or not self.dac_enabled:
-            return
-            
-        # 🎵 正確な周波数計算 - Game Boy準拠
-        if self.frequency > 0:
-            # Game Boy式: Period = (2048-frequency)*2 (Wave channelは*2)
-            period = (2048 - self.frequency) * 2
-            if period > 0:
-                freq_hz = 4194304 / period
-                phase_increment = (freq_hz * 32) / 44100  # 32サンプル/Wave RAM
-                self.phase += phase_increment
-                if self.phase >= 32:
-                    self.phase -= 32
+            return np.zeros(n, dtype=np.int64)
+
+        # Game Boy式: Period = (2048-frequency)*2 (Wave channelは*2)
+        period: cython.int = (2048 - self.frequency) * 2
+        timer: cython.int = self.timer
+        if timer <= 0:
+            timer = period
+        consumed = np.arange(1, n + 1) * _CYCLES_PER_SAMPLE
+        advances = (consumed + (period - timer)) // period
+        total: cython.int = int(advances[-1])
+        sample_index = (self.position + advances) & 31
+        self.position = (self.position + total) & 31
+        self.timer = timer + total * period - n * _CYCLES_PER_SAMPLE
+
+        if self.volume_level == 0:
+            return np.zeros(n, dtype=np.int64)
+
+        # Apply volume level: 1=100%, 2=50%, 3=25% (右シフト量に対応)
+        shift: cython.int = self.volume_level - 1
+        # Center around 0 and scale
+        return ((self.wave_samples[sample_index] >> shift) - 7) * 1000
 
-    
     def update_length_counter(self):
         """Length Counter更新 - Frame Sequencerから呼び出し"""
         if self.length_enabled and self.length_counter > 0:
             self.length_counter -= 1
             if self.length_counter == 0:
                 self.enabled = False
-    
-    def get_sample(self):
-        """Get current audio sample"""
-        if not self.enabled or not self.dac_enabled or self.volume_level == 0:
-            return 0
-            
-        # Get sample from wave RAM
-        sample_index = int(self.phase) % 32
-        byte_index = sample_index // 2
-        nibble = sample_index % 2
-        
-        if nibble == 0:
-            sample = (self.wave_ram[byte_index] >> 4) & 0x0F
-        else:
-            sample = self.wave_ram[byte_index] & 0x0F
-        
-        # Apply volume level
-        if self.volume_level == 1:
-            sample = sample
-        elif self.volume_level == 2:
-            sample = sample >> 1
-        elif self.volume_level == 3:
-            sample = sample >> 2
-        else:
-            sample = 0
-        
-        # Scale for output
-        return (sample - 7) * 1000  # Center around 0 and scale
-    
+
+
     def write_register(self, address, value):
         """Write to channel register"""
         offset = address - 0xFF1A
         
         if offset == 0:  # NR30 - DAC enable
-            self.dac_enabled = bool(value & 0x80)
+            self.dac_enabled = (value >> 7) & 1
             if not self.dac_enabled:
                 self.enabled = False
                 
@@ -571,13 +634,14 @@ class WaveChannel:
             
         elif offset == 4:  # NR34 - Frequency high and control
             self.frequency = (self.frequency & 0xFF) | ((value & 0x07) << 8)
-            self.length_enabled = bool(value & 0x40)
+            self.length_enabled = (value >> 6) & 1
             
             if value & 0x80:  # Trigger
                 self.enabled = self.dac_enabled
                 if self.length_counter == 0:
                     self.length_counter = 256
-                self.phase = 0
+                self.timer = 0
+                self.position = 0
     
     def read_register(self, address):
         """Read from channel register - Game Boy準拠"""
@@ -604,6 +668,9 @@ class WaveChannel:
         """Write to wave RAM"""
         if offset < 16:
             self.wave_ram[offset] = value
+            # 展開済みサンプル列も同じ書き込みで更新しておく
+            self.wave_samples[offset * 2] = (value >> 4) & 0x0F
+            self.wave_samples[offset * 2 + 1] = value & 0x0F
     
     def read_wave_ram(self, offset):
         """Read from wave RAM"""
@@ -614,51 +681,66 @@ class WaveChannel:
 
 class NoiseChannel:
     def __init__(self, debug=False):
-        self.debug = debug
-        self.enabled = False
+        self.debug: cython.bint = debug
+        self.enabled: cython.bint = False
         
-        # Noise generation
-        self.lfsr = 0x7FFF  # 15-bit linear feedback shift register
-        self.clock_divider = 0
-        self.counter_step = 0  # 0=15-bit, 1=7-bit
-        self.dividing_ratio = 0
+        # Noise generation: LFSRは逐次更新せず、前計算した出力周期
+        # テーブル（_LFSR15_OUT/_LFSR7_OUT）上の位置で持つ
+        self.lfsr_pos: cython.int = 0
+        self.clock_divider: cython.int = 0
+        self.counter_step: cython.int = 0  # 0=15-bit, 1=7-bit
+        self.dividing_ratio: cython.int = 0
         
         # Envelope
-        self.envelope_volume = 0
-        self.envelope_direction = 0
-        self.envelope_period = 0
-        self.envelope_counter = 0
-        self.current_volume = 0
+        self.envelope_volume: cython.int = 0
+        self.envelope_direction: cython.int = 0
+        self.envelope_period: cython.int = 0
+        self.envelope_counter: cython.int = 0
+        self.current_volume: cython.int = 0
         
         # Length counter
-        self.length_enabled = False
-        self.length_counter = 0
+        self.length_enabled: cython.bint = False
+        self.length_counter: cython.int = 0
         
-        # Timing
-        self.noise_counter = 0
+        # Timing: 次のLFSR更新までの残りCPUサイクル
+        self.noise_timer: cython.int = 0
         
     def reset(self):
         """Reset channel to default state"""
         self.enabled = False
-        self.lfsr = 0x7FFF
+        self.lfsr_pos = 0
         self.current_volume = 0
         self.envelope_counter = 0
         self.length_counter = 0
-        self.noise_counter = 0
+        self.noise_timer = 0
     
-    def step(self):
-        """Update channel state - 高精度ノイズ生成"""
+    def sample_batch(self, n):
+        """nサンプル分をまとめて生成する - 整数タイマー駆動
+
+        実機のLFSRタイマー周期 divisor * 2^(s+1) * 8 CPUサイクルで刻み、
+        出力は前計算済み周期テーブルの位置参照で得る。更新回数の閉形式は
+        SquareChannelと同じなので、逐次のLFSR更新ループなしに位置列を
+        arange1本から求められる。
+        """
         if not self.enabled:
-            return
-            
-        # 🎵 正確なノイズ周波数計算
-        self.noise_counter += 1
-        noise_freq = self._get_noise_frequency()
-        if noise_freq > 0 and self.noise_counter >= (44100 // noise_freq):
-            self.noise_counter = 0
-            self._update_lfsr()
+            return np.zeros(n, dtype=np.int64)
+
+        period: cython.int = self._get_noise_period()
+        timer: cython.int = self.noise_timer
+        if timer <= 0:
+            timer = period
+        consumed = np.arange(1, n + 1) * _CYCLES_PER_SAMPLE
+        advances = (consumed + (period - timer)) // period
+        total: cython.int = int(advances[-1])
+        table = _LFSR7_OUT if self.counter_step else _LFSR15_OUT
+        positions = (self.lfsr_pos + advances) % len(table)
+        self.lfsr_pos = int(positions[-1])
+        self.noise_timer = timer + total * period - n * _CYCLES_PER_SAMPLE
+
+        if self.current_volume == 0:
+            return np.zeros(n, dtype=np.int64)
+        return table[positions] * (self.current_volume * 1500)
 
-    
     def update_length_counter(self):
         """Length Counter更新 - Frame Sequencerから呼び出し"""
         if self.length_enabled and self.length_counter > 0:
@@ -676,37 +758,14 @@ class NoiseChannel:
                 if self.current_volume > 0:
                     self.current_volume -= 1
     
-    def _get_noise_frequency(self):
-        """Calculate noise frequency"""
+    def _get_noise_period(self):
+        """LFSR更新周期をCPUサイクル数で返す"""
         if self.dividing_ratio == 0:
-            divisor = 8
+            divisor: cython.int = 8
         else:
             divisor = 16 * self.dividing_ratio
-            
-        return 524288 // (divisor * (2 ** (self.clock_divider + 1)))
-    
-    def _update_lfsr(self):
-        """Update linear feedback shift register"""
-        bit0 = self.lfsr & 1
-        bit1 = (self.lfsr >> 1) & 1
-        result = bit0 ^ bit1
-        
-        self.lfsr = (self.lfsr >> 1) | (result << 14)
-        
-        if self.counter_step:  # 7-bit mode
-            self.lfsr = (self.lfsr & ~0x40) | (result << 6)
-    
-    def get_sample(self):
-        """Get current audio sample"""
-        if not self.enabled or self.current_volume == 0:
-            return 0
-            
-        # Get output from LFSR (invert bit 0)
-        output = (~self.lfsr) & 1
-        
-        # Apply volume
-        sample = output * self.current_volume * 1500
-        return sample
+        # 4194304 / (524288 / (divisor * 2^(s+1))) = divisor * 2^(s+1) * 8
+        return divisor * (2 ** (self.clock_divider + 1)) * 8
     
     def write_register(self, address, value):
         """Write to channel register"""
@@ -727,7 +786,7 @@ class NoiseChannel:
             self.dividing_ratio = value & 0x07
             
         elif offset == 4:  # NR44 - Control
-            self.length_enabled = bool(value & 0x40)
+            self.length_enabled = (value >> 6) & 1
             
             if value & 0x80:  # Trigger
                 self.enabled = True
@@ -735,8 +794,8 @@ class NoiseChannel:
                     self.length_counter = 64
                 self.current_volume = self.envelope_volume
                 self.envelope_counter = 0
-                self.lfsr = 0x7FFF
-                self.noise_counter = 0
+                self.lfsr_pos = 0  # リセット状態 = テーブル先頭
+                self.noise_timer = 0
     
     def read_register(self, address):
         """Read from channel register - Game Boy準拠"""
@@ -22,6 +22,209 @@ except ImportError:
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# TIMER_DEBUG環境変数はimport時に1回だけ評価して定数に畳み込む。
+# fetch_byte()など毎命令通る経路でos.getenv()（環境辞書の探索）を
+# 呼ばないため。main.pyの--timer-debugフラグはimport前に環境変数を
+# 立ててからこのモジュールを読み込む。
+TIMER_DEBUG: cython.bint = bool(os.getenv('TIMER_DEBUG'))
+
+# run_watch()の停止理由コード
+WATCH_BUDGET: cython.int = 0  # budgetサイクルまで走り切った
+WATCH_PC: cython.int = 1      # pc_watchのアドレスに到達
+WATCH_OPCODE: cython.int = 2  # opcode_watchの命令を検出
+
+# レジスタファイル(bytearray)内のインデックス
+# Game Boyのオペコードエンコーディング（下位3ビット）と同じ並び:
+# B=0, C=1, D=2, E=3, H=4, L=5, (HL)=6, A=7
+REG_B: cython.int = 0
+REG_C: cython.int = 1
+REG_D: cython.int = 2
+REG_E: cython.int = 3
+REG_H: cython.int = 4
+REG_L: cython.int = 5
+REG_A: cython.int = 7
+
+# CB BIT/RES/SET用のマスクテーブル。オペコード全体(256エントリ)で索引する
+# bytes定数なので、ハンドラ内のビット番号抽出シフトごと不要になる
+CB_SET_MASKS = bytes(1 << ((op >> 3) & 7) for op in range(256))
+CB_RES_MASKS = bytes(0xFF ^ (1 << ((op >> 3) & 7)) for op in range(256))
+
+
+# CB rotate/shift演算の実体（(opcode >> 3) & 7 で索引する8エントリテーブル）
+# 各関数は (値, 現在のキャリー0/1) -> (新しい値, 新キャリー0/1)
+# ローテート/シフトの結果は入力8bit（+キャリーイン）の純関数なので、
+# 256要素のbytesテーブルに事前計算しておく。CPythonではシフト/マスクの
+# 連鎖より単一のbytes添字参照のほうが安い。
+_RLC_TBL = bytes(((x << 1) | (x >> 7)) & 0xFF for x in range(256))
+_RRC_TBL = bytes((x >> 1) | ((x & 1) << 7) for x in range(256))
+_SLA_TBL = bytes((x << 1) & 0xFF for x in range(256))
+_SRL_TBL = bytes(x >> 1 for x in range(256))
+_SRA_TBL = bytes((x >> 1) | (x & 0x80) for x in range(256))
+_SWAP_TBL = bytes(((x & 0x0F) << 4) | (x >> 4) for x in range(256))
+# RL/RRはキャリーイン依存なのでキャリー0/1の2テーブル対
+# （キャリー0側はSLA/SRLと同一内容のため共有）
+_RL_TBL = (_SLA_TBL, bytes(((x << 1) | 1) & 0xFF for x in range(256)))
+_RR_TBL = (_SRL_TBL, bytes((x >> 1) | 0x80 for x in range(256)))
+# キャリーアウト: 左シフト系はbit7、右シフト系はbit0
+_CARRY_HI = bytes(x >> 7 for x in range(256))
+_CARRY_LO = bytes(x & 1 for x in range(256))
+
+# 符号付き8bitオフセット変換（JR/ADD SP等）。比較+減算の分岐を
+# テーブル参照1回に置き換える
+_SIGN8 = tuple(x - 256 if x > 127 else x for x in range(256))
+
+# INC/DEC r: 結果とフラグ(Z/H、DECはNも。Cは呼び出し側が保持)の前計算対
+_INC_RESULT = bytes((x + 1) & 0xFF for x in range(256))
+_INC_FLAGS = bytes(((((x + 1) & 0xFF) == 0) << 7)
+                   | (((x & 0x0F) == 0x0F) << 5) for x in range(256))
+_DEC_RESULT = bytes((x - 1) & 0xFF for x in range(256))
+_DEC_FLAGS = bytes(0x40 | ((((x - 1) & 0xFF) == 0) << 7)
+                   | (((x & 0x0F) == 0x00) << 5) for x in range(256))
+
+# 条件分岐のcc 2ビット（NZ=0 Z=1 NC=2 C=3、opcode>>3 & 3）→
+# Fレジスタのマスクと期待値。条件判定を (f & mask) == expect に正規化し、
+# JR/JP/CALL/RET各ファミリを条件ごとの専用ハンドラではなく
+# ファクトリ1つずつで賄う
+_CC_MASK = (0x80, 0x80, 0x10, 0x10)
+_CC_EXPECT = (0x00, 0x80, 0x00, 0x10)
+
+
+def _rot_rlc(value, f):
+    return _RLC_TBL[value], _CARRY_HI[value]
+
+
+def _rot_rrc(value, f):
+    return _RRC_TBL[value], _CARRY_LO[value]
+
+
+def _rot_rl(value, f):
+    # キャリーインを消費するのはRL/RRのみ。抽出は消費側まで遅延する
+    return _RL_TBL[(f >> 4) & 1][value], _CARRY_HI[value]
+
+
+def _rot_rr(value, f):
+    return _RR_TBL[(f >> 4) & 1][value], _CARRY_LO[value]
+
+
+def _rot_sla(value, f):
+    return _SLA_TBL[value], _CARRY_HI[value]
+
+
+def _rot_sra(value, f):
+    return _SRA_TBL[value], _CARRY_LO[value]
+
+
+def _rot_swap(value, f):
+    return _SWAP_TBL[value], 0
+
+
+def _rot_srl(value, f):
+    return _SRL_TBL[value], _CARRY_LO[value]
+
+
+ROT_OPS = (_rot_rlc, _rot_rrc, _rot_rl, _rot_rr,
+           _rot_sla, _rot_sra, _rot_swap, _rot_srl)
+
+# オペコード → ハンドラメソッド名の宣言的テーブル。
+# ファミリ一括生成される命令（LD r,r' / ALU A,r / INC・DEC r / RST）以外の
+# 単発命令はすべてここに列挙し、_init_opcode_table()はこれを読むだけにする。
+# コードではなくデータとして持つことで、解析スクリプト等からもimportして
+# 参照できる単一情報源になる。
+OPCODE_HANDLERS = {
+    # Misc / control
+    0x00: '_op_nop',
+    0x76: '_op_halt',
+    0xF3: '_op_di',
+    0xFB: '_op_ei',
+    0xCB: '_op_cb_prefix',
+    0xED: '_op_invalid_ed',
+    0x27: '_op_daa',
+    0x2F: '_op_cpl',
+    0x37: '_op_scf',
+    0x3F: '_op_ccf',
+    # 16-bit loads
+    0x01: '_op_ld_bc_nn',
+    0x11: '_op_ld_de_nn',
+    0x21: '_op_ld_hl_nn',
+    0x31: '_op_ld_sp_nn',
+    0x08: '_op_ld_nn_sp',
+    0xF8: '_op_ld_hl_sp_n',
+    0xF9: '_op_ld_sp_hl',
+    # 8-bit LD immediate
+    0x06: '_op_ld_b_n',
+    0x0E: '_op_ld_c_n',
+    0x16: '_op_ld_d_n',
+    0x1E: '_op_ld_e_n',
+    0x26: '_op_ld_h_n',
+    0x2E: '_op_ld_l_n',
+    0x3E: '_op_ld_a_n',
+    0x36: '_op_ld_hl_n',
+    # Memory operations
+    0x22: '_op_ld_hl_plus_a',
+    0x32: '_op_ld_hl_minus_a',
+    0x2A: '_op_ld_a_hl_plus',
+    0x3A: '_op_ld_a_hl_minus',
+    0x02: '_op_ld_bc_a',
+    0x12: '_op_ld_de_a',
+    0x0A: '_op_ld_a_bc',
+    0x1A: '_op_ld_a_de',
+    0xEA: '_op_ld_nn_a',
+    0xFA: '_op_ld_a_nn',
+    # High memory operations (0xFF00 + n / C)
+    0xE0: '_op_ldh_n_a',
+    0xF0: '_op_ldh_a_n',
+    0xE2: '_op_ld_ff_c_a',
+    0xF2: '_op_ld_a_ff_c',
+    # INC/DEC (HL)
+    0x34: '_op_inc_hl',
+    0x35: '_op_dec_hl',
+    # 16-bit arithmetic
+    0x03: '_op_inc_bc',
+    0x0B: '_op_dec_bc',
+    0x13: '_op_inc_de',
+    0x1B: '_op_dec_de',
+    0x23: '_op_inc_hl_16',
+    0x2B: '_op_dec_hl_16',
+    0x33: '_op_inc_sp',
+    0x3B: '_op_dec_sp',
+    0x09: '_op_add_hl_bc',
+    0x19: '_op_add_hl_de',
+    0x29: '_op_add_hl_hl',
+    0x39: '_op_add_hl_sp',
+    0xE8: '_op_add_sp_n',
+    # ALU A,n immediates
+    0xC6: '_op_add_a_n',
+    0xCE: '_op_adc_a_n',
+    0xD6: '_op_sub_n',
+    0xDE: '_op_sbc_a_n',
+    0xE6: '_op_and_n',
+    0xEE: '_op_xor_n',
+    0xF6: '_op_or_n',
+    0xFE: '_op_cp_n',
+    # Rotate A
+    0x07: '_op_rlca',
+    0x0F: '_op_rrca',
+    0x17: '_op_rla',
+    0x1F: '_op_rra',
+    # Jump instructions（条件付きJR/JP/CALL/RETはccファクトリで別途登録）
+    0x18: '_op_jr_n',
+    0xC3: '_op_jp_nn',
+    0xE9: '_op_jp_hl',
+    # Call and Return
+    0xCD: '_op_call_nn',
+    0xC9: '_op_ret',
+    0xD9: '_op_reti',
+    # Stack operations
+    0xC5: '_op_push_bc',
+    0xD5: '_op_push_de',
+    0xE5: '_op_push_hl',
+    0xF5: '_op_push_af',
+    0xC1: '_op_pop_bc',
+    0xD1: '_op_pop_de',
+    0xE1: '_op_pop_hl',
+    0xF1: '_op_pop_af',
+}
+
 class MemoryAccessScheduler:
     """サイクル精度メモリアクセススケジューラ
     
@@ -99,33 +302,47 @@ class MemoryAccessScheduler:
         return executed
 
 class CPU:
+    # 属性アクセスを__dict__のハッシュ探索から固定オフセット参照にする。
+    # インタプリタループで毎命令触る属性ばかりなので効果が大きい。
+    # 新しいインスタンス属性を追加する場合はここにも追記すること。
+    __slots__ = (
+        'memory', 'debug', 'timer',
+        'regs', 'f', 'sp', 'pc', 'cycles',
+        '_ff_count', '_pc_history',
+        'interrupt_master_enable', 'halted', 'ei_delay', 'halt_bug_active',
+        'mooneye_complete',
+        'opcode_table', '_cb_dispatch',
+    )
+
     def __init__(self, memory, debug: cython.bint = False):
         self.memory = memory
         self.debug: cython.bint = debug
         self.timer = None  # timerはemulatorで設定
 
-        # 8-bit registers
-        self.a: cython.int = 0x01  # Accumulator
-        self.b: cython.int = 0x00
-        self.c: cython.int = 0x13
-        self.d: cython.int = 0x00
-        self.e: cython.int = 0xD8
-        self.h: cython.int = 0x01
-        self.l: cython.int = 0x4D
+        # 8-bit registers: Structure-of-Arrays形式のレジスタファイル
+        # インデックスはオペコードエンコーディング準拠（REG_B..REG_A）
+        # numpyのuint8配列ではなくbytearrayを採用: 単要素アクセスで
+        # numpyスカラのボクシングが発生せず、bytes(self.regs)だけで
+        # レジスタ状態のスナップショット/復元ができる
+        self.regs = bytearray(8)
+        self.regs[REG_A] = 0x01  # Accumulator
+        self.regs[REG_B] = 0x00
+        self.regs[REG_C] = 0x13
+        self.regs[REG_D] = 0x00
+        self.regs[REG_E] = 0xD8
+        self.regs[REG_H] = 0x01
+        self.regs[REG_L] = 0x4D
 
-        # Initialize HL register
-        self.hl: cython.int = (self.h << 8) | self.l
 
         # 16-bit registers
         self.sp: cython.int = 0xFFFE  # Stack pointer
         # PC set to entry point after boot ROM completion
         self.pc: cython.int = 0x0100  # Program counter (Boot ROM completion state)
 
-        # Flags register (F) - Boot ROM completion state (DMG)
-        self.flag_z: cython.bint = True   # Zero flag = 1
-        self.flag_n: cython.bint = False  # Subtract flag = 0
-        self.flag_h: cython.bint = False  # Half carry flag (depends on header checksum, commonly 0)
-        self.flag_c: cython.bint = False  # Carry flag (depends on header checksum, commonly 0)
+        # Flags register (F) - 実ハードウェア同様に1バイトへパック
+        # bit7=Z, bit6=N, bit5=H, bit4=C（下位4ビットは常に0）
+        # Boot ROM completion state: Z=1, N=H=C=0
+        self.f: cython.int = 0x80
 
         # Interrupt master enable
         # self.ime = True  # Replaced by interrupt_master_enable
@@ -144,53 +361,325 @@ class CPU:
         
         # Game Boy HALT bug support
         self.halt_bug_active = False
+
+        # Mooneyeテスト完了マーカー（LD B,B実行で専用ハンドラが立てる）
+        self.mooneye_complete = False
         
         # Jump table for O(1) instruction dispatch
         self._init_opcode_table()
 
+    # 外部コード（emulator/スクリプト/テスト）との互換用アクセサ。
+    # ホットパスは self.regs を直接添字アクセスする。
+    @property
+    def a(self) -> cython.int:
+        return self.regs[REG_A]
+
+    @a.setter
+    def a(self, value: cython.int) -> None:
+        self.regs[REG_A] = value & 0xFF
+
+    @property
+    def b(self) -> cython.int:
+        return self.regs[REG_B]
+
+    @b.setter
+    def b(self, value: cython.int) -> None:
+        self.regs[REG_B] = value & 0xFF
+
+    @property
+    def c(self) -> cython.int:
+        return self.regs[REG_C]
+
+    @c.setter
+    def c(self, value: cython.int) -> None:
+        self.regs[REG_C] = value & 0xFF
+
+    @property
+    def d(self) -> cython.int:
+        return self.regs[REG_D]
+
+    @d.setter
+    def d(self, value: cython.int) -> None:
+        self.regs[REG_D] = value & 0xFF
+
+    @property
+    def e(self) -> cython.int:
+        return self.regs[REG_E]
+
+    @e.setter
+    def e(self, value: cython.int) -> None:
+        self.regs[REG_E] = value & 0xFF
+
+    @property
+    def h(self) -> cython.int:
+        return self.regs[REG_H]
+
+    @h.setter
+    def h(self, value: cython.int) -> None:
+        self.regs[REG_H] = value & 0xFF
+
+    @property
+    def l(self) -> cython.int:
+        return self.regs[REG_L]
+
+    @l.setter
+    def l(self, value: cython.int) -> None:
+        self.regs[REG_L] = value & 0xFF
+
+    # フラグの個別アクセサ（互換用）。ホットパスはself.fを直接操作する。
+    @property
+    def flag_z(self) -> cython.bint:
+        return bool(self.f & 0x80)
+
+    @flag_z.setter
+    def flag_z(self, value: cython.bint) -> None:
+        self.f = (self.f & 0x7F) | (bool(value) << 7)
+
+    @property
+    def flag_n(self) -> cython.bint:
+        return bool(self.f & 0x40)
+
+    @flag_n.setter
+    def flag_n(self, value: cython.bint) -> None:
+        self.f = (self.f & 0xBF) | (bool(value) << 6)
+
+    @property
+    def flag_h(self) -> cython.bint:
+        return bool(self.f & 0x20)
+
+    @flag_h.setter
+    def flag_h(self, value: cython.bint) -> None:
+        self.f = (self.f & 0xDF) | (bool(value) << 5)
+
+    @property
+    def flag_c(self) -> cython.bint:
+        return bool(self.f & 0x10)
+
+    @flag_c.setter
+    def flag_c(self, value: cython.bint) -> None:
+        self.f = (self.f & 0xEF) | (bool(value) << 4)
+
     def _init_opcode_table(self):
-        """Initialize jump table for fast instruction dispatch"""
+        """Initialize jump table for O(1) instruction dispatch
+
+        全256オペコードを事前登録し、execute_instruction()を
+        `self.opcode_table[opcode]()` の1回のインデックス参照に畳み込む。
+        従来のif/elifチェーン（平均~128回の比較）を排除する。
+        """
         # Create list of 256 opcode handlers
         self.opcode_table = [self._op_unimplemented] * 256
-        
-        # Register frequently used opcodes
-        self.opcode_table[0x00] = self._op_nop
-        self.opcode_table[0x01] = self._op_ld_bc_nn
-        self.opcode_table[0x11] = self._op_ld_de_nn
-        self.opcode_table[0x21] = self._op_ld_hl_nn
-        self.opcode_table[0x31] = self._op_ld_sp_nn
-        
-        # 8-bit LD immediate
-        self.opcode_table[0x06] = self._op_ld_b_n
-        self.opcode_table[0x0E] = self._op_ld_c_n
-        self.opcode_table[0x16] = self._op_ld_d_n
-        self.opcode_table[0x1E] = self._op_ld_e_n
-        self.opcode_table[0x26] = self._op_ld_h_n
-        self.opcode_table[0x2E] = self._op_ld_l_n
-        self.opcode_table[0x3E] = self._op_ld_a_n
-        
-        # Memory operations
-        self.opcode_table[0x22] = self._op_ld_hl_plus_a
-        self.opcode_table[0x32] = self._op_ld_hl_minus_a
-        self.opcode_table[0x2A] = self._op_ld_a_hl_plus
-        self.opcode_table[0x3A] = self._op_ld_a_hl_minus
-        
-        # INC/DEC (HL)
-        self.opcode_table[0x34] = self._op_inc_hl
-        self.opcode_table[0x35] = self._op_dec_hl
-        
-        # LD (HL), A and LD A, (HL)
-        self.opcode_table[0x77] = self._op_ld_hl_a
-        self.opcode_table[0x7E] = self._op_ld_a_hl
-        
-        # Jump instructions
-        self.opcode_table[0x18] = self._op_jr_n
-        self.opcode_table[0xC3] = self._op_jp_nn
-        
-        # Call and Return
-        self.opcode_table[0xCD] = self._op_call_nn
-        self.opcode_table[0xC9] = self._op_ret
-        
+
+        # 単発命令: 宣言的テーブル（OPCODE_HANDLERS）から一括登録
+        for opcode, name in OPCODE_HANDLERS.items():
+            self.opcode_table[opcode] = getattr(self, name)
+
+        # 8-bit INC/DEC（レジスタインデックスからハンドラ生成）
+        for opcode, reg in ((0x04, REG_B), (0x0C, REG_C), (0x14, REG_D),
+                            (0x1C, REG_E), (0x24, REG_H), (0x2C, REG_L),
+                            (0x3C, REG_A)):
+            self.opcode_table[opcode] = self._make_inc_r(reg)
+            self.opcode_table[opcode + 1] = self._make_dec_r(reg)
+
+        # LD r,r' / LD r,(HL) / LD (HL),r (0x40-0x7F, 0x76はHALT)
+        # dst/srcはレジスタファイルのインデックス（6は(HL)）
+        for dst in range(8):
+            for src in range(8):
+                opcode = 0x40 + dst * 8 + src
+                if opcode == 0x76:
+                    continue
+                self.opcode_table[opcode] = self._make_ld_r_r(dst, src)
+
+        # 0x40 (LD B,B) はMooneyeテストスイートの完了マーカー。
+        # 実質NOPなので、フラグを立てる専用ハンドラで上書きする
+        self.opcode_table[0x40] = self._op_ld_b_b
+
+        # ALU A,r (0x80-0xBF): (op, reg)ビット分解で一括登録
+        # ヘルパのタプルは一度だけ構築してファクトリに渡す
+        alu_helpers = (self.add_8bit, self.adc_8bit, self.sub_8bit,
+                       self.sbc_8bit, self.and_8bit, self.xor_8bit,
+                       self.or_8bit)
+        for op_idx in range(8):
+            for src in range(8):
+                self.opcode_table[0x80 + op_idx * 8 + src] = \
+                    self._make_alu_op(op_idx, src, alu_helpers)
+
+        # RST vectors (0xC7 + n*8 -> 0x0000 + n*8)
+        for i in range(8):
+            self.opcode_table[0xC7 + i * 8] = self._make_rst(i * 8)
+
+        # 条件分岐 JR/JP/CALL/RET cc: ccビット（NZ=0 Z=1 NC=2 C=3）で
+        # Fマスク/期待値を引き、条件別16ハンドラをファクトリ4つに集約
+        for cc in range(4):
+            mask, expect = _CC_MASK[cc], _CC_EXPECT[cc]
+            self.opcode_table[0x20 + cc * 8] = self._make_jr_cc(mask, expect)
+            self.opcode_table[0xC0 + cc * 8] = self._make_ret_cc(mask, expect)
+            self.opcode_table[0xC2 + cc * 8] = self._make_jp_cc(mask, expect)
+            self.opcode_table[0xC4 + cc * 8] = self._make_call_cc(mask, expect)
+
+        # CB prefix: 命令クラス (opcode >> 6) ごとのファミリハンドラ
+        self._cb_dispatch = (self._cb_rotate_shift, self._cb_bit,
+                             self._cb_res, self._cb_set)
+
+        # 構築完了後はタプルに固定（イミュータブル・誤上書き防止）
+        self.opcode_table = tuple(self.opcode_table)
+
+    def _make_ld_r_r(self, dst: cython.int, src: cython.int):
+        """LD r,r' ファミリのハンドラを生成 (0x40-0x7F)
+
+        memoryアクセサは生成時にクロージャへ束縛し、実行時の
+        属性ルックアップ2回（self.memory → .read_byte）をLOAD_FAST化。
+
+        (HL)はWRAM（0xC000-0xDFFF）を指すことが圧倒的に多く、同領域は
+        副作用のない純リストアクセスなので、read/write_byteの領域判定
+        チェーンとメソッド呼び出しを飛ばして直接添字アクセスする。
+        """
+        regs = self.regs
+        if dst == 6:       # LD (HL), r
+            write_byte = self.memory.write_byte
+            wram = self.memory.wram
+            def handler():
+                hl_addr = (regs[REG_H] << 8) | regs[REG_L]
+                if 0xC000 <= hl_addr < 0xE000:
+                    wram[hl_addr - 0xC000] = regs[src]
+                else:
+                    write_byte(hl_addr, regs[src])
+                self.cycles += 8
+        elif src == 6:     # LD r, (HL)
+            read_byte = self.memory.read_byte
+            wram = self.memory.wram
+            def handler():
+                hl_addr = (regs[REG_H] << 8) | regs[REG_L]
+                if 0xC000 <= hl_addr < 0xE000:
+                    regs[dst] = wram[hl_addr - 0xC000]
+                else:
+                    regs[dst] = read_byte(hl_addr)
+                self.cycles += 8
+        elif dst == src:   # LD r, r（実質NOP）
+            def handler():
+                self.cycles += 4
+        else:              # LD r, r'
+            def handler():
+                regs[dst] = regs[src]
+                self.cycles += 4
+        return handler
+
+    def _make_alu_op(self, op_idx, src, helpers):
+        """ALU A,r ファミリのハンドラを生成 (0x80-0xBF)
+
+        op_idx: 0=ADD 1=ADC 2=SUB 3=SBC 4=AND 5=XOR 6=OR 7=CP
+        """
+        regs = self.regs
+        read_byte = self.memory.read_byte
+        wram = self.memory.wram
+        if op_idx == 7:  # CP r - Aは変更せずフラグのみ
+            if src == 6:
+                def handler():
+                    hl_addr = (regs[REG_H] << 8) | regs[REG_L]
+                    if 0xC000 <= hl_addr < 0xE000:
+                        self.compare(wram[hl_addr - 0xC000])
+                    else:
+                        self.compare(read_byte(hl_addr))
+                    self.cycles += 8
+            else:
+                def handler():
+                    self.compare(regs[src])
+                    self.cycles += 4
+        else:
+            helper = helpers[op_idx]
+            if src == 6:
+                def handler():
+                    hl_addr = (regs[REG_H] << 8) | regs[REG_L]
+                    if 0xC000 <= hl_addr < 0xE000:
+                        regs[REG_A] = helper(regs[REG_A], wram[hl_addr - 0xC000])
+                    else:
+                        regs[REG_A] = helper(regs[REG_A], read_byte(hl_addr))
+                    self.cycles += 8
+            else:
+                def handler():
+                    regs[REG_A] = helper(regs[REG_A], regs[src])
+                    self.cycles += 4
+        return handler
+
+    def _make_inc_r(self, reg: cython.int):
+        """INC r ハンドラを生成 - マイクロコード化"""
+        regs = self.regs
+        def handler():
+            v: cython.int = regs[reg]
+            regs[reg] = _INC_RESULT[v]
+            self.f = (self.f & 0x10) | _INC_FLAGS[v]
+            self.cycles += 4
+            self.run_until_cycle(self.cycles)
+        return handler
+
+    def _make_dec_r(self, reg: cython.int):
+        """DEC r ハンドラを生成 - マイクロコード化"""
+        regs = self.regs
+        def handler():
+            v: cython.int = regs[reg]
+            regs[reg] = _DEC_RESULT[v]
+            self.f = (self.f & 0x10) | _DEC_FLAGS[v]
+            self.cycles += 4
+            self.run_until_cycle(self.cycles)
+            # DEC r + JR NZ はループ末尾の定番ペア — 融合ディスパッチ
+            self._fuse_jr_after()
+        return handler
+
+    def _make_rst(self, address):
+        """RST nnH ハンドラを生成"""
+        def handler():
+            self.push_word(self.pc)
+            self.pc = address
+            self.cycles += 16
+        return handler
+
+    def _make_jr_cc(self, mask: cython.int, expect: cython.int):
+        """JR cc,n ハンドラを生成 (0x20/0x28/0x30/0x38)
+
+        条件判定は (f & mask) == expect に正規化してあるので、
+        NZ/Z/NC/Cの4条件をクロージャ本体1つで賄える。
+        """
+        def handler():
+            offset = self.fetch_byte()
+            if (self.f & mask) == expect:
+                self.pc = (self.pc + _SIGN8[offset]) & 0xFFFF
+                self.cycles += 12
+            else:
+                self.cycles += 8
+        return handler
+
+    def _make_jp_cc(self, mask: cython.int, expect: cython.int):
+        """JP cc,nn ハンドラを生成 (0xC2/0xCA/0xD2/0xDA)"""
+        def handler():
+            address = self.fetch_word()
+            if (self.f & mask) == expect:
+                self.pc = address
+                self.cycles += 16
+            else:
+                self.cycles += 12
+        return handler
+
+    def _make_call_cc(self, mask: cython.int, expect: cython.int):
+        """CALL cc,nn ハンドラを生成 (0xC4/0xCC/0xD4/0xDC)"""
+        def handler():
+            address = self.fetch_word()
+            if (self.f & mask) == expect:
+                self.push_word(self.pc)
+                self.pc = address
+                self.cycles += 24
+            else:
+                self.cycles += 12
+        return handler
+
+    def _make_ret_cc(self, mask: cython.int, expect: cython.int):
+        """RET cc ハンドラを生成 (0xC0/0xC8/0xD0/0xD8)"""
+        def handler():
+            if (self.f & mask) == expect:
+                self.pc = self.pop_word()
+                self.cycles += 20
+            else:
+                self.cycles += 8
+        return handler
+
     def _op_unimplemented(self):
         """Handler for unimplemented opcodes"""
         if self.debug:
@@ -213,7 +702,9 @@ class CPU:
         
     def _op_ld_hl_nn(self):
         """LD HL, nn - Load 16-bit immediate into HL (0x21)"""
-        self.set_hl(self.fetch_word())
+        nn = self.fetch_word()
+        self.regs[REG_H] = nn >> 8
+        self.regs[REG_L] = nn & 0xFF
         self.cycles += 12
         
     def _op_ld_sp_nn(self):
@@ -223,70 +714,78 @@ class CPU:
         
     def _op_ld_b_n(self):
         """LD B, n - Load immediate into B (0x06)"""
-        self.b = self.fetch_byte()
+        self.regs[REG_B] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_c_n(self):
         """LD C, n - Load immediate into C (0x0E)"""
-        self.c = self.fetch_byte()
+        self.regs[REG_C] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_d_n(self):
         """LD D, n - Load immediate into D (0x16)"""
-        self.d = self.fetch_byte()
+        self.regs[REG_D] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_e_n(self):
         """LD E, n - Load immediate into E (0x1E)"""
-        self.e = self.fetch_byte()
+        self.regs[REG_E] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_h_n(self):
         """LD H, n - Load immediate into H (0x26)"""
-        self.h = self.fetch_byte()
+        self.regs[REG_H] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_l_n(self):
         """LD L, n - Load immediate into L (0x2E)"""
-        self.l = self.fetch_byte()
+        self.regs[REG_L] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_a_n(self):
         """LD A, n - Load immediate into A (0x3E)"""
-        self.a = self.fetch_byte()
+        self.regs[REG_A] = self.fetch_byte()
         self.cycles += 8
         
     def _op_ld_hl_plus_a(self):
         """LD (HL+), A - Store A to (HL), increment HL (0x22)"""
-        hl_addr = self.get_hl()
-        self.memory.write_byte(hl_addr, self.a)
-        self.set_hl((hl_addr + 1) & 0xFFFF)
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.memory.write_byte(hl_addr, self.regs[REG_A])
+        hl_addr = (hl_addr + 1) & 0xFFFF
+        self.regs[REG_H] = hl_addr >> 8
+        self.regs[REG_L] = hl_addr & 0xFF
         self.cycles += 8
         
     def _op_ld_hl_minus_a(self):
         """LD (HL-), A - Store A to (HL), decrement HL (0x32)"""
-        hl_addr = self.get_hl()
-        self.memory.write_byte(hl_addr, self.a)
-        self.set_hl((hl_addr - 1) & 0xFFFF)
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.memory.write_byte(hl_addr, self.regs[REG_A])
+        hl_addr = (hl_addr - 1) & 0xFFFF
+        self.regs[REG_H] = hl_addr >> 8
+        self.regs[REG_L] = hl_addr & 0xFF
         self.cycles += 8
         
     def _op_ld_a_hl_plus(self):
         """LD A, (HL+) - Load from (HL) to A, increment HL (0x2A)"""
-        hl_addr = self.get_hl()
-        self.a = self.memory.read_byte(hl_addr)
-        self.set_hl((hl_addr + 1) & 0xFFFF)
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.regs[REG_A] = self.memory.read_byte(hl_addr)
+        hl_addr = (hl_addr + 1) & 0xFFFF
+        self.regs[REG_H] = hl_addr >> 8
+        self.regs[REG_L] = hl_addr & 0xFF
         self.cycles += 8
         
     def _op_ld_a_hl_minus(self):
         """LD A, (HL-) - Load from (HL) to A, decrement HL (0x3A)"""
-        hl_addr = self.get_hl()
-        self.a = self.memory.read_byte(hl_addr)
-        self.set_hl((hl_addr - 1) & 0xFFFF)
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.regs[REG_A] = self.memory.read_byte(hl_addr)
+        hl_addr = (hl_addr - 1) & 0xFFFF
+        self.regs[REG_H] = hl_addr >> 8
+        self.regs[REG_L] = hl_addr & 0xFF
         self.cycles += 8
         
     def _op_inc_hl(self):
         """INC (HL) - Increment value at (HL) (0x34)"""
-        hl_addr = self.get_hl()
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
         value = self.memory.read_byte(hl_addr)
         result = self.inc_8bit(value)
         self.cycles += 4
@@ -295,7 +794,7 @@ class CPU:
         
     def _op_dec_hl(self):
         """DEC (HL) - Decrement value at (HL) (0x35)"""
-        hl_addr = self.get_hl()
+        hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
         value = self.memory.read_byte(hl_addr)
         result = self.dec_8bit(value)
         self.cycles += 4
@@ -304,20 +803,20 @@ class CPU:
         
     def _op_ld_hl_a(self):
         """LD (HL), A - Store A to (HL) (0x77)"""
-        self.memory.write_byte(self.get_hl(), self.a)
+        self.memory.write_byte((self.regs[REG_H] << 8) | self.regs[REG_L], self.regs[REG_A])
         self.cycles += 8
         
     def _op_ld_a_hl(self):
         """LD A, (HL) - Load from (HL) to A (0x7E)"""
-        self.a = self.memory.read_byte(self.get_hl())
+        self.regs[REG_A] = self.memory.read_byte((self.regs[REG_H] << 8) | self.regs[REG_L])
         self.cycles += 8
         
     def _op_jr_n(self):
         """JR n - Relative jump (0x18)"""
+        # オフセットは先にローカルへ。式に畳むとself.pcがfetch前に
+        # 評価され、飛び先が1バイト手前にずれる
         offset = self.fetch_byte()
-        if offset > 127:
-            offset = offset - 256
-        self.pc = (self.pc + offset) & 0xFFFF
+        self.pc = (self.pc + _SIGN8[offset]) & 0xFFFF
         self.cycles += 12
         
     def _op_jp_nn(self):
@@ -347,193 +846,720 @@ class CPU:
         self.pc = (high << 8) | low
         self.cycles += 16
 
-    def init_for_boot_rom(self):
-        """Initialize CPU state for boot ROM execution"""
-        # Reset all registers to boot ROM initial state
-        self.a = 0x00
-        self.b = 0x00
-        self.c = 0x00
-        self.d = 0x00
-        self.e = 0x00
-        self.h = 0x00
-        self.l = 0x00
-        
-        # Boot ROM starts at 0x0000
-        self.pc = 0x0000
-        self.sp = 0xFFFE
-        
-        # Clear flags
-        self.flag_z = False
-        self.flag_n = False  
-        self.flag_h = False
-        self.flag_c = False
-        
-        # Reset cycle count
-        self.cycles = 0
-        
-    def init_for_game_rom(self):
-        """Initialize CPU state for game ROM execution (post-boot ROM完了状態)"""
-        # DMG boot ROM完了時の正確なレジスタ値
-        self.a = 0x01  # Game Boy DMG identification
-        self.b = 0x00
-        self.c = 0x13  # Boot ROM completion marker
-        self.d = 0x00
-        self.e = 0xD8  # Boot ROM specific value
-        self.h = 0x01
-        self.l = 0x4D  # Boot ROM specific value
-        
-        # フラグレジスタの正確な初期化（AF=01B0 → F=B0）
-        # B0 = 1011 0000 → Z=1, N=0, H=1, C=1
-        self.flag_z = True   # Zero flag set
-        self.flag_n = False  # Subtract flag clear
-        self.flag_h = True   # Half-carry flag set
-        self.flag_c = True   # Carry flag set
-        
-        # スタックポインタとプログラムカウンタ
-        self.sp = 0xFFFE    # Standard stack pointer after boot
-        self.pc = 0x0100    # Game ROM entry point
-        
-        # 割り込み制御の正確な初期化
-        self.interrupt_master_enable = False  # IME disabled after boot
-        self.halted = False
-        self.ei_delay = 0
-        self.halt_bug_active = False
-        
-        # 割り込みレジスタを明示的に初期化
-        self.memory.write_byte(0xFFFF, 0x00)  # IE (Interrupt Enable) = 0x00
-        self.memory.write_byte(0xFF0F, 0x00)  # IF (Interrupt Flag) = 0x00
-        
-        if hasattr(self, 'debug') and self.debug:
-            print(f"🎯 CPU初期化完了: AF=0x{self.a:02X}{self.get_f():02X}, BC=0x{self.b:02X}{self.c:02X}, DE=0x{self.d:02X}{self.e:02X}, HL=0x{self.h:02X}{self.l:02X}")
-            print(f"🎯 PC=0x{self.pc:04X}, SP=0x{self.sp:04X}, IME={self.interrupt_master_enable}")
-        
-    def handle_interrupts(self):
-        """Handle pending interrupts - PyBoy style"""
-        if not self.interrupt_master_enable:  # IME must be enabled
-            return False
-            
-        # Read interrupt enable and interrupt flag registers
+    def _op_ld_b_b(self):
+        """LD B,B (0x40) - 実質NOP、Mooneye完了マーカー
+
+        Mooneyeテストスイートは完了通知にLD B,Bを使う（ソフトウェア
+        ブレークポイント慣習）。レジスタ転送は恒等なので、実行時は
+        フラグを立てるだけにし、run_watch()が監視する。
+        """
+        self.mooneye_complete = True
+        self.cycles += 4
+
+    def _op_halt(self):
+        """HALT - PyBoy style with HALT bug (0x76)"""
+        if TIMER_DEBUG:
+            print(f"[CPU] HALT instruction executed")
+
+        # Check for pending interrupts to determine HALT behavior
         ie = self.memory.read_byte(0xFFFF)  # IE register
         if_reg = self.memory.read_byte(0xFF0F)  # IF register
-        
-        # Check for enabled and pending interrupts
-        pending = ie & if_reg & 0x1F  # Only check 5 interrupt bits
-        
-        if pending > 0:
-            # PyBoy style: interrupt vector array (same as RubyBoy)
-            interrupt_vectors = [0x40, 0x48, 0x50, 0x58, 0x60]
-            
-            # Check each interrupt in priority order
-            for i in range(5):
-                if pending & (1 << i):
-                    vector = interrupt_vectors[i]
-                    flag_bit = 1 << i
-                    
-                    if os.getenv('TIMER_DEBUG') and i == 2:  # Timer interrupt
-                        print(f"[CPU] Servicing timer interrupt! PC=0x{self.pc:04X} -> 0x{vector:04X}")
-                    
-                    # PyBoy style interrupt handling - simpler
-                    self.interrupt_master_enable = False  # Disable IME
-                    
-                    # Clear interrupt flag
-                    new_if = if_reg & ~flag_bit
-                    self.memory.write_byte(0xFF0F, new_if)
-                    
-                    # Push current PC to stack
-                    self.push_word(self.pc)
-                    
-                    # Jump to interrupt vector
-                    self.pc = vector
-                    
-                    # Takes 20 cycles
-                    self.cycles += 20
-                    return True
-            
-        return False
-    
-        
-    def get_f(self):
-        """Get flags register value"""
-        f = 0
-        if self.flag_z: f |= 0x80
-        if self.flag_n: f |= 0x40
-        if self.flag_h: f |= 0x20
-        if self.flag_c: f |= 0x10
-        return f
-    
-    def set_f(self, value):
-        """Set flags register value"""
-        self.flag_z = bool(value & 0x80)
-        self.flag_n = bool(value & 0x40)
-        self.flag_h = bool(value & 0x20)
-        self.flag_c = bool(value & 0x10)
-    
-    def get_af(self):
-        """Get AF register pair"""
-        return (self.a << 8) | self.get_f()
-    
-    def set_af(self, value):
-        """Set AF register pair"""
-        self.a = (value >> 8) & 0xFF
-        self.set_f(value & 0xFF)
-    
-    def get_bc(self):
-        """Get BC register pair"""
-        return (self.b << 8) | self.c
-    
-    def set_bc(self, value):
-        """Set BC register pair"""
-        self.b = (value >> 8) & 0xFF
-        self.c = value & 0xFF
-    
-    def get_de(self):
-        """Get DE register pair"""
-        return (self.d << 8) | self.e
-    
-    def set_de(self, value):
-        """Set DE register pair"""
-        self.d = (value >> 8) & 0xFF
-        self.e = value & 0xFF
-    
-    def get_hl(self):
-        """Get HL register pair"""
-        return (self.h << 8) | self.l
-    
-    def set_hl(self, value):
-        """Set HL register pair"""
-        self.h = (value >> 8) & 0xFF
-        self.l = value & 0xFF
-    
-    def fetch_byte(self) -> cython.int:
-        """Fetch next byte from memory at PC"""
-        byte: cython.int = self.memory.read_byte(self.pc)
+        pending = ie & if_reg & 0x1F
 
-        # Debug specific PC addresses
-        if os.getenv('TIMER_DEBUG') and self.pc == 0xC370:
-            print(f"[CPU] 🔍 fetch_byte at PC=0x{self.pc:04X} returned 0x{byte:02X}")
+        if self.interrupt_master_enable:
+            # Normal HALT: enable interrupts, CPU sleeps
+            self.halted = True
+            if TIMER_DEBUG:
+                print(f"[CPU] Normal HALT: IME=True, sleeping")
+        elif pending:
+            # HALT bug: IME=False but interrupts pending
+            # Next instruction will be executed twice (Game Boy hardware bug)
+            self.halt_bug_active = True
+            if TIMER_DEBUG:
+                print(f"[CPU] HALT bug activated: IME=False, pending interrupts=0x{pending:02X}")
+        else:
+            # Simple HALT: no interrupts pending, just sleep
+            self.halted = True
+            if TIMER_DEBUG:
+                print(f"[CPU] Simple HALT: no pending interrupts")
 
-        self.pc = (self.pc + 1) & 0xFFFF
-        return byte
+        self.cycles += 4
 
-    def fetch_word(self) -> cython.int:
-        """Fetch next word (16-bit) from memory at PC"""
-        low: cython.int = self.fetch_byte()
-        high: cython.int = self.fetch_byte()
-        return (high << 8) | low
-    
-    def push_byte(self, value):
-        """Push byte onto stack"""
-        self.sp = (self.sp - 1) & 0xFFFF
-        self.memory.write_byte(self.sp, value & 0xFF)
-    
-    def push_word(self, value):
-        """Push word onto stack"""
-        self.push_byte((value >> 8) & 0xFF)
-        self.push_byte(value & 0xFF)
-    
-    def pop_byte(self):
-        """Pop byte from stack"""
-        value = self.memory.read_byte(self.sp)
+    def _op_di(self):
+        """DI - Disable interrupts (0xF3)"""
+        self.interrupt_master_enable = False
+        self.cycles += 4
+
+    def _op_ei(self):
+        """EI - Enable interrupts (0xFB) - PyBoy precise style"""
+        # PyBoy accurate: 1-cycle delay before IME enable (Game Boy hardware behavior)
+        self.ei_delay = 2  # Enable IME after the instruction FOLLOWING EI
+        if TIMER_DEBUG:
+            print(f"[CPU] EI instruction executed - IME will be enabled after next instruction")
+        self.cycles += 4
+
+    def _op_cb_prefix(self):
+        """CB-prefixed opcodes (0xCB)
+
+        プレフィックスフェッチとファミリディスパッチを融合した
+        スーパーインストラクション。execute_cb_instruction()経由の
+        中間呼び出しを1段スキップする。
+        """
+        # PyBoy方式: CBフェッチ分を先に加算
+        self.cycles += 4  # CB opcode fetch
+        cb_opcode = self.fetch_byte()
+        self._cb_dispatch[cb_opcode >> 6](cb_opcode)
+
+    def _op_invalid_ed(self):
+        """0xED - invalid opcode on LR35902"""
+        raise NotImplementedError(f"Unimplemented opcode: 0xED at PC: 0x{self.pc:04X}")
+
+    def _op_daa(self):
+        """DAA - Decimal Adjust Accumulator (0x27)"""
+        # Correct DAA implementation for Game Boy
+        if not (self.f & 0x40):  # After addition
+            if (self.f & 0x10) or self.regs[REG_A] > 0x99:
+                self.regs[REG_A] = (self.regs[REG_A] + 0x60) & 0xFF
+                self.f |= 0x10
+            if (self.f & 0x20) or (self.regs[REG_A] & 0x0F) > 0x09:
+                self.regs[REG_A] = (self.regs[REG_A] + 0x06) & 0xFF
+        else:  # After subtraction
+            if self.f & 0x10:
+                self.regs[REG_A] = (self.regs[REG_A] - 0x60) & 0xFF
+            if self.f & 0x20:
+                self.regs[REG_A] = (self.regs[REG_A] - 0x06) & 0xFF
+
+        # Z再計算・Hクリア（N,Cは保持）
+        self.f = (self.f & 0x50) | ((self.regs[REG_A] == 0) << 7)
+        self.cycles += 4
+
+    def _op_cpl(self):
+        """CPL - Complement A register (0x2F)"""
+        self.regs[REG_A] = (~self.regs[REG_A]) & 0xFF
+        self.f |= 0x60  # N,Hセット
+        self.cycles += 4
+
+    def _op_scf(self):
+        """SCF - Set Carry Flag (0x37)"""
+        self.f = (self.f & 0x80) | 0x10
+        self.cycles += 4
+
+    def _op_ccf(self):
+        """CCF - Complement Carry Flag (0x3F)"""
+        self.f = (self.f & 0x90) ^ 0x10
+        self.cycles += 4
+
+    def _op_ld_nn_sp(self):
+        """LD (nn), SP - Store SP at absolute address (0x08)"""
+        address = self.fetch_word()
+        self.memory.write_byte(address, self.sp & 0xFF)
+        self.memory.write_byte(address + 1, (self.sp >> 8) & 0xFF)
+        self.cycles += 20
+
+    def _op_ld_hl_sp_n(self):
+        """LD HL, SP+n - Load SP plus signed offset into HL (0xF8)"""
+        offset: cython.int = _SIGN8[self.fetch_byte()]
+        result = (self.sp + offset) & 0xFFFF
+        self.f = ((((self.sp & 0x0F) + (offset & 0x0F)) > 0x0F) << 5) | \
+                 ((((self.sp & 0xFF) + (offset & 0xFF)) > 0xFF) << 4)
+        self.regs[REG_H] = result >> 8
+        self.regs[REG_L] = result & 0xFF
+        self.cycles += 12
+
+    def _op_ld_sp_hl(self):
+        """LD SP, HL (0xF9)"""
+        self.sp = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.cycles += 8
+
+    def _op_ld_hl_n(self):
+        """LD (HL), n - Load immediate into address HL (0x36)"""
+        # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
+        self.cycles += 4  # フェッチ分
+        value = self.fetch_byte()
+        address = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.memory.write_byte(address, value)
+        self.cycles += 8  # メモリアクセス分
+
+    def _op_ld_bc_a(self):
+        """LD (BC), A (0x02)"""
+        self.memory.write_byte(self.get_bc(), self.regs[REG_A])
+        self.cycles += 8
+
+    def _op_ld_de_a(self):
+        """LD (DE), A (0x12)"""
+        self.memory.write_byte(self.get_de(), self.regs[REG_A])
+        self.cycles += 8
+
+    def _op_ld_a_bc(self):
+        """LD A, (BC) (0x0A)"""
+        self.regs[REG_A] = self.memory.read_byte(self.get_bc())
+        self.cycles += 8
+
+    def _op_ld_a_de(self):
+        """LD A, (DE) (0x1A)"""
+        self.regs[REG_A] = self.memory.read_byte(self.get_de())
+        self.cycles += 8
+
+    def _op_ld_nn_a(self):
+        """LD (nn), A - Store A at absolute address (0xEA)"""
+        # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
+        self.cycles += 8  # フェッチ分（2バイト）
+        address = self.fetch_word()
+        self.memory.write_byte(address, self.regs[REG_A])
+        self.cycles += 8  # メモリアクセス分
+
+    def _op_ld_a_nn(self):
+        """LD A, (nn) - Load A from absolute address (0xFA)"""
+        # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
+        self.cycles += 8  # フェッチ分（2バイト）
+        address = self.fetch_word()
+        self.regs[REG_A] = self.memory.read_byte(address)
+        self.cycles += 8  # メモリアクセス分
+
+    def _op_ldh_n_a(self):
+        """LD (0xFF00+n), A (0xE0)"""
+        # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
+        self.cycles += 4  # フェッチ分
+        n = self.fetch_byte()
+        addr = 0xFF00 + n
+        self.memory.write_byte(addr, self.regs[REG_A])
+        self.cycles += 8  # メモリアクセス分
+
+    def _op_ldh_a_n(self):
+        """LD A, (0xFF00+n) (0xF0)"""
+        # PyBoy方式: memory.read_byte()内でtimer.tick()が呼ばれる
+        # timer.tick()の二重呼び出しを避けるため、命令内では呼ばない
+        self.cycles += 4  # フェッチ分
+        n = self.fetch_byte()
+
+        # メモリアクセス（この時点でmemory.read_byte()内でtimer.tick()呼ばれる）
+        addr = 0xFF00 + n
+        self.regs[REG_A] = self.memory.read_byte(addr)
+
+        self.cycles += 8  # メモリアクセス分
+
+    def _op_ld_ff_c_a(self):
+        """LD (0xFF00+C), A (0xE2)"""
+        address = 0xFF00 + self.regs[REG_C]
+        self.memory.write_byte(address, self.regs[REG_A])
+        self.cycles += 8
+
+    def _op_ld_a_ff_c(self):
+        """LD A, (0xFF00+C) (0xF2)"""
+        address = 0xFF00 + self.regs[REG_C]
+        self.regs[REG_A] = self.memory.read_byte(address)
+        self.cycles += 8
+
+    def _op_inc_bc(self):
+        """INC BC (0x03)"""
+        self.set_bc((self.get_bc() + 1) & 0xFFFF)
+        self.cycles += 8
+
+    def _op_dec_bc(self):
+        """DEC BC (0x0B)"""
+        self.set_bc((self.get_bc() - 1) & 0xFFFF)
+        self.cycles += 8
+
+    def _op_inc_de(self):
+        """INC DE (0x13)"""
+        self.set_de((self.get_de() + 1) & 0xFFFF)
+        self.cycles += 8
+
+    def _op_dec_de(self):
+        """DEC DE (0x1B)"""
+        self.set_de((self.get_de() - 1) & 0xFFFF)
+        self.cycles += 8
+
+    def _op_inc_hl_16(self):
+        """INC HL (0x23)"""
+        hl = ((self.regs[REG_H] << 8) | self.regs[REG_L]) + 1
+        self.regs[REG_H] = (hl >> 8) & 0xFF
+        self.regs[REG_L] = hl & 0xFF
+        self.cycles += 8
+
+    def _op_dec_hl_16(self):
+        """DEC HL (0x2B)"""
+        hl = (((self.regs[REG_H] << 8) | self.regs[REG_L]) - 1) & 0xFFFF
+        self.regs[REG_H] = hl >> 8
+        self.regs[REG_L] = hl & 0xFF
+        self.cycles += 8
+
+    def _op_inc_sp(self):
+        """INC SP (0x33)"""
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 8
+
+    def _op_dec_sp(self):
+        """DEC SP (0x3B)"""
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.cycles += 8
+
+    def _op_add_hl_bc(self):
+        """ADD HL, BC (0x09)"""
+        hl = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        bc = (self.regs[REG_B] << 8) | self.regs[REG_C]
+        result = hl + bc
+        # Zは保持、N=0、H/Cをパック更新
+        self.f = (self.f & 0x80) | ((((hl & 0x0FFF) + (bc & 0x0FFF)) > 0x0FFF) << 5) | \
+                 ((result > 0xFFFF) << 4)
+        self.regs[REG_H] = (result >> 8) & 0xFF
+        self.regs[REG_L] = result & 0xFF
+        self.cycles += 8
+
+    def _op_add_hl_de(self):
+        """ADD HL, DE (0x19)"""
+        hl = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        de = (self.regs[REG_D] << 8) | self.regs[REG_E]
+        result = hl + de
+        self.f = (self.f & 0x80) | ((((hl & 0x0FFF) + (de & 0x0FFF)) > 0x0FFF) << 5) | \
+                 ((result > 0xFFFF) << 4)
+        self.regs[REG_H] = (result >> 8) & 0xFF
+        self.regs[REG_L] = result & 0xFF
+        self.cycles += 8
+
+    def _op_add_hl_hl(self):
+        """ADD HL, HL (0x29)"""
+        hl = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        result = hl + hl
+        self.f = (self.f & 0x80) | ((((hl & 0x0FFF) + (hl & 0x0FFF)) > 0x0FFF) << 5) | \
+                 ((result > 0xFFFF) << 4)
+        result &= 0xFFFF
+        self.regs[REG_H] = result >> 8
+        self.regs[REG_L] = result & 0xFF
+        self.cycles += 8
+
+    def _op_add_hl_sp(self):
+        """ADD HL, SP (0x39)"""
+        hl = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        result = hl + self.sp
+        self.f = (self.f & 0x80) | ((((hl & 0x0FFF) + (self.sp & 0x0FFF)) > 0x0FFF) << 5) | \
+                 ((result > 0xFFFF) << 4)
+        result &= 0xFFFF
+        self.regs[REG_H] = result >> 8
+        self.regs[REG_L] = result & 0xFF
+        self.cycles += 8
+
+    def _op_add_sp_n(self):
+        """ADD SP, n - signed 8-bit immediate (0xE8)"""
+        signed_offset: cython.int = _SIGN8[self.fetch_byte()]
+        result = self.sp + signed_offset
+        # Correct flag calculation for signed arithmetic (Z=N=0)
+        self.f = ((((self.sp & 0x0F) + (signed_offset & 0x0F)) > 0x0F) << 5) | \
+                 ((((self.sp & 0xFF) + (signed_offset & 0xFF)) > 0xFF) << 4)
+        self.sp = result & 0xFFFF
+        self.cycles += 16
+
+    def _op_add_a_n(self):
+        """ADD A, n - Add immediate to A (0xC6)"""
+        self.regs[REG_A] = self.add_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_adc_a_n(self):
+        """ADC A, n - Add immediate with carry to A (0xCE)"""
+        self.regs[REG_A] = self.adc_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_sub_n(self):
+        """SUB n - Subtract immediate from A (0xD6)"""
+        self.regs[REG_A] = self.sub_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_sbc_a_n(self):
+        """SBC A, n - Subtract immediate with carry from A (0xDE)"""
+        self.regs[REG_A] = self.sbc_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_and_n(self):
+        """AND n - AND A with immediate byte (0xE6)"""
+        self.regs[REG_A] = self.and_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_xor_n(self):
+        """XOR n (0xEE)"""
+        self.regs[REG_A] = self.xor_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_or_n(self):
+        """OR n - OR A with immediate (0xF6)"""
+        self.regs[REG_A] = self.or_8bit(self.regs[REG_A], self.fetch_byte())
+        self.cycles += 8
+
+    def _op_cp_n(self):
+        """CP n - Compare A with immediate value (0xFE)"""
+        self.compare(self.fetch_byte())
+        self.cycles += 8
+        # CP d8 + JR NZ/Z は比較→分岐の定番ペア — 融合ディスパッチ
+        self._fuse_jr_after()
+
+    def _op_rlca(self):
+        """RLCA - Rotate A left circular (0x07)"""
+        carry = (self.regs[REG_A] >> 7) & 0x01
+        self.regs[REG_A] = ((self.regs[REG_A] << 1) | carry) & 0xFF
+        self.f = carry << 4
+        self.cycles += 4
+
+    def _op_rrca(self):
+        """RRCA - Rotate A right circular (0x0F)"""
+        carry = self.regs[REG_A] & 0x01
+        self.regs[REG_A] = ((self.regs[REG_A] >> 1) | (carry << 7)) & 0xFF
+        self.f = carry << 4
+        self.cycles += 4
+
+    def _op_rla(self):
+        """RLA - Rotate A left through carry (0x17)"""
+        carry = (self.f >> 4) & 1
+        self.f = (self.regs[REG_A] & 0x80) >> 3  # bit7 -> C
+        self.regs[REG_A] = ((self.regs[REG_A] << 1) | carry) & 0xFF
+        self.cycles += 4
+
+    def _op_rra(self):
+        """RRA - Rotate A right through carry (0x1F)"""
+        carry = (self.f >> 4) & 1
+        self.f = (self.regs[REG_A] & 0x01) << 4
+        self.regs[REG_A] = (self.regs[REG_A] >> 1) | (carry << 7)
+        self.cycles += 4
+
+    def _fuse_jr_after(self) -> cython.bint:
+        """直後のJR NZ/Z (0x20/0x28) を同一ディスパッチ内で実行する
+
+        フラグを立てる命令と条件ジャンプの定番ペアを1回のディスパッチに
+        融合し、step()一周分のオーバーヘッドを省く（スーパー
+        インストラクション）。観測可能な振る舞いを変えないための条件は
+        BIT+JR融合と同じ: EI遅延中・デバッグトレース中・HALTバグの
+        2重実行リプレイ中（pc-1巻き戻しがJRまで巻き込むと壊れる）は
+        見送り、先行命令分のコンポーネント更新を反映した上でサービス
+        可能な割り込みがあればstep()側の割り込み処理に委ねる。
+
+        Returns:
+            融合してJRを実行したらTrue
+        """
+        next_op: cython.int = self.memory.read_byte(self.pc)
+        if next_op != 0x20 and next_op != 0x28:
+            return False
+        if self.ei_delay > 0 or self.debug or self.halt_bug_active:
+            return False
+        self.run_until_cycle(self.cycles)
+        if self.interrupt_master_enable and (
+                self.memory.read_byte(0xFFFF)
+                & self.memory.read_byte(0xFF0F) & 0x1F):
+            return False
+        self.pc = (self.pc + 1) & 0xFFFF
+        # JRハンドラはオペコードフェッチ込みの総サイクルを自前で加算する
+        self.opcode_table[next_op]()
+        return True
+
+    def _op_jp_hl(self):
+        """JP (HL) - Jump to address in HL (0xE9)"""
+        self.pc = (self.regs[REG_H] << 8) | self.regs[REG_L]
+        self.cycles += 4
+
+    def _op_reti(self):
+        """RETI - Return and enable interrupts (0xD9)"""
+        self.pc = self.pop_word()
+        self.interrupt_master_enable = True  # Enable interrupts
+        self.cycles += 16
+
+    def _op_push_bc(self):
+        """PUSH BC - マイクロコード化 (0xC5)"""
+        # フェーズ1: 内部処理 (4T)
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+        # フェーズ2: ハイバイト書き込み (4T)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_B])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+        # フェーズ3: ローワイト書き込み (4T)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_C])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_push_de(self):
+        """PUSH DE - マイクロコード化 (0xD5)"""
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_D])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_E])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_push_hl(self):
+        """PUSH HL - マイクロコード化 (0xE5)"""
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_H])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_L])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_push_af(self):
+        """PUSH AF - マイクロコード化 (0xF5)"""
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.regs[REG_A])
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, self.f)
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_pop_bc(self):
+        """POP BC - マイクロコード化 (0xC1)"""
+        # フェーズ1: ローワイト読み取り (4T)
+        low = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.regs[REG_C] = low
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+        # フェーズ2: ハイバイト読み取り (4T)
+        high = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.regs[REG_B] = high
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_pop_de(self):
+        """POP DE - マイクロコード化 (0xD1)"""
+        self.regs[REG_E] = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.regs[REG_D] = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_pop_hl(self):
+        """POP HL - マイクロコード化 (0xE1)"""
+        self.regs[REG_L] = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.regs[REG_H] = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def _op_pop_af(self):
+        """POP AF - マイクロコード化 (0xF1)"""
+        f_reg = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.f = f_reg & 0xF0  # 下位4ビットは常に0
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+        self.regs[REG_A] = self.memory.read_byte(self.sp)
+        self.sp = (self.sp + 1) & 0xFFFF
+        self.cycles += 4
+        self.run_until_cycle(self.cycles)
+
+    def init_for_boot_rom(self):
+        """Initialize CPU state for boot ROM execution"""
+        # Reset all registers to boot ROM initial state
+        self.regs[REG_A] = 0x00
+        self.regs[REG_B] = 0x00
+        self.regs[REG_C] = 0x00
+        self.regs[REG_D] = 0x00
+        self.regs[REG_E] = 0x00
+        self.regs[REG_H] = 0x00
+        self.regs[REG_L] = 0x00
+        
+        # Boot ROM starts at 0x0000
+        self.pc = 0x0000
+        self.sp = 0xFFFE
+        
+        # Clear flags
+        self.f = 0x00
+        
+        # Reset cycle count
+        self.cycles = 0
+        
+    def init_for_game_rom(self):
+        """Initialize CPU state for game ROM execution (post-boot ROM完了状態)"""
+        # DMG boot ROM完了時の正確なレジスタ値
+        self.regs[REG_A] = 0x01  # Game Boy DMG identification
+        self.regs[REG_B] = 0x00
+        self.regs[REG_C] = 0x13  # Boot ROM completion marker
+        self.regs[REG_D] = 0x00
+        self.regs[REG_E] = 0xD8  # Boot ROM specific value
+        self.regs[REG_H] = 0x01
+        self.regs[REG_L] = 0x4D  # Boot ROM specific value
+        
+        # フラグレジスタの正確な初期化（AF=01B0 → F=B0）
+        # B0 = 1011 0000 → Z=1, N=0, H=1, C=1
+        self.f = 0xB0
+        
+        # スタックポインタとプログラムカウンタ
+        self.sp = 0xFFFE    # Standard stack pointer after boot
+        self.pc = 0x0100    # Game ROM entry point
+        
+        # 割り込み制御の正確な初期化
+        self.interrupt_master_enable = False  # IME disabled after boot
+        self.halted = False
+        self.ei_delay = 0
+        self.halt_bug_active = False
+        
+        # 割り込みレジスタを明示的に初期化
+        self.memory.write_byte(0xFFFF, 0x00)  # IE (Interrupt Enable) = 0x00
+        self.memory.write_byte(0xFF0F, 0x00)  # IF (Interrupt Flag) = 0x00
+        
+        if hasattr(self, 'debug') and self.debug:
+            print(f"🎯 CPU初期化完了: AF=0x{self.regs[REG_A]:02X}{self.get_f():02X}, BC=0x{self.regs[REG_B]:02X}{self.regs[REG_C]:02X}, DE=0x{self.regs[REG_D]:02X}{self.regs[REG_E]:02X}, HL=0x{self.regs[REG_H]:02X}{self.regs[REG_L]:02X}")
+            print(f"🎯 PC=0x{self.pc:04X}, SP=0x{self.sp:04X}, IME={self.interrupt_master_enable}")
+        
+    def handle_interrupts(self):
+        """Handle pending interrupts - PyBoy style"""
+        if not self.interrupt_master_enable:  # IME must be enabled
+            return False
+            
+        # Read interrupt enable and interrupt flag registers
+        ie = self.memory.read_byte(0xFFFF)  # IE register
+        if_reg = self.memory.read_byte(0xFF0F)  # IF register
+        
+        # Check for enabled and pending interrupts
+        pending = ie & if_reg & 0x1F  # Only check 5 interrupt bits
+        
+        if pending > 0:
+            # PyBoy style: interrupt vector array (same as RubyBoy)
+            interrupt_vectors = [0x40, 0x48, 0x50, 0x58, 0x60]
+            
+            # Check each interrupt in priority order
+            for i in range(5):
+                if pending & (1 << i):
+                    vector = interrupt_vectors[i]
+                    flag_bit = 1 << i
+                    
+                    if TIMER_DEBUG and i == 2:  # Timer interrupt
+                        print(f"[CPU] Servicing timer interrupt! PC=0x{self.pc:04X} -> 0x{vector:04X}")
+                    
+                    # PyBoy style interrupt handling - simpler
+                    self.interrupt_master_enable = False  # Disable IME
+                    
+                    # Clear interrupt flag
+                    new_if = if_reg & ~flag_bit
+                    self.memory.write_byte(0xFF0F, new_if)
+                    
+                    # Push current PC to stack
+                    self.push_word(self.pc)
+                    
+                    # Jump to interrupt vector
+                    self.pc = vector
+                    
+                    # Takes 20 cycles
+                    self.cycles += 20
+                    return True
+            
+        return False
+    
+        
+    def get_f(self):
+        """Get flags register value"""
+        return self.f
+    
+    def set_f(self, value):
+        """Set flags register value"""
+        self.f = value & 0xF0
+    
+    def get_af(self):
+        """Get AF register pair"""
+        return (self.regs[REG_A] << 8) | self.f
+
+    def set_af(self, value):
+        """Set AF register pair"""
+        self.regs[REG_A] = (value >> 8) & 0xFF
+        self.f = value & 0xF0
+    
+    def get_bc(self):
+        """Get BC register pair"""
+        return (self.regs[REG_B] << 8) | self.regs[REG_C]
+    
+    def set_bc(self, value):
+        """Set BC register pair"""
+        self.regs[REG_B] = (value >> 8) & 0xFF
+        self.regs[REG_C] = value & 0xFF
+    
+    def get_de(self):
+        """Get DE register pair"""
+        return (self.regs[REG_D] << 8) | self.regs[REG_E]
+    
+    def set_de(self, value):
+        """Set DE register pair"""
+        self.regs[REG_D] = (value >> 8) & 0xFF
+        self.regs[REG_E] = value & 0xFF
+    
+    def get_hl(self):
+        """Get HL register pair"""
+        return (self.regs[REG_H] << 8) | self.regs[REG_L]
+    
+    def set_hl(self, value):
+        """Set HL register pair"""
+        self.regs[REG_H] = (value >> 8) & 0xFF
+        self.regs[REG_L] = value & 0xFF
+    
+    def fetch_byte(self) -> cython.int:
+        """Fetch next byte from memory at PC
+
+        命令フェッチの大半はROM固定バンクかWRAMから。その2領域は
+        バスのelifカスケードを経由せず配列添字で直接読む
+        （MMIO等その他の領域は従来どおりread_byte()に委ねる）。
+        """
+        pc: cython.int = self.pc
+        byte: cython.int
+        if 0x0100 <= pc < 0x4000:
+            # ROM Bank 0 (fixed) - Boot ROM領域(0x00FF以下)は除外済み
+            rom = self.memory.rom
+            byte = rom[pc] if pc < len(rom) else 0xFF
+        elif 0xC000 <= pc < 0xE000:
+            # Work RAM
+            byte = self.memory.wram[pc - 0xC000]
+        else:
+            byte = self.memory.read_byte(pc)
+
+        # Debug specific PC addresses
+        if TIMER_DEBUG and pc == 0xC370:
+            print(f"[CPU] 🔍 fetch_byte at PC=0x{pc:04X} returned 0x{byte:02X}")
+
+        self.pc = (pc + 1) & 0xFFFF
+        return byte
+
+    def fetch_word(self) -> cython.int:
+        """Fetch next word (16-bit) from memory at PC
+
+        fetch_byte()×2のメソッドフレームを経由せず、2バイトを直接
+        読んでPCを一度に進める（16bit即値を使う全命令に効く）。
+        """
+        pc: cython.int = self.pc
+        low: cython.int = self.memory.read_byte(pc)
+        high: cython.int = self.memory.read_byte((pc + 1) & 0xFFFF)
+        self.pc = (pc + 2) & 0xFFFF
+        return (high << 8) | low
+    
+    def push_byte(self, value):
+        """Push byte onto stack"""
+        self.sp = (self.sp - 1) & 0xFFFF
+        self.memory.write_byte(self.sp, value & 0xFF)
+    
+    def push_word(self, value):
+        """Push word onto stack"""
+        self.push_byte((value >> 8) & 0xFF)
+        self.push_byte(value & 0xFF)
+    
+    def pop_byte(self):
+        """Pop byte from stack"""
+        value = self.memory.read_byte(self.sp)
         self.sp = (self.sp + 1) & 0xFFFF
         return value
     
@@ -543,1755 +1569,409 @@ class CPU:
         high = self.pop_byte()
         return (high << 8) | low
     
-    def inc_8bit(self, value):
+    def inc_8bit(self, value: cython.int) -> cython.int:
         """Increment 8-bit value and set flags"""
-        result = (value + 1) & 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = False
-        # Half-carry occurs when incrementing causes overflow from bit 3 to bit 4
-        self.flag_h = ((value & 0x0F) + 1) > 0x0F
-        return result
+        # 結果・フラグとも前計算テーブル参照（Cは保持、N=0）
+        self.f = (self.f & 0x10) | _INC_FLAGS[value]
+        return _INC_RESULT[value]
     
-    def dec_8bit(self, value):
+    def dec_8bit(self, value: cython.int) -> cython.int:
         """Decrement 8-bit value and set flags"""
-        result = (value - 1) & 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = True
-        # Half-carry occurs when decrementing causes underflow from bit 4 to bit 3
-        self.flag_h = (value & 0x0F) == 0x00
-        return result
+        # 結果・フラグとも前計算テーブル参照（Cは保持、Nセット込み）
+        self.f = (self.f & 0x10) | _DEC_FLAGS[value]
+        return _DEC_RESULT[value]
     
-    def compare(self, value):
+    def compare(self, value: cython.int) -> None:
         """Compare A with value and set flags"""
-        result = self.a - value
-        self.flag_z = (result == 0)
-        self.flag_n = True
-        self.flag_h = ((self.a & 0x0F) < (value & 0x0F))
-        self.flag_c = (self.a < value)
+        a: cython.int = self.regs[REG_A]
+        self.f = 0x40 | ((a == value) << 7) | \
+                 (((a & 0x0F) < (value & 0x0F)) << 5) | ((a < value) << 4)
     
-    def execute_cb_instruction(self, opcode):
-        """Execute CB-prefixed instructions (bit operations) with accurate timing"""
-        
-        # BIT operations (0x40-0x7F) - test bit n in register
-        if opcode >= 0x40 and opcode <= 0x7F:
-            bit = (opcode - 0x40) // 8
-            reg = opcode & 0x07
-            
-            if reg == 0:    # B
-                self.flag_z = not bool(self.b & (1 << bit))
-            elif reg == 1:  # C
-                self.flag_z = not bool(self.c & (1 << bit))
-            elif reg == 2:  # D
-                self.flag_z = not bool(self.d & (1 << bit))
-            elif reg == 3:  # E
-                self.flag_z = not bool(self.e & (1 << bit))
-            elif reg == 4:  # H
-                self.flag_z = not bool(self.h & (1 << bit))
-            elif reg == 5:  # L
-                self.flag_z = not bool(self.l & (1 << bit))
-            elif reg == 6:  # (HL)
-                # BIT b,(HL)は12T（CBフェッチ4T + メモリアクセス4T + 実行4T）
-                hl_addr = (self.h << 8) | self.l
+    def execute_cb_instruction(self, opcode: cython.int) -> None:
+        """Execute CB-prefixed instructions (bit operations) with accurate timing
+
+        オペコードのビットフィールド分解でファミリ単位にディスパッチ:
+          bit 7-6: 命令クラス (0=rotate/shift, 1=BIT, 2=RES, 3=SET)
+          bit 5-3: ビット番号または演算種別
+          bit 2-0: 対象レジスタ (6=(HL))
+        256個の個別分岐を4つの共通ハンドラに畳み込む。
+        """
+        self._cb_dispatch[opcode >> 6](opcode)
+
+    def _cb_rotate_shift(self, opcode: cython.int) -> None:
+        """Rotate and shift operations (CB 0x00-0x3F)
+
+        operation: 0=RLC 1=RRC 2=RL 3=RR 4=SLA 5=SRA 6=SWAP 7=SRL
+        """
+        reg: cython.int = opcode & 0x07
+        operation: cython.int = (opcode >> 3) & 0x07
+
+        if reg == 6:  # (HL)
+            # Rotate/Shift (HL)をマイクロコードレベルで実行
+            hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+            # WRAMは副作用のない純リストアクセス — 領域判定チェーンを回避
+            hl_fast = 0xC000 <= hl_addr < 0xE000
+            # サイクル8-11: Read (HL)
+            if hl_fast:
+                value = self.memory.wram[hl_addr - 0xC000]
+            else:
                 value = self.memory.read_byte(hl_addr)
-                self.flag_z = not bool(value & (1 << bit))
-                self.cycles += 8  # メモリアクセス + 実行分（合計12T）
-            elif reg == 7:  # A
-                self.flag_z = not bool(self.a & (1 << bit))
-            
-            self.flag_n = False
-            self.flag_h = True
-            # cycles += 8は削除（CBフェッチ分4Tは既に外部で加算済み）
-            # BIT命令自体は追加サイクルなし（レジスタアクセスのみ）
-            # (HL)の場合のみメモリアクセス分4Tを加算（上記で処理済み）
-        
-        # SET operations (0xC0-0xFF) - set bit n in register
-        elif opcode >= 0xC0 and opcode <= 0xFF:
-            bit = (opcode - 0xC0) // 8
-            reg = opcode & 0x07
-            
-            if reg == 0:    # B
-                self.b |= (1 << bit)
-            elif reg == 1:  # C
-                self.c |= (1 << bit)
-            elif reg == 2:  # D
-                self.d |= (1 << bit)
-            elif reg == 3:  # E
-                self.e |= (1 << bit)
-            elif reg == 4:  # H
-                self.h |= (1 << bit)
-            elif reg == 5:  # L
-                self.l |= (1 << bit)
-            elif reg == 6:  # (HL)
-                # SET/RES (HL)をマイクロコードレベルで実行
-                hl_addr = (self.h << 8) | self.l
-                
-                # 正確なタイミング制御: 各フェーズでtimer/ppu/apuを更新
-                # CBフェッチ(4T) + 第2バイト(4T) = 8T 完了済み
-                
+            self.cycles += 4
+        else:
+            value = self.regs[reg]
+
+        # ALU操作: 8エントリテーブルで演算種別をディスパッチ
+        value, new_c = ROT_OPS[operation](value, self.f)
+
+        # フラグ一括更新（Z/C、N=H=0）
+        self.f = ((value == 0) << 7) | (new_c << 4)
+
+        # Write back the result
+        if reg == 6:
+            # サイクル12: Write (HL) - Modify直後に即座に実行
+            if hl_fast:
+                self.memory.wram[hl_addr - 0xC000] = value
+            else:
+                self.memory.write_byte(hl_addr, value)
+            self.cycles += 4
+        else:
+            self.regs[reg] = value
+
+    def _cb_bit(self, opcode: cython.int) -> None:
+        """BIT b, r - test bit n in register (CB 0x40-0x7F)"""
+        mask: cython.int = CB_SET_MASKS[opcode]
+        reg: cython.int = opcode & 0x07
+
+        if reg == 6:  # (HL)
+            # BIT b,(HL)は12T（CBフェッチ4T + メモリアクセス4T + 実行4T）
+            hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+            if 0xC000 <= hl_addr < 0xE000:
+                value = self.memory.wram[hl_addr - 0xC000]
+            else:
+                value = self.memory.read_byte(hl_addr)
+            self.cycles += 8  # メモリアクセス + 実行分（合計12T）
+        else:
+            value = self.regs[reg]
+
+        # Cは保持・Hセット・Zをブランチレス算出
+        self.f = (self.f & 0x10) | 0x20 | (((value & mask) == 0) << 7)
+        # CBフェッチ分4Tは既に外部で加算済み
+        # BIT命令自体は追加サイクルなし（レジスタアクセスのみ）
+
+        # BIT+JR融合: 実ROMではBITの結果Zはほぼ直後のJR NZ/Zで消費される
+        self._fuse_jr_after()
+
+    def _cb_res(self, opcode: cython.int) -> None:
+        """RES b, r - reset bit n in register (CB 0x80-0xBF)"""
+        reg: cython.int = opcode & 0x07
+        mask: cython.int = CB_RES_MASKS[opcode]
+
+        if reg == 6:  # (HL)
+            # SET/RES (HL)をマイクロコードレベルで実行
+            hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+
+            if 0xC000 <= hl_addr < 0xE000:
+                # WRAM高速パス: Read-Modify-Writeを直接添字アクセスで実行
+                self.memory.wram[hl_addr - 0xC000] &= mask
+                self.cycles += 8
+            else:
                 # サイクル8-11: Read (HL)
-                # この時点でtimer.tick()が呼ばれ、TIMAが更新される
                 value = self.memory.read_byte(hl_addr)
                 self.cycles += 4
-                
-                # run_until_cycleでtimerを同期
-                # run_until_cycle removed - now called once at end of execute_instruction
-                
+
                 # サイクル12-15: Modify（内部処理）
-                new_value = (value | (1 << bit)) & 0xFF
-                
                 # サイクル12: Write (HL) - Modify直後に即座に実行
-                self.memory.write_byte(hl_addr, new_value)
+                self.memory.write_byte(hl_addr, value & mask)
                 self.cycles += 4
-            elif reg == 7:  # A
-                self.a |= (1 << bit)
-            
-            # cycles += 8は削除（CBフェッチ分4Tは既に外部で加算済み）
-            # SET/RES命令自体は追加サイクルなし（レジスタアクセスのみ）
-            # (HL)の場合のみメモリアクセス分を加算（上記で処理済み）
-        
-        # RES operations (0x80-0xBF) - reset bit n in register
-        elif opcode >= 0x80 and opcode <= 0xBF:
-            bit = (opcode - 0x80) // 8
-            reg = opcode & 0x07
-            
-            if reg == 0:    # B
-                self.b &= ~(1 << bit)
-            elif reg == 1:  # C
-                self.c &= ~(1 << bit)
-            elif reg == 2:  # D
-                self.d &= ~(1 << bit)
-            elif reg == 3:  # E
-                self.e &= ~(1 << bit)
-            elif reg == 4:  # H
-                self.h &= ~(1 << bit)
-            elif reg == 5:  # L
-                self.l &= ~(1 << bit)
-            elif reg == 6:  # (HL)
-                # SET/RES (HL)をマイクロコードレベルで実行
-                hl_addr = (self.h << 8) | self.l
-                
-                # サイクル3相当でReadを実行
+        else:
+            self.regs[reg] &= mask
+        # SET/RES命令自体は追加サイクルなし（レジスタアクセスのみ）
+
+    def _cb_set(self, opcode: cython.int) -> None:
+        """SET b, r - set bit n in register (CB 0xC0-0xFF)"""
+        reg: cython.int = opcode & 0x07
+        mask: cython.int = CB_SET_MASKS[opcode]
+
+        if reg == 6:  # (HL)
+            # SET/RES (HL)をマイクロコードレベルで実行
+            hl_addr = (self.regs[REG_H] << 8) | self.regs[REG_L]
+
+            if 0xC000 <= hl_addr < 0xE000:
+                # WRAM高速パス: Read-Modify-Writeを直接添字アクセスで実行
+                self.memory.wram[hl_addr - 0xC000] |= mask
+                self.cycles += 8
+            else:
                 # サイクル8-11: Read (HL)
                 value = self.memory.read_byte(hl_addr)
                 self.cycles += 4
-                
-                # run_until_cycleでtimerを同期
-                # run_until_cycle removed - now called once at end of execute_instruction
-                
+
                 # サイクル12-15: Modify（内部処理）
-                new_value = (value & ~(1 << bit)) & 0xFF
-                
-                # サイクル12: Write (HL) - Modify直後に即座に実行
-                self.memory.write_byte(hl_addr, new_value)
-                self.cycles += 4
-            elif reg == 7:  # A
-                self.a &= ~(1 << bit)
-         
-        # Rotate and shift operations (0x00-0x3F)
-        elif opcode >= 0x00 and opcode <= 0x3F:
-            reg = opcode & 0x07
-            operation = opcode >> 3
-            
-            # Get the target value
-            if reg == 0:    # B
-                value = self.b
-            elif reg == 1:  # C
-                value = self.c
-            elif reg == 2:  # D
-                value = self.d
-            elif reg == 3:  # E
-                value = self.e
-            elif reg == 4:  # H
-                value = self.h
-            elif reg == 5:  # L
-                value = self.l
-            elif reg == 6:  # (HL)
-                # Rotate/Shift (HL)をマイクロコードレベルで実行
-                hl_addr = (self.h << 8) | self.l
-                
-                # サイクル8-11: Read (HL)
-                value = self.memory.read_byte(hl_addr)
-                self.cycles += 4
-                # run_until_cycle removed - now called once at end of execute_instruction
-                
-                # サイクル12-15: Modify（ALU操作）
-                if operation == 0:  # RLC
-                    carry = (value & 0x80) >> 7
-                    value = ((value << 1) | carry) & 0xFF
-                    self.flag_c = bool(carry)
-                elif operation == 1:  # RRC
-                    carry = value & 0x01
-                    value = ((value >> 1) | (carry << 7)) & 0xFF
-                    self.flag_c = bool(carry)
-                elif operation == 2:  # RL
-                    carry = 1 if self.flag_c else 0
-                    new_carry = bool(value & 0x80)
-                    value = ((value << 1) | carry) & 0xFF
-                    self.flag_c = new_carry
-                elif operation == 3:  # RR
-                    carry = 1 if self.flag_c else 0
-                    new_carry = bool(value & 0x01)
-                    value = (value >> 1) | (carry << 7)
-                    self.flag_c = new_carry
-                elif operation == 4:  # SLA
-                    self.flag_c = bool(value & 0x80)
-                    value = (value << 1) & 0xFF
-                elif operation == 5:  # SRA
-                    self.flag_c = bool(value & 0x01)
-                    value = (value >> 1) | (value & 0x80)
-                elif operation == 6:  # SWAP
-                    value = ((value & 0x0F) << 4) | ((value & 0xF0) >> 4)
-                    self.flag_c = False
-                elif operation == 7:  # SRL
-                    self.flag_c = bool(value & 0x01)
-                    value = value >> 1
-                
-                # フラグ設定（共通）
-                self.flag_z = (value == 0)
-                self.flag_n = False
-                self.flag_h = False
-                
                 # サイクル12: Write (HL) - Modify直後に即座に実行
-                # ModifyとWriteを同じサイクルで実行することで、期待値4に到達
-                self.memory.write_byte(hl_addr, value)
+                self.memory.write_byte(hl_addr, (value | mask) & 0xFF)
                 self.cycles += 4
-            elif reg == 7:  # A
-                value = self.a
-            
-            # reg == 6 (HL) は上で既に完全に処理済みなのでスキップ
-            if reg != 6:
-                # Perform the operation
-                if operation == 0:  # RLC - Rotate left circular
-                    carry = (value & 0x80) >> 7
-                    value = ((value << 1) | carry) & 0xFF
-                    self.flag_c = bool(carry)
-                elif operation == 1:  # RRC - Rotate right circular
-                    carry = value & 0x01
-                    value = ((value >> 1) | (carry << 7)) & 0xFF
-                    self.flag_c = bool(carry)
-                elif operation == 2:  # RL - Rotate left through carry
-                    carry = 1 if self.flag_c else 0
-                    new_carry = bool(value & 0x80)
-                    value = ((value << 1) | carry) & 0xFF
-                    self.flag_c = new_carry
-                elif operation == 3:  # RR - Rotate right through carry
-                    carry = 1 if self.flag_c else 0
-                    new_carry = bool(value & 0x01)
-                    value = (value >> 1) | (carry << 7)
-                    self.flag_c = new_carry
-                elif operation == 4:  # SLA - Shift left arithmetic
-                    self.flag_c = bool(value & 0x80)
-                    value = (value << 1) & 0xFF
-                elif operation == 5:  # SRA - Shift right arithmetic
-                    self.flag_c = bool(value & 0x01)
-                    value = (value >> 1) | (value & 0x80)  # Keep MSB
-                elif operation == 6:  # SWAP - Swap nibbles
-                    value = ((value & 0x0F) << 4) | ((value & 0xF0) >> 4)
-                    self.flag_c = False
-                elif operation == 7:  # SRL - Shift right logical
-                    self.flag_c = bool(value & 0x01)
-                    value = value >> 1
-                
-                # Set flags
-                self.flag_z = (value == 0)
-                self.flag_n = False
-                self.flag_h = False
-                
-                # Write back the result (reg 0-5, 7)
-                if reg == 0:    # B
-                    self.b = value
-                elif reg == 1:  # C
-                    self.c = value
-                elif reg == 2:  # D
-                    self.d = value
-                elif reg == 3:  # E
-                    self.e = value
-                elif reg == 4:  # H
-                    self.h = value
-                elif reg == 5:  # L
-                    self.l = value
-                elif reg == 7:  # A
-                    self.a = value
-            
-            # reg == 6 (HL) は上で既に処理済み
-            # (HL)は上記で既に処理済み
-            if reg != 6:
-                # Set flags
-                self.flag_z = (value == 0)
-                self.flag_n = False
-                self.flag_h = False
-                
-                # Write back the result
-                if reg == 0:    # B
-                    self.b = value
-                elif reg == 1:  # C
-                    self.c = value
-                elif reg == 2:  # D
-                    self.d = value
-                elif reg == 3:  # E
-                    self.e = value
-                elif reg == 4:  # H
-                    self.h = value
-                elif reg == 5:  # L
-                    self.l = value
-                elif reg == 7:  # A
-                    self.a = value
-        
         else:
-            if self.debug:
-                print(f"Unknown CB instruction: 0x{opcode:02X}")
-            self.cycles += 8
+            self.regs[reg] |= mask
+        # SET/RES命令自体は追加サイクルなし（レジスタアクセスのみ）
 
-    
     def step(self) -> cython.longlong:
         """Execute one CPU instruction with proper HALT handling"""
         # PyBoy style HALT handling - with EI delay support
-        if hasattr(self, 'halted') and self.halted:
+        # (属性は__init__で必ず生成され__slots__で固定 — hasattr不要)
+        if self.halted:
             # Handle EI delay even during HALT
-            if hasattr(self, 'ei_delay') and self.ei_delay > 0:
+            if self.ei_delay > 0:
                 self.ei_delay -= 1
                 if self.ei_delay == 0:
                     self.interrupt_master_enable = True
-                    if os.getenv('TIMER_DEBUG'):
+                    if TIMER_DEBUG:
                         print(f"[CPU] IME enabled during HALT due to EI delay completion")
             
             # Check for interrupts to wake up
-            ie = self.memory.read_byte(0xFFFF)
-            if_reg = self.memory.read_byte(0xFF0F)
-            pending_interrupts = ie & if_reg & 0x1F
+            ie: cython.int = self.memory.read_byte(0xFFFF)
+            if_reg: cython.int = self.memory.read_byte(0xFF0F)
+            pending_interrupts: cython.int = ie & if_reg & 0x1F
             
             # Wake up if there are pending interrupts
             if pending_interrupts > 0:
                 self.halted = False
-                if os.getenv('TIMER_DEBUG'):
-                    print(f"[CPU] CPU woke up from HALT")
-            else:
-                # Remain halted, consume cycles
-                self.cycles += 4
-                return self.cycles
-        
-        # Handle EI delay - PyBoy style: enable IME before next instruction
-        if hasattr(self, 'ei_delay') and self.ei_delay > 0:
-            self.ei_delay -= 1
-            if self.ei_delay == 0:
-                self.interrupt_master_enable = True
-                if os.getenv('TIMER_DEBUG'):
-                    print(f"[CPU] IME enabled due to EI delay completion")
-        
-        # Handle interrupts before fetching next instruction
-        if self.handle_interrupts():
-            return self.cycles  # Interrupt was serviced
-        
-        # Handle HALT bug - execute next instruction twice
-        if hasattr(self, 'halt_bug_active') and self.halt_bug_active:
-            # HALT bug: next instruction executed twice (Game Boy hardware bug)
-            opcode = self.fetch_byte()
-            self.execute_instruction(opcode)  # First execution
-            
-            # Second execution: rewind PC and execute again
-            self.pc = (self.pc - 1) & 0xFFFF
-            opcode = self.fetch_byte() 
-            self.execute_instruction(opcode)  # Second execution (bug effect)
-            
-            self.halt_bug_active = False  # Reset bug state
-            if os.getenv('TIMER_DEBUG'):
-                print(f"[CPU] HALT bug executed: instruction 0x{opcode:02X} ran twice")
-        else:
-            # Normal instruction execution - PyBoy style
-            opcode = self.fetch_byte()
-            self.execute_instruction(opcode)
-        
-        # Return current cycle count for timer synchronization
-        return self.cycles
-    
-    def run_until_cycle(self, target_cycle: cython.longlong) -> None:
-        """目標サイクルまでtimer/ppu/apuを更新（バッチ処理用）
-        
-        命令終了時に1回だけ呼び出し、timer/ppu/apuを一括更新。
-        これにより、過剰なコンポーネント更新を回避しパフォーマンスを向上。
-        
-        Args:
-            target_cycle: 目標サイクル数（self.cycles基準）
-        """
-        cycles_to_run = target_cycle - self.cycles
-        if cycles_to_run <= 0:
-            return
-        
-        # Timer更新（一括）
-        if self.memory.timer is not None:
-            timer_interrupt = self.memory.timer.tick(target_cycle)
-            if timer_interrupt:
-                # タイマー割り込みフラグを設定
-                if_reg = self.memory.read_byte(0xFF0F)
-                if not (if_reg & 0x04):
-                    self.memory.write_byte(0xFF0F, if_reg | 0x04)
-        
-        # PPU更新（一括）
-        if self.memory.ppu is not None:
-            self.memory.ppu.step(cycles_to_run)
-            # LY/STATレジスタを更新
-            self.memory.io[0x44] = self.memory.ppu.get_ly()
-            self.memory.io[0x41] = self.memory.ppu.get_stat()
-        
-        # APU更新（一括）
-        if self.memory.apu is not None:
-            self.memory.apu.step(cycles_to_run)
-        
-        self.cycles = target_cycle
-    
-    def execute_instruction(self, opcode: cython.int) -> None:
-        """Execute instruction based on opcode"""
-        # Track PC history for debugging
-        if self.debug and len(self._pc_history) < 10:
-            self._pc_history.append(self.pc - 1)
-        elif self.debug:
-            self._pc_history.pop(0)
-            self._pc_history.append(self.pc - 1)
-            
-        # Use jump table for O(1) dispatch of registered opcodes
-        if self.opcode_table[opcode] != self._op_unimplemented:
-            self.opcode_table[opcode]()
-        elif opcode == 0x00:  # NOP - PyBoy方式 (fallback)
-            self.cycles += 4
-        
-        # 16-bit loads
-        elif opcode == 0x01:  # LD BC, nn (fallback)
-            self.set_bc(self.fetch_word())
-            self.cycles += 12
-        elif opcode == 0x11:  # LD DE, nn (fallback)
-            self.set_de(self.fetch_word())
-            self.cycles += 12
-        elif opcode == 0x21:  # LD HL, nn (fallback)
-            self.set_hl(self.fetch_word())
-            self.cycles += 12
-        elif opcode == 0x31:  # LD SP, nn (fallback)
-            self.sp = self.fetch_word()
-            self.cycles += 12
-        
-        # 8-bit loads
-        elif opcode == 0x06:  # LD B, n
-            self.b = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x0E:  # LD C, n
-            self.c = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x16:  # LD D, n
-            self.d = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x1E:  # LD E, n
-            self.e = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x26:  # LD H, n
-            self.h = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x2E:  # LD L, n
-            self.l = self.fetch_byte()
-            self.cycles += 8
-        elif opcode == 0x3E:  # LD A, n
-            self.a = self.fetch_byte()
-            self.cycles += 8
-        
-        # Memory operations
-        elif opcode == 0x22:  # LD (HL+), A - Load A into address HL, then increment HL
-            hl_addr = self.get_hl()
-            self.memory.write_byte(hl_addr, self.a)
-            self.set_hl((hl_addr + 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x32:  # LD (HL-), A - Load A into address HL, then decrement HL
-            hl_addr = self.get_hl()
-            self.memory.write_byte(hl_addr, self.a)
-            self.set_hl((hl_addr - 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x2A:  # LD A, (HL+) - Load from address HL into A, then increment HL
-            hl_addr = self.get_hl()
-            self.a = self.memory.read_byte(hl_addr)
-            self.set_hl((hl_addr + 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x3A:  # LD A, (HL-) - Load from address HL into A, then decrement HL
-            hl_addr = self.get_hl()
-            self.a = self.memory.read_byte(hl_addr)
-            self.set_hl((hl_addr - 1) & 0xFFFF)
-            self.cycles += 8
-        
-        # High memory operations (0xFF00 + n)
-        elif opcode == 0xE0:  # LD (0xFF00+n), A
-            # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
-            self.cycles += 4  # フェッチ分
-            n = self.fetch_byte()
-            addr = 0xFF00 + n
-            self.memory.write_byte(addr, self.a)
-            self.cycles += 8  # メモリアクセス分
-        elif opcode == 0xE2:  # LD (0xFF00+C), A
-            address = 0xFF00 + self.c
-            self.memory.write_byte(address, self.a)
-            self.cycles += 8
-        elif opcode == 0xF0:  # LD A, (0xFF00+n)
-            # PyBoy方式: memory.read_byte()内でtimer.tick()が呼ばれる
-            # timer.tick()の二重呼び出しを避けるため、命令内では呼ばない
-            
-            # cycles加算のみ（timer更新はmemory層に任せる）
-            self.cycles += 4  # フェッチ分
-            n = self.fetch_byte()
-            
-            # メモリアクセス（この時点でmemory.read_byte()内でtimer.tick()呼ばれる）
-            addr = 0xFF00 + n
-            self.a = self.memory.read_byte(addr)
-            
-            self.cycles += 8  # メモリアクセス分
-        elif opcode == 0xF8:  # LD HL, SP+n
-            offset = self.fetch_byte()
-            if offset > 127:
-                offset = offset - 256
-            result = (self.sp + offset) & 0xFFFF
-            self.flag_z = False
-            self.flag_n = False
-            self.flag_h = ((self.sp & 0x0F) + (offset & 0x0F)) > 0x0F
-            self.flag_c = ((self.sp & 0xFF) + (offset & 0xFF)) > 0xFF
-            self.set_hl(result)
-            self.cycles += 12        
-        # Absolute memory operations
-        elif opcode == 0xEA:  # LD (nn), A
-            # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
-            self.cycles += 8  # フェッチ分（2バイト）
-            address = self.fetch_word()
-            self.memory.write_byte(address, self.a)
-            self.cycles += 8  # メモリアクセス分
-        elif opcode == 0xFA:  # LD A, (nn)
-            # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
-            self.cycles += 8  # フェッチ分（2バイト）
-            address = self.fetch_word()
-            self.a = self.memory.read_byte(address)
-            self.cycles += 8  # メモリアクセス分
-        
-        # Register to register loads
-        elif opcode == 0x40:  # LD B, B
-            self.cycles += 4
-        elif opcode == 0x41:  # LD B, C
-            self.b = self.c
-            self.cycles += 4
-        elif opcode == 0x47:  # LD B, A
-            self.b = self.a
-            self.cycles += 4
-        elif opcode == 0x4F:  # LD C, A
-            self.c = self.a
-            self.cycles += 4
-        elif opcode == 0x57:  # LD D, A
-            self.d = self.a
-            self.cycles += 4
-        elif opcode == 0x5F:  # LD E, A
-            self.e = self.a
-            self.cycles += 4
-        elif opcode == 0x67:  # LD H, A
-            self.h = self.a
-            self.cycles += 4
-        elif opcode == 0x6F:  # LD L, A
-            self.l = self.a
-            self.cycles += 4
-        elif opcode == 0x7F:  # LD A, A
-            self.cycles += 4
-        
-        # Load from memory to register
-        elif opcode == 0x46:  # LD B, (HL) - PyBoy方式
-            self.b = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x4E:  # LD C, (HL) - PyBoy方式
-            self.c = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x56:  # LD D, (HL) - PyBoy方式
-            self.d = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x5E:  # LD E, (HL) - PyBoy方式
-            self.e = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x66:  # LD H, (HL) - PyBoy方式
-            self.h = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x6E:  # LD L, (HL) - PyBoy方式
-            self.l = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        elif opcode == 0x7E:  # LD A, (HL) - PyBoy方式
-            self.a = self.memory.read_byte(self.get_hl())
-            self.cycles += 8
-        
-        # Load from register to memory
-        elif opcode == 0x70:  # LD (HL), B - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.b)
-            self.cycles += 8
-        elif opcode == 0x71:  # LD (HL), C - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.c)
-            self.cycles += 8
-        elif opcode == 0x72:  # LD (HL), D - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.d)
-            self.cycles += 8
-        elif opcode == 0x73:  # LD (HL), E - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.e)
-            self.cycles += 8
-        elif opcode == 0x74:  # LD (HL), H - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.h)
-            self.cycles += 8
-        elif opcode == 0x75:  # LD (HL), L - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.l)
-            self.cycles += 8
-        elif opcode == 0x77:  # LD (HL), A - PyBoy方式
-            self.memory.write_byte(self.get_hl(), self.a)
-            self.cycles += 8
-        
-        # Jump and branch instructions
-        elif opcode == 0x18:  # JR n - Relative jump
-            offset = self.fetch_byte()
-            if offset > 127:  # Convert to signed
-                offset = offset - 256
-            self.pc = (self.pc + offset) & 0xFFFF  # PC already advanced by fetch_byte
-            self.cycles += 12
-        elif opcode == 0x20:  # JR NZ, n - Jump if not zero
-            offset = self.fetch_byte()
-            if not self.flag_z:
-                if offset > 127:
-                    offset = offset - 256
-                self.pc = (self.pc + offset) & 0xFFFF  # PC already advanced by fetch_byte
-                self.cycles += 12
-            else:
-                self.cycles += 8
-        elif opcode == 0x28:  # JR Z, n - Jump if zero
-            offset = self.fetch_byte()
-            if self.flag_z:
-                if offset > 127:
-                    offset = offset - 256
-                self.pc = (self.pc + offset) & 0xFFFF
-                self.cycles += 12
-            else:
-                self.cycles += 8
-        elif opcode == 0x30:  # JR NC, n - Jump if not carry
-            offset = self.fetch_byte()
-            if not self.flag_c:
-                if offset > 127:
-                    offset = offset - 256
-                self.pc = (self.pc + offset) & 0xFFFF
-                self.cycles += 12
-            else:
-                self.cycles += 8
-        elif opcode == 0x38:  # JR C, n - Jump if carry
-            offset = self.fetch_byte()
-            if self.flag_c:
-                if offset > 127:
-                    offset = offset - 256
-                self.pc = (self.pc + offset) & 0xFFFF
-                self.cycles += 12
-            else:
-                self.cycles += 8
-        elif opcode == 0xC3:  # JP nn - 完全マイクロコード化
-            # フェーズ1: オペランドローワイトフェッチ (4T)
-            low = self.fetch_byte()
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            
-            # フェーズ2: オペランドハイバイトフェッチ (4T)
-            high = self.fetch_byte()
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            
-            # フェーズ3: PC更新 (4T)
-            target = (high << 8) | low
-            self.pc = target
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xC2:  # JP NZ, nn - Jump if not zero
-            address = self.fetch_word()
-            if not self.flag_z:
-                self.pc = address
-                self.cycles += 16
-            else:
-                self.cycles += 12
-        elif opcode == 0xCA:  # JP Z, nn - Jump if zero
-            address = self.fetch_word()
-            if self.flag_z:
-                self.pc = address
-                self.cycles += 16
-            else:
-                self.cycles += 12
-        elif opcode == 0xD2:  # JP NC, nn - Jump if not carry
-            address = self.fetch_word()
-            if not self.flag_c:
-                self.pc = address
-                self.cycles += 16
-            else:
-                self.cycles += 12
-        elif opcode == 0xDA:  # JP C, nn - Jump if carry
-            address = self.fetch_word()
-            if self.flag_c:
-                self.pc = address
-                self.cycles += 16
-            else:
-                self.cycles += 12
-        elif opcode == 0xE9:  # JP (HL) - Jump to address in HL
-            self.pc = self.get_hl()
-            self.cycles += 4
-        
-        # Call and return instructions
-        elif opcode == 0xCD:  # CALL nn - PyBoy方式: サイクル一括加算
-            low = self.fetch_byte()
-            high = self.fetch_byte()
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, (self.pc >> 8) & 0xFF)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.pc & 0xFF)
-            self.pc = (high << 8) | low
-            self.cycles += 24
-        elif opcode == 0xC4:  # CALL NZ, nn
-            address = self.fetch_word()
-            if not self.flag_z:
-                self.push_word(self.pc)
-                self.pc = address
-                self.cycles += 24
-            else:
-                self.cycles += 12
-        elif opcode == 0xCC:  # CALL Z, nn
-            address = self.fetch_word()
-            if self.flag_z:
-                self.push_word(self.pc)
-                self.pc = address
-                self.cycles += 24
-            else:
-                self.cycles += 12
-        elif opcode == 0xD4:  # CALL NC, nn
-            address = self.fetch_word()
-            if not self.flag_c:
-                self.push_word(self.pc)
-                self.pc = address
-                self.cycles += 24
-            else:
-                self.cycles += 12
-        elif opcode == 0xDC:  # CALL C, nn
-            address = self.fetch_word()
-            if self.flag_c:
-                self.push_word(self.pc)
-                self.pc = address
-                self.cycles += 24
-            else:
-                self.cycles += 12
-        elif opcode == 0xC9:  # RET - PyBoy方式: サイクル一括加算
-            low = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            high = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.pc = (high << 8) | low
-            self.cycles += 16
-        elif opcode == 0xC0:  # RET NZ
-            if not self.flag_z:
-                self.pc = self.pop_word()
-                self.cycles += 20
-            else:
-                self.cycles += 8
-        elif opcode == 0xC8:  # RET Z
-            if self.flag_z:
-                self.pc = self.pop_word()
-                self.cycles += 20
-            else:
-                self.cycles += 8
-        elif opcode == 0xD0:  # RET NC
-            if not self.flag_c:
-                self.pc = self.pop_word()
-                self.cycles += 20
-            else:
-                self.cycles += 8
-        elif opcode == 0xD8:  # RET C
-            if self.flag_c:
-                self.pc = self.pop_word()
-                self.cycles += 20
-            else:
-                self.cycles += 8
-        
-        # Arithmetic operations - レジスタINC/DECをマイクロコード化
-        elif opcode == 0x04:  # INC B - マイクロコード化
-            self.b = self.inc_8bit(self.b)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x05:  # DEC B - マイクロコード化
-            self.b = self.dec_8bit(self.b)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x0C:  # INC C - マイクロコード化
-            self.c = self.inc_8bit(self.c)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x0D:  # DEC C - マイクロコード化
-            self.c = self.dec_8bit(self.c)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x14:  # INC D - マイクロコード化
-            self.d = self.inc_8bit(self.d)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x15:  # DEC D - マイクロコード化
-            self.d = self.dec_8bit(self.d)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x1C:  # INC E - マイクロコード化
-            self.e = self.inc_8bit(self.e)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x1D:  # DEC E - マイクロコード化
-            self.e = self.dec_8bit(self.e)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x24:  # INC H - マイクロコード化
-            self.h = self.inc_8bit(self.h)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x25:  # DEC H - マイクロコード化
-            self.h = self.dec_8bit(self.h)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x2C:  # INC L - マイクロコード化
-            self.l = self.inc_8bit(self.l)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x2D:  # DEC L - マイクロコード化
-            self.l = self.dec_8bit(self.l)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x34:  # INC (HL) - PyBoy方式: Read → cycles += 4 → Write → cycles += 8
-            hl_addr = self.get_hl()
-            # Read
-            value = self.memory.read_byte(hl_addr)
-            result = self.inc_8bit(value)
-            # PyBoy方式: Write前にサイクル加算
-            self.cycles += 4
-            # Write
-            self.memory.write_byte(hl_addr, result)
-            self.cycles += 8
-        elif opcode == 0x35:  # DEC (HL) - PyBoy方式: Read → cycles += 4 → Write → cycles += 8
-            hl_addr = self.get_hl()
-            # Read
-            value = self.memory.read_byte(hl_addr)
-            result = self.dec_8bit(value)
-            # PyBoy方式: Write前にサイクル加算
-            self.cycles += 4
-            # Write
-            self.memory.write_byte(hl_addr, result)
-            self.cycles += 8
-        elif opcode == 0x3C:  # INC A - マイクロコード化
-            self.a = self.inc_8bit(self.a)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0x3D:  # DEC A - マイクロコード化
-            self.a = self.dec_8bit(self.a)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        
-        # 16-bit arithmetic
-        elif opcode == 0x03:  # INC BC
-            self.set_bc((self.get_bc() + 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x0B:  # DEC BC
-            self.set_bc((self.get_bc() - 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x13:  # INC DE
-            self.set_de((self.get_de() + 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x1B:  # DEC DE
-            self.set_de((self.get_de() - 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x23:  # INC HL
-            self.set_hl((self.get_hl() + 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x2B:  # DEC HL
-            self.set_hl((self.get_hl() - 1) & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x33:  # INC SP
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 8
-        elif opcode == 0x3B:  # DEC SP
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.cycles += 8
-        
-        # Compare operations
-        elif opcode == 0xFE:  # CP n - Compare A with immediate value
-            value = self.fetch_byte()
-            self.compare(value)
-            self.cycles += 8
-        elif opcode == 0xBE:  # CP (HL) - Compare A with value at HL
-            value = self.memory.read_byte(self.get_hl())
-            self.compare(value)
-            self.cycles += 8
-        elif opcode == 0xB8:  # CP B - Compare A with B
-            self.compare(self.b)
-            self.cycles += 4
-        elif opcode == 0xB9:  # CP C - Compare A with C
-            self.compare(self.c)
-            self.cycles += 4
-        elif opcode == 0xBA:  # CP D - Compare A with D
-            self.compare(self.d)
-            self.cycles += 4
-        elif opcode == 0xBB:  # CP E - Compare A with E
-            self.compare(self.e)
-            self.cycles += 4
-        elif opcode == 0xBC:  # CP H - Compare A with H
-            self.compare(self.h)
-            self.cycles += 4
-        elif opcode == 0xBD:  # CP L - Compare A with L
-            self.compare(self.l)
-            self.cycles += 4
-        elif opcode == 0xBF:  # CP A - Compare A with A
-            self.compare(self.a)
-            self.cycles += 4
+                if TIMER_DEBUG:
+                    print(f"[CPU] CPU woke up from HALT")
+            else:
+                # Remain halted, consume cycles
+                self.cycles += 4
+                return self.cycles
         
-        # Logic operations
-        elif opcode == 0xA7:  # AND A - AND A with A (used to set flags)
-            self.a = self.a & self.a
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = True
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0xAF:  # XOR A - XOR A with A (clears A)
-            self.a = 0
-            self.flag_z = True
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0xB7:  # OR A - OR A with A (sets flags)
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 4
+        # Handle EI delay - PyBoy style: enable IME before next instruction
+        if self.ei_delay > 0:
+            self.ei_delay -= 1
+            if self.ei_delay == 0:
+                self.interrupt_master_enable = True
+                if TIMER_DEBUG:
+                    print(f"[CPU] IME enabled due to EI delay completion")
         
-        # Bit operations (CB prefix)
-        elif opcode == 0xCB:  # CB-prefixed opcodes
-            # PyBoy方式: CBフェッチ分を先に加算
-            self.cycles += 4  # CB opcode fetch
-            cb_opcode = self.fetch_byte()
-            self.execute_cb_instruction(cb_opcode)
-        elif opcode == 0x17:  # RLA - Rotate A left through carry
-            carry = 1 if self.flag_c else 0
-            self.flag_c = bool(self.a & 0x80)
-            self.a = ((self.a << 1) | carry) & 0xFF
-            self.flag_z = False
-            self.flag_n = False
-            self.flag_h = False
-            self.cycles += 4
-        elif opcode == 0x1F:  # RRA - Rotate A right through carry
-            carry = 1 if self.flag_c else 0
-            self.flag_c = bool(self.a & 0x01)
-            self.a = (self.a >> 1) | (carry << 7)
-            self.flag_z = False
-            self.flag_n = False
-            self.flag_h = False
-            self.cycles += 4
+        # Handle interrupts before fetching next instruction
+        if self.handle_interrupts():
+            return self.cycles  # Interrupt was serviced
         
-        # Stack operations
-        elif opcode == 0xF5:  # PUSH AF - マイクロコード化
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.a)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            f_reg = (self.flag_z << 7) | (self.flag_n << 6) | (self.flag_h << 5) | (self.flag_c << 4)
-            self.memory.write_byte(self.sp, f_reg)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xF1:  # POP AF - マイクロコード化
-            f_reg = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.flag_z = (f_reg >> 7) & 1
-            self.flag_n = (f_reg >> 6) & 1
-            self.flag_h = (f_reg >> 5) & 1
-            self.flag_c = (f_reg >> 4) & 1
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.a = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xC5:  # PUSH BC - マイクロコード化
-            # フェーズ1: 内部処理 (4T)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            
-            # フェーズ2: ハイバイト書き込み (4T)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.b)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
+        # Handle HALT bug - execute next instruction twice
+        if self.halt_bug_active:
+            # HALT bug: next instruction executed twice (Game Boy hardware bug)
+            opcode = self.fetch_byte()
+            self.execute_instruction(opcode)  # First execution
             
-            # フェーズ3: ローワイト書き込み (4T)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.c)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xC1:  # POP BC - マイクロコード化
-            # フェーズ1: ローワイト読み取り (4T)
-            low = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.c = low
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
+            # Second execution: rewind PC and execute again
+            self.pc = (self.pc - 1) & 0xFFFF
+            opcode = self.fetch_byte() 
+            self.execute_instruction(opcode)  # Second execution (bug effect)
             
-            # フェーズ2: ハイバイト読み取り (4T)
-            high = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.b = high
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xD5:  # PUSH DE - マイクロコード化
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.d)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.e)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xD1:  # POP DE - マイクロコード化
-            self.e = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.d = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xE5:  # PUSH HL - マイクロコード化
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.h)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.sp = (self.sp - 1) & 0xFFFF
-            self.memory.write_byte(self.sp, self.l)
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-        elif opcode == 0xE1:  # POP HL - マイクロコード化
-            self.l = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
-            self.h = self.memory.read_byte(self.sp)
-            self.sp = (self.sp + 1) & 0xFFFF
-            self.cycles += 4
-            self.run_until_cycle(self.cycles)
+            self.halt_bug_active = False  # Reset bug state
+            if TIMER_DEBUG:
+                print(f"[CPU] HALT bug executed: instruction 0x{opcode:02X} ran twice")
+        else:
+            # Normal instruction execution - PyBoy style
+            opcode: cython.int = self.fetch_byte()
+            self.execute_instruction(opcode)
         
-        # Additional register operations
-        elif opcode == 0x1A:  # LD A, (DE)
-            self.a = self.memory.read_byte(self.get_de())
-            self.cycles += 8
-        elif opcode == 0x0A:  # LD A, (BC)
-            self.a = self.memory.read_byte(self.get_bc())
-            self.cycles += 8
-        elif opcode == 0x12:  # LD (DE), A
-            self.memory.write_byte(self.get_de(), self.a)
-            self.cycles += 8
-        elif opcode == 0x02:  # LD (BC), A
-            self.memory.write_byte(self.get_bc(), self.a)
-            self.cycles += 8
+        # Return current cycle count for timer synchronization
+        return self.cycles
+    
+    def run_slice(self, budget: cython.longlong) -> cython.longlong:
+        """予定サイクル(budget)までCPU側のタイトループで命令を連続実行
+
+        エミュレータ側のバッチループは1命令ごとにcpu.step()呼び出しと
+        サイクル差分計算を往復していた。ループをCPU内に移すことで
+        命令あたりのPythonレベルの属性ロード・呼び出しオーバーヘッドを
+        1回のメソッド呼び出しに畳み込む。
+
+        さらに通常経路（非HALT・EI遅延なし・HALTバグなし・非デバッグ）では
+        step()/execute_instruction()のメソッドフレームを経由せず、
+        フェッチ→テーブルディスパッチをこのループ内で直接実行する。
+        Cythonでコンパイルした場合もスライス全体が1つのCレベルループに
+        落ち、命令ごとのPython呼び出し規約（引数パック/アンパック）を
+        支払わない。特殊状態の処理はstep()内の既存コードに委ねるため
+        観測可能な振る舞いは変わらない。
+
+        Args:
+            budget: 実行を打ち切る累積サイクル数（次の割り込み予定時刻）
+
+        Returns:
+            このスライスで消費したサイクル数
+        """
+        start: cython.longlong = self.cycles
+        # ループ外で束縛（LOAD_ATTR→LOAD_FAST）
+        step = self.step
+        fetch_byte = self.fetch_byte
+        handle_interrupts = self.handle_interrupts
+        opcode_table = self.opcode_table
+        while self.cycles < budget:
+            if self.halted or self.ei_delay > 0 or self.halt_bug_active or self.debug:
+                # 特殊状態はstep()の既存処理に委ねる（低頻度パス）
+                step()
+                if self.halted:
+                    break
+                continue
+            # 通常経路: 割り込みチェック→フェッチ→O(1)ディスパッチ
+            # （execute_instruction()末尾のrun_until_cycle(self.cycles)は
+            #  差分0の早期returnなのでここでは省略できる）
+            if handle_interrupts():
+                continue
+            opcode_table[fetch_byte()]()
+            if self.halted:
+                break
+        return self.cycles - start
+
+    def run_watch(self, budget: cython.longlong, pc_watch=None,
+                  opcode_watch: cython.int = -1) -> cython.int:
+        """監視イベント付きのタイトループ実行（解析・テストドライバ用）
+
+        run_slice()と同じくbudgetサイクルまで命令を連続実行するが、
+        各命令の実行前にPC・次オペコードを監視できる。ドライバスクリプト
+        （boot_rom_analysis等）がPythonのwhileループで1命令ごとに
+        gameboy.step()とメモリ読み出しを往復する代わりに、チェックを
+        このループ（setup.pyのCythonコンパイル対象）に畳み込む。
+
+        Args:
+            budget: 実行を打ち切る累積サイクル数
+            pc_watch: 到達で停止するPCの集合（in演算子で判定）。Noneで無効
+            opcode_watch: 検出で停止するオペコード。負値で無効。
+                同一オペコードの連続は1イベントと数える（エッジ検出）。
+                0x40 (LD B,B) は専用ハンドラのフラグで検出するため
+                毎命令のメモリ先読みを払わない
+
+        Returns:
+            WATCH_BUDGET / WATCH_PC / WATCH_OPCODE のいずれか
+        """
+        step = self.step
+        if opcode_watch == 0x40:
+            # Mooneye完了マーカーはフェッチ・ディスパッチ側
+            # （_op_ld_b_b）がフラグを立てる。ループ側は実行後の
+            # 属性チェック1回で済み、read_byte(pc)の先読みが消える
+            self.mooneye_complete = False
+            while self.cycles < budget:
+                if pc_watch is not None and self.pc in pc_watch:
+                    return WATCH_PC
+                step()
+                if self.mooneye_complete:
+                    return WATCH_OPCODE
+            return WATCH_BUDGET
+        read_byte = self.memory.read_byte
+        last_op: cython.int = -1
+        while self.cycles < budget:
+            pc: cython.int = self.pc
+            if pc_watch is not None and pc in pc_watch:
+                return WATCH_PC
+            if opcode_watch >= 0:
+                op: cython.int = read_byte(pc)
+                if op == opcode_watch and last_op != opcode_watch:
+                    return WATCH_OPCODE
+                last_op = op
+            step()
+        return WATCH_BUDGET
+
+    def run_until_cycle(self, target_cycle: cython.longlong) -> None:
+        """目標サイクルまでtimer/ppu/apuを更新（バッチ処理用）
         
-        # Register to register loads (more complete set)
-        elif opcode == 0x78:  # LD A, B
-            self.a = self.b
-            self.cycles += 4
-        elif opcode == 0x79:  # LD A, C
-            self.a = self.c
-            self.cycles += 4
-        elif opcode == 0x7A:  # LD A, D
-            self.a = self.d
-            self.cycles += 4
-        elif opcode == 0x7B:  # LD A, E
-            self.a = self.e
-            self.cycles += 4
-        elif opcode == 0x7C:  # LD A, H
-            self.a = self.h
-            self.cycles += 4
-        elif opcode == 0x7D:  # LD A, L
-            self.a = self.l
-            self.cycles += 4
+        命令終了時に1回だけ呼び出し、timer/ppu/apuを一括更新。
+        これにより、過剰なコンポーネント更新を回避しパフォーマンスを向上。
         
-        # More complete register to register loads
-        elif opcode == 0x42:  # LD B, D
-            self.b = self.d
-            self.cycles += 4
-        elif opcode == 0x43:  # LD B, E
-            self.b = self.e
-            self.cycles += 4
-        elif opcode == 0x44:  # LD B, H
-            self.b = self.h
-            self.cycles += 4
-        elif opcode == 0x45:  # LD B, L
-            self.b = self.l
-            self.cycles += 4
-        elif opcode == 0x48:  # LD C, B
-            self.c = self.b
-            self.cycles += 4
-        elif opcode == 0x49:  # LD C, C
-            self.cycles += 4
-        elif opcode == 0x4A:  # LD C, D
-            self.c = self.d
-            self.cycles += 4
-        elif opcode == 0x4B:  # LD C, E
-            self.c = self.e
-            self.cycles += 4
-        elif opcode == 0x4C:  # LD C, H
-            self.c = self.h
-            self.cycles += 4
-        elif opcode == 0x4D:  # LD C, L
-            self.c = self.l
-            self.cycles += 4
-        elif opcode == 0x50:  # LD D, B
-            self.d = self.b
-            self.cycles += 4
-        elif opcode == 0x51:  # LD D, C
-            self.d = self.c
-            self.cycles += 4
-        elif opcode == 0x52:  # LD D, D
-            self.cycles += 4
-        elif opcode == 0x53:  # LD D, E
-            self.d = self.e
-            self.cycles += 4
-        elif opcode == 0x54:  # LD D, H
-            self.d = self.h
-            self.cycles += 4
-        elif opcode == 0x55:  # LD D, L
-            self.d = self.l
-            self.cycles += 4
-        elif opcode == 0x58:  # LD E, B
-            self.e = self.b
-            self.cycles += 4
-        elif opcode == 0x59:  # LD E, C
-            self.e = self.c
-            self.cycles += 4
-        elif opcode == 0x5A:  # LD E, D
-            self.e = self.d
-            self.cycles += 4
-        elif opcode == 0x5B:  # LD E, E
-            self.cycles += 4
-        elif opcode == 0x5C:  # LD E, H
-            self.e = self.h
-            self.cycles += 4
-        elif opcode == 0x5D:  # LD E, L
-            self.e = self.l
-            self.cycles += 4
-        elif opcode == 0x60:  # LD H, B
-            self.h = self.b
-            self.cycles += 4
-        elif opcode == 0x61:  # LD H, C
-            self.h = self.c
-            self.cycles += 4
-        elif opcode == 0x62:  # LD H, D
-            self.h = self.d
-            self.cycles += 4
-        elif opcode == 0x63:  # LD H, E
-            self.h = self.e
-            self.cycles += 4
-        elif opcode == 0x64:  # LD H, H
-            self.cycles += 4
-        elif opcode == 0x65:  # LD H, L
-            self.h = self.l
-            self.cycles += 4
-        elif opcode == 0x68:  # LD L, B
-            self.l = self.b
-            self.cycles += 4
-        elif opcode == 0x69:  # LD L, C
-            self.l = self.c
-            self.cycles += 4
-        elif opcode == 0x6A:  # LD L, D
-            self.l = self.d
-            self.cycles += 4
-        elif opcode == 0x6B:  # LD L, E
-            self.l = self.e
-            self.cycles += 4
-        elif opcode == 0x6C:  # LD L, H
-            self.l = self.h
-            self.cycles += 4
-        elif opcode == 0x6D:  # LD L, L
-            self.cycles += 4
+        Args:
+            target_cycle: 目標サイクル数（self.cycles基準）
+        """
+        cycles_to_run = target_cycle - self.cycles
+        if cycles_to_run <= 0:
+            return
         
-        # Interrupts
-        elif opcode == 0xF3:  # DI - Disable interrupts
-            self.interrupt_master_enable = False
-            self.cycles += 4
-        elif opcode == 0xFB:  # EI - Enable interrupts (PyBoy precise style)
-            # PyBoy accurate: 1-cycle delay before IME enable (Game Boy hardware behavior)
-            self.ei_delay = 2  # Enable IME after the instruction FOLLOWING EI
-            if os.getenv('TIMER_DEBUG'):
-                print(f"[CPU] EI instruction executed - IME will be enabled after next instruction")
-            self.cycles += 4
+        # Timer更新（一括）
+        if self.memory.timer is not None:
+            timer_interrupt = self.memory.timer.tick(target_cycle)
+            if timer_interrupt:
+                # タイマー割り込みフラグを設定
+                if_reg = self.memory.read_byte(0xFF0F)
+                if not (if_reg & 0x04):
+                    self.memory.write_byte(0xFF0F, if_reg | 0x04)
         
-        elif opcode == 0x76:  # HALT - PyBoy style with HALT bug
-            if os.getenv('TIMER_DEBUG'):
-                print(f"[CPU] HALT instruction executed")
-            
-            # Check for pending interrupts to determine HALT behavior
-            ie = self.memory.read_byte(0xFFFF)  # IE register
-            if_reg = self.memory.read_byte(0xFF0F)  # IF register
-            pending = ie & if_reg & 0x1F
-            
-            if self.interrupt_master_enable:
-                # Normal HALT: enable interrupts, CPU sleeps
-                self.halted = True
-                if os.getenv('TIMER_DEBUG'):
-                    print(f"[CPU] Normal HALT: IME=True, sleeping")
-            elif pending:
-                # HALT bug: IME=False but interrupts pending
-                # Next instruction will be executed twice (Game Boy hardware bug)
-                self.halt_bug_active = True
-                if os.getenv('TIMER_DEBUG'):
-                    print(f"[CPU] HALT bug activated: IME=False, pending interrupts=0x{pending:02X}")
-            else:
-                # Simple HALT: no interrupts pending, just sleep
-                self.halted = True
-                if os.getenv('TIMER_DEBUG'):
-                    print(f"[CPU] Simple HALT: no pending interrupts")
-            
-            self.cycles += 4
-            
-        # Additional critical opcodes for big2small.gb
-        elif opcode == 0x2F:  # CPL - Complement A register
-            self.a = (~self.a) & 0xFF
-            self.flag_n = True
-            self.flag_h = True
-            self.cycles += 4
-        elif opcode == 0x37:  # SCF - Set Carry Flag
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = True
-            self.cycles += 4
-        elif opcode == 0x3F:  # CCF - Complement Carry Flag
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = not self.flag_c
-            self.cycles += 4
-        elif opcode == 0x0F:  # RRCA - Rotate A right circular
-            carry = self.a & 0x01
-            self.a = ((self.a >> 1) | (carry << 7)) & 0xFF
-            self.flag_z = False
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = bool(carry)
-            self.cycles += 4
-        elif opcode == 0xE6:  # AND n - AND A with immediate byte
-            value = self.fetch_byte()
-            self.a = self.a & value
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = True
-            self.flag_c = False
-            self.cycles += 8
-        elif opcode == 0xF2:  # LD A, (0xFF00+C) - Load A from high memory (C)
-            address = 0xFF00 + self.c
-            self.a = self.memory.read_byte(address)
-            self.cycles += 8
-        elif opcode == 0xD9:  # RETI - Return and enable interrupts
-            self.pc = self.pop_word()
-            self.interrupt_master_enable = True  # Enable interrupts
-            self.cycles += 16
-        elif opcode == 0x86:  # ADD A, (HL) - Add memory at HL to A
-            hl_addr = (self.h << 8) | self.l
-            value = self.memory.read_byte(hl_addr)
-            result = self.a + value
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (value & 0x0F)) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 8
-        elif opcode == 0x87:  # ADD A, A - Add A to A
-            result = self.a + self.a
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (self.a & 0x0F)) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 4
-        elif opcode == 0xC6:  # ADD A, n - Add immediate to A
-            value = self.fetch_byte()
-            result = self.a + value
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (value & 0x0F)) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 8
-        elif opcode == 0x09:  # ADD HL, BC - Add BC to HL
-            hl = (self.h << 8) | self.l
-            bc = (self.b << 8) | self.c
-            result = hl + bc
-            self.flag_c = result > 0xFFFF
-            self.flag_h = ((hl & 0x0FFF) + (bc & 0x0FFF)) > 0x0FFF
-            self.flag_n = False
-            self.h = (result >> 8) & 0xFF
-            self.l = result & 0xFF
-            self.cycles += 8
-        elif opcode == 0x19:  # ADD HL, DE - Add DE to HL
-            hl = (self.h << 8) | self.l
-            de = (self.d << 8) | self.e
-            result = hl + de
-            self.flag_c = result > 0xFFFF
-            self.flag_h = ((hl & 0x0FFF) + (de & 0x0FFF)) > 0x0FFF
-            self.flag_n = False
-            self.h = (result >> 8) & 0xFF
-            self.l = result & 0xFF
-            self.cycles += 8
-        elif opcode == 0x36:  # LD (HL), n - Load immediate into address HL
-            # PyBoy方式: cycles加算のみ（timer更新はmemory層に任せる）
-            self.cycles += 4  # フェッチ分
-            value = self.fetch_byte()
-            address = (self.h << 8) | self.l
-            self.memory.write_byte(address, value)
-            self.cycles += 8  # メモリアクセス分
-        elif opcode == 0xD6:  # SUB n - Subtract immediate from A
-            value = self.fetch_byte()
-            # Speed optimization for test loops (disabled debug output)
-            # if ((self.pc - 2 == 0x0213 or self.pc - 2 == 0xC003) and 
-            #     value == 5 and self.a > 5):
-            #     self.a = 1  # Force loop to exit quickly on next iteration
-            self.flag_c = self.a < value
-            self.flag_h = (self.a & 0x0F) < (value & 0x0F)
-            self.a = (self.a - value) & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = True
-            self.cycles += 8
-        elif opcode == 0xD7:  # RST 10H - Restart to 0x0010
-            self.push_word(self.pc)
-            self.pc = 0x0010
-            self.cycles += 16
-        elif opcode == 0xB0:  # OR B - OR A with B
-            self.a = self.a | self.b
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0xB2:  # OR D - OR A with D
-            self.a = self.a | self.d
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0xA1:  # AND C - AND A with C
-            self.a = self.a & self.c
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = True
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0x07:  # RLCA - Rotate A left circular
-            carry = (self.a >> 7) & 0x01
-            self.a = ((self.a << 1) | carry) & 0xFF
-            self.flag_z = False
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = bool(carry)
-            self.cycles += 4
-        elif opcode == 0x80:  # ADD A, B - Add B to A
-            result = self.a + self.b
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (self.b & 0x0F)) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 4
-        elif opcode == 0x81:  # ADD A, C - Add C to A
-            result = self.a + self.c
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (self.c & 0x0F)) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 4
-        elif opcode == 0xF6:  # OR n - OR A with immediate
-            value = self.fetch_byte()
-            self.a = self.a | value
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 8
-        elif opcode == 0xCE:  # ADC A, n
-            value = self.fetch_byte()
-            carry = 1 if self.flag_c else 0
-            result = self.a + value + carry
-            self.flag_c = result > 0xFF
-            self.flag_h = ((self.a & 0x0F) + (value & 0x0F) + carry) > 0x0F
-            self.a = result & 0xFF
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.cycles += 8
-        elif opcode == 0xAE:  # XOR (HL)
-            value = self.memory.read_byte(self.get_hl())
-            self.a ^= value
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 8
-        elif opcode == 0xEE:  # XOR n
-            value = self.fetch_byte()
-            self.a ^= value
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 8
-        elif opcode == 0xED:  # Placeholder for unknown opcode
-            raise NotImplementedError(f"Unimplemented opcode: 0x{opcode:02X} at PC: 0x{self.pc:04X}")
-        elif opcode == 0x83:  # ADD A, E
-            result = self.a + self.e
-            self.flag_z = ((result & 0xFF) == 0)
-            self.flag_n = False
-            self.flag_h = ((self.a & 0x0F) + (self.e & 0x0F)) > 0x0F
-            self.flag_c = (result > 0xFF)
-            self.a = result & 0xFF
-            self.cycles += 4
-        elif opcode == 0xB6:  # OR (HL)
-            value = self.memory.read_byte(self.get_hl())
-            self.a |= value
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 8
-        elif opcode == 0xB1:  # OR C
-            self.a |= self.c
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-            self.cycles += 4
-        elif opcode == 0x29:  # ADD HL, HL
-            hl = self.get_hl()
-            result = hl + hl
-            self.flag_n = False
-            self.flag_h = ((hl & 0x0FFF) + (hl & 0x0FFF)) > 0x0FFF
-            self.flag_c = (result > 0xFFFF)
-            self.set_hl(result & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0x91:  # SUB C
-            result = self.a - self.c
-            self.flag_z = ((result & 0xFF) == 0)
-            self.flag_n = True
-            self.flag_h = ((self.a & 0x0F) < (self.c & 0x0F))
-            self.flag_c = (result < 0)
-            self.a = result & 0xFF
-            self.cycles += 4
-        elif opcode == 0x92:  # SUB D
-            result = self.a - self.d
-            self.flag_z = ((result & 0xFF) == 0)
-            self.flag_n = True
-            self.flag_h = ((self.a & 0x0F) < (self.d & 0x0F))
-            self.flag_c = (result < 0)
-            self.a = result & 0xFF
-            self.cycles += 4
-        elif opcode == 0x93:  # SUB E
-            result = self.a - self.e
-            self.flag_z = ((result & 0xFF) == 0)
-            self.flag_n = True
-            self.flag_h = ((self.a & 0x0F) < (self.e & 0x0F))
-            self.flag_c = (result < 0)
-            self.a = result & 0xFF
-            self.cycles += 4
-        elif opcode == 0xA9:  # XOR C
-#            logging.debug(f"[DEBUG] Executing XOR C at PC: 0x{self.pc:04X}")
-#            logging.debug(f"[DEBUG] Initial state: A=0x{self.a:02X}, C=0x{self.c:02X}, Z={self.flag_z}, N={self.flag_n}, H={self.flag_h}, C={self.flag_c}")
-            self.a ^= self.c
-            self.flag_z = (self.a == 0)
-            self.flag_n = False
-            self.flag_h = False
-            self.flag_c = False
-#            logging.debug(f"[DEBUG] Result: A=0x{self.a:02X}, Z={self.flag_z}, N={self.flag_n}, H={self.flag_h}, C={self.flag_c}")
-            self.cycles += 4
-        elif opcode == 0x27:  # DAA - Decimal Adjust Accumulator
-            # Correct DAA implementation for Game Boy
-            if not self.flag_n:  # After addition
-                if self.flag_c or self.a > 0x99:
-                    self.a = (self.a + 0x60) & 0xFF
-                    self.flag_c = True
-                if self.flag_h or (self.a & 0x0F) > 0x09:
-                    self.a = (self.a + 0x06) & 0xFF
-            else:  # After subtraction
-                if self.flag_c:
-                    self.a = (self.a - 0x60) & 0xFF
-                if self.flag_h:
-                    self.a = (self.a - 0x06) & 0xFF
-            
-            self.flag_z = (self.a == 0)
-            self.flag_h = False
-            self.cycles += 4
-        # HIGH PRIORITY ARITHMETIC OPERATIONS - Missing ADD A,r instructions
-        elif opcode == 0x82:  # ADD A,D
-            self.a = self.add_8bit(self.a, self.d)
-            self.cycles += 4
-        elif opcode == 0x84:  # ADD A,H
-            self.a = self.add_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0x85:  # ADD A,L
-            self.a = self.add_8bit(self.a, self.l)
-            self.cycles += 4
-        elif opcode == 0x90:  # SUB B
-            self.a = self.sub_8bit(self.a, self.b)
-            self.cycles += 4
-        elif opcode == 0x94:  # SUB H
-            self.a = self.sub_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0x95:  # SUB L
-            self.a = self.sub_8bit(self.a, self.l)
-            self.cycles += 4
-        elif opcode == 0x96:  # SUB (HL)
-            value = self.memory.read_byte(self.get_hl())
-            self.a = self.sub_8bit(self.a, value)
-            self.cycles += 8
-        elif opcode == 0x97:  # SUB A (always results in 0)
-            self.a = self.sub_8bit(self.a, self.a)
-            self.cycles += 4
-        # HIGH PRIORITY LOGICAL OPERATIONS - Missing AND operations
-        elif opcode == 0xA0:  # AND B
-            self.a = self.and_8bit(self.a, self.b)
-            self.cycles += 4
-        elif opcode == 0xA2:  # AND D
-            self.a = self.and_8bit(self.a, self.d)
-            self.cycles += 4
-        elif opcode == 0xA3:  # AND E
-            self.a = self.and_8bit(self.a, self.e)
-            self.cycles += 4
-        elif opcode == 0xA4:  # AND H
-            self.a = self.and_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0xA5:  # AND L
-            self.a = self.and_8bit(self.a, self.l)
-            self.cycles += 4
-        elif opcode == 0xA6:  # AND (HL)
-            self.a = self.and_8bit(self.a, self.memory.read_byte(self.get_hl()))
-            self.cycles += 8
-        # Missing XOR operations
-        elif opcode == 0xA8:  # XOR B
-            self.a = self.xor_8bit(self.a, self.b)
-            self.cycles += 4
-        elif opcode == 0xAA:  # XOR D
-            self.a = self.xor_8bit(self.a, self.d)
-            self.cycles += 4
-        elif opcode == 0xAB:  # XOR E
-            self.a = self.xor_8bit(self.a, self.e)
-            self.cycles += 4
-        elif opcode == 0xAC:  # XOR H
-            self.a = self.xor_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0xAD:  # XOR L
-            self.a = self.xor_8bit(self.a, self.l)
-            self.cycles += 4
-        # Missing OR operations
-        elif opcode == 0xB3:  # OR E
-            self.a = self.or_8bit(self.a, self.e)
-            self.cycles += 4
-        elif opcode == 0xB4:  # OR H
-            self.a = self.or_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0xB5:  # OR L
-            self.a = self.or_8bit(self.a, self.l)
-            self.cycles += 4
-        # MEDIUM PRIORITY - ADC operations (Add with carry)
-        elif opcode == 0x88:  # ADC A,B
-            self.a = self.adc_8bit(self.a, self.b)
-            self.cycles += 4
-        elif opcode == 0x89:  # ADC A,C
-            self.a = self.adc_8bit(self.a, self.c)
-            self.cycles += 4
-        elif opcode == 0x8A:  # ADC A,D
-            self.a = self.adc_8bit(self.a, self.d)
-            self.cycles += 4
-        elif opcode == 0x8B:  # ADC A,E
-            self.a = self.adc_8bit(self.a, self.e)
-            self.cycles += 4
-        elif opcode == 0x8C:  # ADC A,H
-            self.a = self.adc_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0x8D:  # ADC A,L
-            self.a = self.adc_8bit(self.a, self.l)
-            self.cycles += 4
-        elif opcode == 0x8E:  # ADC A,(HL)
-            value = self.memory.read_byte(self.get_hl())
-            self.a = self.adc_8bit(self.a, value)
-            self.cycles += 8
-        elif opcode == 0x8F:  # ADC A,A
-            self.a = self.adc_8bit(self.a, self.a)
-            self.cycles += 4
-        # SBC operations (Subtract with carry)
-        elif opcode == 0x98:  # SBC A,B
-            self.a = self.sbc_8bit(self.a, self.b)
-            self.cycles += 4
-        elif opcode == 0x99:  # SBC A,C
-            self.a = self.sbc_8bit(self.a, self.c)
-            self.cycles += 4
-        elif opcode == 0x9A:  # SBC A,D
-            self.a = self.sbc_8bit(self.a, self.d)
-            self.cycles += 4
-        elif opcode == 0x9B:  # SBC A,E
-            self.a = self.sbc_8bit(self.a, self.e)
-            self.cycles += 4
-        elif opcode == 0x9C:  # SBC A,H
-            self.a = self.sbc_8bit(self.a, self.h)
-            self.cycles += 4
-        elif opcode == 0x9D:  # SBC A,L
-            self.a = self.sbc_8bit(self.a, self.l)
-            self.cycles += 4
-        elif opcode == 0x9E:  # SBC A,(HL)
-            value = self.memory.read_byte(self.get_hl())
-            self.a = self.sbc_8bit(self.a, value)
-            self.cycles += 8
-        elif opcode == 0x9F:  # SBC A,A
-            self.a = self.sbc_8bit(self.a, self.a)
-            self.cycles += 4
-        elif opcode == 0xDE:  # SBC A,n
-            value = self.fetch_byte()
-            self.a = self.sbc_8bit(self.a, value)
-            self.cycles += 8
-        # Important system operations
-        elif opcode == 0x39:  # ADD HL,SP
-            hl = self.get_hl()
-            result = hl + self.sp
-            self.flag_n = False
-            self.flag_h = (hl & 0x0FFF) + (self.sp & 0x0FFF) > 0x0FFF
-            self.flag_c = result > 0xFFFF
-            self.set_hl(result & 0xFFFF)
-            self.cycles += 8
-        elif opcode == 0xF9:  # LD SP,HL
-            self.sp = self.get_hl()
-            self.cycles += 8
-        elif opcode == 0xE8:  # ADD SP,n (signed 8-bit immediate) - FIXED flag calculation
-            offset = self.fetch_byte()
-            # Convert to signed
-            if offset > 127:
-                signed_offset = offset - 256
-            else:
-                signed_offset = offset
-            result = self.sp + signed_offset
-            self.flag_z = False
-            self.flag_n = False
-            # Correct flag calculation for signed arithmetic
-            self.flag_h = ((self.sp & 0x0F) + (offset & 0x0F)) > 0x0F
-            self.flag_c = ((self.sp & 0xFF) + (offset & 0xFF)) > 0xFF
-            self.sp = result & 0xFFFF
-            self.cycles += 16
-        # RST operations (Restart - commonly used system calls)
-        elif opcode == 0xC7:  # RST 00H
-            self.push_word(self.pc)
-            self.pc = 0x0000
-            self.cycles += 16
-        elif opcode == 0xCF:  # RST 08H
-            self.push_word(self.pc)
-            self.pc = 0x0008
-            self.cycles += 16
-        elif opcode == 0xD7:  # RST 10H
-            self.push_word(self.pc)
-            self.pc = 0x0010
-            self.cycles += 16
-        elif opcode == 0xDF:  # RST 18H
-            self.push_word(self.pc)
-            self.pc = 0x0018
-            self.cycles += 16
-        elif opcode == 0xE7:  # RST 20H
-            self.push_word(self.pc)
-            self.pc = 0x0020
-            self.cycles += 16
-        elif opcode == 0xEF:  # RST 28H
-            self.push_word(self.pc)
-            self.pc = 0x0028
-            self.cycles += 16
-        elif opcode == 0xF7:  # RST 30H
-            self.push_word(self.pc)
-            self.pc = 0x0030
-            self.cycles += 16
-        elif opcode == 0xFF:  # RST 38H
-            self.push_word(self.pc)
-            self.pc = 0x0038
-            self.cycles += 16
-        # Memory operations
-        elif opcode == 0x08:  # LD (nn),SP
-            address = self.fetch_word()
-            self.memory.write_byte(address, self.sp & 0xFF)
-            self.memory.write_byte(address + 1, (self.sp >> 8) & 0xFF)
-            self.cycles += 20
-        else:
-            if self.debug:
-                print(f"Unimplemented opcode: 0x{opcode:02X} at PC: 0x{self.pc-1:04X}")
-            self.cycles += 4
+        # PPU更新（一括）
+        if self.memory.ppu is not None:
+            self.memory.ppu.step(cycles_to_run)
+            # LY/STATレジスタを更新
+            self.memory.io[0x44] = self.memory.ppu.get_ly()
+            self.memory.io[0x41] = self.memory.ppu.get_stat()
         
+        # APU更新（一括）
+        if self.memory.apu is not None:
+            self.memory.apu.step(cycles_to_run)
+        
+        self.cycles = target_cycle
+    
+    def execute_instruction(self, opcode: cython.int) -> None:
+        """Execute instruction based on opcode
+
+        256エントリのジャンプテーブルでO(1)ディスパッチ。
+        各ハンドラは_init_opcode_table()で事前登録済み。
+        """
+        # Track PC history for debugging
+        if self.debug:
+            if len(self._pc_history) >= 10:
+                self._pc_history.pop(0)
+            self._pc_history.append(self.pc - 1)
+
+        # O(1) dispatch: 単一のインデックス参照 + 呼び出し
+        self.opcode_table[opcode]()
+
         # 命令終了時にtimer/ppu/apuを一括更新（パフォーマンス最適化）
         self.run_until_cycle(self.cycles)
-    
+
     # === ARITHMETIC HELPER METHODS ===
-    def add_8bit(self, a, b):
+    def add_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit addition with proper flag setting"""
-        result = a + b
-        self.flag_h = (a & 0x0F) + (b & 0x0F) > 0x0F
-        self.flag_c = result > 0xFF
+        result: cython.int = a + b
+        f: cython.int = ((((a & 0x0F) + (b & 0x0F)) > 0x0F) << 5) | ((result > 0xFF) << 4)
         result &= 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = False
+        self.f = f | ((result == 0) << 7)
         return result
     
-    def sub_8bit(self, a, b):
+    def sub_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit subtraction with proper flag setting"""
-        result = a - b
-        self.flag_h = (a & 0x0F) < (b & 0x0F)
-        self.flag_c = result < 0
+        result: cython.int = a - b
+        f: cython.int = 0x40 | (((a & 0x0F) < (b & 0x0F)) << 5) | ((result < 0) << 4)
         result &= 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = True
+        self.f = f | ((result == 0) << 7)
         return result
     
-    def and_8bit(self, a, b):
+    def and_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit AND with proper flag setting"""
-        result = a & b
-        self.flag_z = (result == 0)
-        self.flag_n = False
-        self.flag_h = True
-        self.flag_c = False
+        result: cython.int = a & b
+        self.f = 0x20 | ((result == 0) << 7)
         return result
     
-    def xor_8bit(self, a, b):
+    def xor_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit XOR with proper flag setting"""
-        result = a ^ b
-        self.flag_z = (result == 0)
-        self.flag_n = False
-        self.flag_h = False
-        self.flag_c = False
+        result: cython.int = a ^ b
+        self.f = (result == 0) << 7
         return result
     
-    def or_8bit(self, a, b):
+    def or_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit OR with proper flag setting"""
-        result = a | b
-        self.flag_z = (result == 0)
-        self.flag_n = False
-        self.flag_h = False
-        self.flag_c = False
+        result: cython.int = a | b
+        self.f = (result == 0) << 7
         return result
     
-    def adc_8bit(self, a, b):
+    def adc_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit addition with carry"""
-        carry = 1 if self.flag_c else 0
-        result = a + b + carry
-        self.flag_h = (a & 0x0F) + (b & 0x0F) + carry > 0x0F
-        self.flag_c = result > 0xFF
+        carry: cython.int = (self.f >> 4) & 1
+        result: cython.int = a + b + carry
+        f: cython.int = ((((a & 0x0F) + (b & 0x0F) + carry) > 0x0F) << 5) | ((result > 0xFF) << 4)
         result &= 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = False
+        self.f = f | ((result == 0) << 7)
         return result
     
-    def sbc_8bit(self, a, b):
+    def sbc_8bit(self, a: cython.int, b: cython.int) -> cython.int:
         """8-bit subtraction with carry"""
-        carry = 1 if self.flag_c else 0
-        result = a - b - carry
-        self.flag_h = (a & 0x0F) < (b & 0x0F) + carry
-        self.flag_c = result < 0
+        carry: cython.int = (self.f >> 4) & 1
+        result: cython.int = a - b - carry
+        f: cython.int = 0x40 | (((a & 0x0F) < ((b & 0x0F) + carry)) << 5) | ((result < 0) << 4)
         result &= 0xFF
-        self.flag_z = (result == 0)
-        self.flag_n = True
+        self.f = f | ((result == 0) << 7)
         return result
     
     def read_byte(self, address):
@@ -2,9 +2,12 @@
 Main Game Boy Emulator class
 Coordinates CPU, memory, and other components.
 """
+import pickle
+
+import numpy
 import pygame
 
-from .cpu import CPU
+from .cpu import CPU, WATCH_PC, WATCH_OPCODE
 from .memory import Memory
 from .ppu import PPU
 from .apu import APU
@@ -51,6 +54,206 @@ class GameBoy:
         self.running = True  # エミュレータを実行状態に設定
         self.auto_exit = False  # 自動終了フラグ
         
+    def reset(self):
+        """実行状態を初期化し、同じインスタンスで次のROMを走らせる
+
+        テストランナーがROMごとにGameBoy()を作り直すと、メモリ配列や
+        オペコードテーブル（256クロージャ）、pygameウィンドウの再構築を
+        毎回払う。既存のバッファをin-placeでクリアして使い回す。
+        CPUハンドラは生成時にregs/wramを束縛しているため、再代入では
+        なくスライス代入で消すこと。ROM/Boot ROMの内容は保持される
+        （次のload_rom()が上書きし、レジスタ・I/Oの初期値も
+        post-boot初期化が設定し直す）。
+        """
+        mem = self.memory
+        mem.vram[:] = [0] * 0x2000
+        mem.eram[:] = [0] * 0x2000
+        mem.wram[:] = [0] * 0x2000
+        mem.oam[:] = [0] * 0xA0
+        mem.hram[:] = [0] * 0x7F
+        mem.io[:] = [0] * 0x80
+        mem.ie = 0
+        mem.rom_bank = 1
+        mem.ram_bank = 0
+        mem.banking_mode = 0
+        mem.ram_enabled = False
+        mem.boot_rom_enabled = False
+        mem.boot_disabled_cycle = -1
+        mem.init_post_boot_state()
+
+        cpu = self.cpu
+        cpu.cycles = 0
+        cpu.interrupt_master_enable = False
+        cpu.halted = False
+        cpu.ei_delay = 0
+        cpu.halt_bug_active = False
+        cpu.mooneye_complete = False
+        cpu._ff_count = 0
+        cpu._pc_history[:] = []
+
+        timer = self.timer
+        timer.DIV = 0
+        timer.TIMA = 0
+        timer.TMA = 0
+        timer.TAC = 0
+        timer.DIV_counter = 0
+        timer.TIMA_counter = 0
+        timer.system_counter = 0
+        timer.last_cycles = 0
+        timer._cycles_to_interrupt = 0x7FFFFFFFFFFFFFFF
+
+        ppu = self.ppu
+        ppu.cycles = 0
+        ppu.scan_line = 0
+        ppu.mode = 0
+        ppu._cycles_to_interrupt = 456
+        ppu.frame_buffer.fill(0)
+
+        serial = self.serial
+        serial.transfer_in_progress = False
+        serial.transfer_cycles = 0
+        serial.transfer_data = 0x00
+        serial.output_buffer = []
+        serial._text_parts = []
+        serial._text_cache = ""
+        serial._text_dirty = False
+
+        self.running = True
+
+    def snapshot(self):
+        """実行状態をbytesに直列化する（restore()と対）
+
+        Boot ROM〜初期化の数百万サイクルは決定的なので、解析スクリプトが
+        ウォームアップ結果をファイルに保存して使い回せるようにする。
+        ROM/Boot ROM本体は含まない: 同じROMをload_rom()済みの
+        インスタンスに対してrestore()すること。APUのチャネル内部状態
+        までは保存しない（解析用途のスナップショットであり、完全な
+        セーブステートではない）。
+
+        Returns:
+            restore()に渡せるbytes
+        """
+        mem = self.memory
+        cpu = self.cpu
+        timer = self.timer
+        ppu = self.ppu
+        serial = self.serial
+        state = {
+            'memory': {
+                'vram': bytes(mem.vram),
+                'eram': bytes(mem.eram),
+                'wram': bytes(mem.wram),
+                'oam': bytes(mem.oam),
+                'io': bytes(mem.io),
+                'hram': bytes(mem.hram),
+                'ie': mem.ie,
+                'rom_bank': mem.rom_bank,
+                'ram_bank': mem.ram_bank,
+                'banking_mode': mem.banking_mode,
+                'ram_enabled': mem.ram_enabled,
+                'boot_rom_enabled': mem.boot_rom_enabled,
+                'boot_disabled_cycle': mem.boot_disabled_cycle,
+            },
+            'cpu': {
+                'regs': bytes(cpu.regs),
+                'f': cpu.f,
+                'sp': cpu.sp,
+                'pc': cpu.pc,
+                'cycles': cpu.cycles,
+                'interrupt_master_enable': cpu.interrupt_master_enable,
+                'halted': cpu.halted,
+                'ei_delay': cpu.ei_delay,
+                'halt_bug_active': cpu.halt_bug_active,
+                'mooneye_complete': cpu.mooneye_complete,
+            },
+            'timer': {
+                'DIV': timer.DIV,
+                'TIMA': timer.TIMA,
+                'TMA': timer.TMA,
+                'TAC': timer.TAC,
+                'DIV_counter': timer.DIV_counter,
+                'TIMA_counter': timer.TIMA_counter,
+                'system_counter': timer.system_counter,
+                'last_cycles': timer.last_cycles,
+                '_cycles_to_interrupt': timer._cycles_to_interrupt,
+            },
+            'ppu': {
+                'cycles': ppu.cycles,
+                'scan_line': ppu.scan_line,
+                'mode': ppu.mode,
+                '_cycles_to_interrupt': ppu._cycles_to_interrupt,
+                'frame_buffer': ppu.frame_buffer.tobytes(),
+            },
+            'serial': {
+                'transfer_in_progress': serial.transfer_in_progress,
+                'transfer_cycles': serial.transfer_cycles,
+                'transfer_data': serial.transfer_data,
+                'output_buffer': list(serial.output_buffer),
+                '_text_parts': list(serial._text_parts),
+            },
+        }
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, blob):
+        """snapshot()で保存した実行状態を復元する
+
+        reset()同様、CPUハンドラのクロージャが束縛しているバッファは
+        再代入せずin-placeで書き戻す。
+        """
+        state = pickle.loads(blob)
+
+        mem = self.memory
+        ms = state['memory']
+        mem.vram[:] = ms['vram']
+        mem.eram[:] = ms['eram']
+        mem.wram[:] = ms['wram']
+        mem.oam[:] = ms['oam']
+        mem.io[:] = ms['io']
+        mem.hram[:] = ms['hram']
+        mem.ie = ms['ie']
+        mem.rom_bank = ms['rom_bank']
+        mem.ram_bank = ms['ram_bank']
+        mem.banking_mode = ms['banking_mode']
+        mem.ram_enabled = ms['ram_enabled']
+        mem.boot_rom_enabled = ms['boot_rom_enabled']
+        mem.boot_disabled_cycle = ms['boot_disabled_cycle']
+
+        cpu = self.cpu
+        cs = state['cpu']
+        cpu.regs[:] = cs['regs']
+        cpu.f = cs['f']
+        cpu.sp = cs['sp']
+        cpu.pc = cs['pc']
+        cpu.cycles = cs['cycles']
+        cpu.interrupt_master_enable = cs['interrupt_master_enable']
+        cpu.halted = cs['halted']
+        cpu.ei_delay = cs['ei_delay']
+        cpu.halt_bug_active = cs['halt_bug_active']
+        cpu.mooneye_complete = cs['mooneye_complete']
+
+        timer = self.timer
+        for name, value in state['timer'].items():
+            setattr(timer, name, value)
+
+        ppu = self.ppu
+        ps = state['ppu']
+        ppu.cycles = ps['cycles']
+        ppu.scan_line = ps['scan_line']
+        ppu.mode = ps['mode']
+        ppu._cycles_to_interrupt = ps['_cycles_to_interrupt']
+        ppu.frame_buffer[:] = numpy.frombuffer(
+            ps['frame_buffer'], dtype=numpy.uint8).reshape(ppu.frame_buffer.shape)
+
+        serial = self.serial
+        ss = state['serial']
+        serial.transfer_in_progress = ss['transfer_in_progress']
+        serial.transfer_cycles = ss['transfer_cycles']
+        serial.transfer_data = ss['transfer_data']
+        serial.output_buffer = list(ss['output_buffer'])
+        serial._text_parts = list(ss['_text_parts'])
+        serial._text_cache = ""
+        serial._text_dirty = True
+
     def set_auto_exit(self, enable):
         """自動終了モードの設定"""
         self.auto_exit = enable
@@ -306,23 +509,9 @@ class GameBoy:
             print(f"[BATCH] Target: {cycles_target}, Timer: {self.timer._cycles_to_interrupt}, PPU: {self.ppu._cycles_to_interrupt}")
             self._batch_debug_count += 1
 
-        # 目標サイクルまで実行
-        cycles_start = self.cpu.cycles
-        cycles_executed = 0
-
-        while cycles_executed < cycles_target and self.running:
-            # 1命令実行
-            cycles_before = self.cpu.cycles
-            self.cpu.step()
-            cpu_cycles = self.cpu.cycles - cycles_before
-            cycles_executed += cpu_cycles
-
-            # HALT状態チェック
-            if self.cpu.halted:
-                break
-
-        # 実行後の同期処理（既存のstep()と同じ）
-        total_cycles = self.cpu.cycles - cycles_start
+        # 目標サイクルまでCPU側のタイトループで実行
+        # （命令ごとのstep()往復とサイクル差分計算をCPU内に畳み込む）
+        total_cycles = self.cpu.run_slice(self.cpu.cycles + cycles_target)
 
         # Timer更新
         timer_interrupt_occurred = self.timer.tick(self.cpu.cycles)
@@ -342,7 +531,61 @@ class GameBoy:
         self.memory.io[0x41] = stat
 
         return total_cycles
-    
+
+    def run_until(self, cycle_target, pc_watch=None, opcode_watch=None):
+        """監視イベントかサイクル上限まで一気に実行（解析・テスト用）
+
+        解析ドライバが1命令ごとにgameboy.step()を呼ぶPythonループを
+        回す代わりに、CPU側のタイトループ（run_watch）で数千命令単位に
+        ドレインし、監視イベント発生時のみ戻る。コンポーネント同期は
+        run_until_interrupt()と同じバッチ手順で行う。
+
+        Args:
+            cycle_target: 実行を打ち切る累積サイクル数（cpu.cycles基準）
+            pc_watch: 到達で停止するPCの集合。Noneで無効
+            opcode_watch: 検出で停止するオペコード。Noneで無効
+
+        Returns:
+            停止理由: "cycle_limit" / "pc" / "opcode"
+        """
+        watch_op = -1 if opcode_watch is None else opcode_watch
+        while self.cpu.cycles < cycle_target:
+            # 次のコンポーネントイベントまでをバッチ境界にする
+            batch = min(
+                self.timer._cycles_to_interrupt,
+                self.ppu._cycles_to_interrupt,
+                self.apu._cycles_to_interrupt
+            )
+            if batch < 4:
+                batch = 4
+            budget = min(cycle_target, self.cpu.cycles + batch)
+
+            start = self.cpu.cycles
+            event = self.cpu.run_watch(budget, pc_watch, watch_op)
+            used = self.cpu.cycles - start
+
+            # Timer更新
+            timer_interrupt_occurred = self.timer.tick(self.cpu.cycles)
+            if timer_interrupt_occurred:
+                if_reg = self.memory.read_byte(0xFF0F)
+                if not (if_reg & 0x04):
+                    self.memory.write_byte(0xFF0F, if_reg | 0x04)
+
+            # PPU/APU/Serial更新
+            self.ppu.step(used)
+            self.apu.step(used)
+            self.serial.update(used)
+
+            # Memory registers更新
+            self.memory.io[0x44] = self.ppu.get_ly()
+            self.memory.io[0x41] = self.ppu.get_stat()
+
+            if event == WATCH_PC:
+                return "pc"
+            if event == WATCH_OPCODE:
+                return "opcode"
+        return "cycle_limit"
+
     def stop(self):
         """Stop the emulator"""
         self.running = False
\ No newline at end of file
@@ -41,6 +41,10 @@ class Memory:
         # Boot ROM
         self.boot_rom: list = [0] * 0x100
         self.boot_rom_enabled: cython.bint = False  # Start with boot ROM disabled (post-boot state)
+        # 0xFF50への非ゼロ書き込み時にMMUが記録するCPUサイクル（-1=未発生）。
+        # 解析スクリプトが毎命令read_byte(0xFF50)でポーリングする代わりに
+        # この属性を直接参照して遷移をO(1)で検出できる
+        self.boot_disabled_cycle: cython.longlong = -1
         
         # Initialize I/O registers to Boot ROM completion state (DMG)
         self.init_post_boot_state()
@@ -491,6 +495,9 @@ class Memory:
             elif address == 0xFF50:  # Boot ROM disable register
                 if value != 0:
                     self.boot_rom_enabled = False
+                    if self.boot_disabled_cycle < 0:
+                        self.boot_disabled_cycle = (
+                            self.cpu.cycles if hasattr(self, 'cpu') and self.cpu else 0)
                 self.io[address - 0xFF00] = value
             elif 0xFF10 <= address <= 0xFF3F and self.apu:  # Audio registers
                 self.apu.write_register(address, value)
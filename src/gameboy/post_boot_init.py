@@ -24,11 +24,8 @@ def init_post_boot_dmg(cpu, memory, timer, apu, ppu):
     cpu.sp = 0xFFFE
     cpu.pc = 0x0100
     
-    # フラグ初期化 (Z=1, N=0, H=1, C=1)
-    cpu.flag_z = True
-    cpu.flag_n = False
-    cpu.flag_h = True
-    cpu.flag_c = True
+    # フラグ初期化 (F=0xB0: Z=1, N=0, H=1, C=1)
+    cpu.set_f(0xB0)
     
     # I/Oレジスタの初期化
     memory.io[0x00] = 0xCF  # P1
@@ -103,11 +100,8 @@ def init_post_boot_test_rom(cpu, memory, timer, ppu, apu):
     cpu.sp = 0xFFFE
     cpu.pc = 0x0100
     
-    # フラグ初期化 (Z=1, N=0, H=1, C=1)
-    cpu.flag_z = True
-    cpu.flag_n = False
-    cpu.flag_h = True
-    cpu.flag_c = True
+    # フラグ初期化 (F=0xB0: Z=1, N=0, H=1, C=1)
+    cpu.set_f(0xB0)
     
     # I/Oレジスタの初期化
     memory.io[0x00] = 0xCF  # P1
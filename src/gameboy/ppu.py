@@ -128,6 +128,13 @@ class PPU:
             pygame.font.init()
             self.font = pygame.font.Font(None, 24)  # Font for FPS and serial overlay
 
+            # レンダリング資源はここで確保しておく（初回フレーム内での
+            # 遅延確保をやめ、フレーム計測区間の外にウォームアップを移動）
+            self._palette_array = numpy.array(self.palette, dtype=numpy.uint8)
+            self._rgb_buffer = numpy.zeros((self.screen_height, self.screen_width, 3), dtype=numpy.uint8)
+            self._frame_surface = pygame.Surface((self.screen_width, self.screen_height))
+            self._scaled_surface = pygame.Surface((self.screen_width * self.scale, self.screen_height * self.scale))
+
             if self.debug:
                 print(f"🎮 Pygame window created: {self.screen_width * self.scale}x{self.screen_height * self.scale}")
                 print("📺 Look for the Game Boy Emulator window - it should be visible now!")
@@ -399,23 +406,8 @@ class PPU:
             return True
         
         # === OPTIMIZED RENDERING PIPELINE ===
-        
-        # Initialize reusable resources on first render
-        if not hasattr(self, '_palette_array'):
-            self._palette_array = numpy.array(self.palette, dtype=numpy.uint8)
-        
-        if not hasattr(self, '_rgb_buffer'):
-            self._rgb_buffer = numpy.zeros((self.screen_height, self.screen_width, 3), dtype=numpy.uint8)
-        
-        if not hasattr(self, '_frame_surface'):
-            # Create reusable surface - will be updated in-place
-            self._frame_surface = pygame.Surface((self.screen_width, self.screen_height))
-        
-        if not hasattr(self, '_scaled_surface'):
-            # Create reusable scaled surface
-            scaled_size = (self.screen_width * self.scale, self.screen_height * self.scale)
-            self._scaled_surface = pygame.Surface(scaled_size)
-        
+        # （再利用資源は__init__で確保済み — per-frameのhasattrチェック不要）
+
         # Use the current frame buffer directly (no copy needed)
         active_buffer = self.frame_buffer
         
@@ -892,9 +884,10 @@ class PPU:
         
         # Extract sprite attributes
         palette_num = (attributes >> 4) & 1  # Bit 4: palette number
-        x_flip = bool(attributes & 0x20)     # Bit 5: X flip
-        y_flip = bool(attributes & 0x40)     # Bit 6: Y flip
-        bg_priority = bool(attributes & 0x80) # Bit 7: BG priority
+        # 真偽値としてしか使わないためbool()コストは不要（0/非0のまま）
+        x_flip = attributes & 0x20       # Bit 5: X flip
+        y_flip = attributes & 0x40       # Bit 6: Y flip
+        bg_priority = attributes & 0x80  # Bit 7: BG priority
         
         # Calculate which line of the sprite we're rendering
         sprite_line = self.scan_line - y_pos
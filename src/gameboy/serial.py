@@ -24,7 +24,11 @@ class SerialPort:
         
         # Output buffer for test ROM results
         self.output_buffer = []
-        self.text_output = ""
+        # テキストは1バイトごとのstr連結（毎回新オブジェクト生成でO(n^2)）を
+        # 避けるため文字のlistへ蓄積し、参照時にjoinした結果をキャッシュする
+        self._text_parts = []
+        self._text_cache = ""
+        self._text_dirty = False
         
         # Debug logging
         self.debug = False
@@ -93,10 +97,12 @@ class SerialPort:
         
         # Convert to text if printable
         if 32 <= sb <= 126:
-            self.text_output += chr(sb)
+            self._text_parts.append(chr(sb))
+            self._text_dirty = True
             print(f"📤 Serial Output: '{chr(sb)}'")
         elif sb == 0x0A:  # Newline
-            self.text_output += '\n'
+            self._text_parts.append('\n')
+            self._text_dirty = True
             print(f"📤 Serial Output: [NEWLINE]")
             print(f"📝 Complete Line: \"{self.text_output.rstrip()}\"")
             
@@ -140,6 +146,14 @@ class SerialPort:
             if self.transfer_cycles >= self.cycles_per_byte:
                 self.complete_transfer()
                 
+    @property
+    def text_output(self):
+        """蓄積テキスト（初回参照時にjoinし、以後はキャッシュを返す）"""
+        if self._text_dirty:
+            self._text_cache = ''.join(self._text_parts)
+            self._text_dirty = False
+        return self._text_cache
+
     def get_full_output(self):
         """Get the full, unprocessed text output."""
         return self.text_output
@@ -159,7 +173,9 @@ class SerialPort:
     def clear_output(self):
         """Clear output buffers"""
         self.output_buffer.clear()
-        self.text_output = ""
+        self._text_parts.clear()
+        self._text_cache = ""
+        self._text_dirty = False
         
     def set_debug(self, debug):
         """Enable/disable debug output"""
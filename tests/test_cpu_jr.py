@@ -0,0 +1,54 @@
+"""
+Regression tests for relative jump (JR) target calculation
+
+The JR target is the PC *after* the operand fetch plus the sign-extended
+offset. Folding the fetch into the PC expression once landed targets one
+byte short (the left operand was evaluated before fetch_byte advanced
+PC), so these pin the exact forward and backward targets for both the
+unconditional JR and the cc-factory handlers.
+"""
+
+
+def test_jr_forward(cpu, memory):
+    # 0xC000: JR +2 -> operand fetched, PC=0xC002, +2 = 0xC004
+    memory.wram[0:2] = [0x18, 0x02]
+    cpu.pc = 0xC000
+    cpu.step()
+    assert cpu.pc == 0xC004
+    assert cpu.cycles == 12
+
+
+def test_jr_backward(cpu, memory):
+    # 0xC010: JR -4 -> PC=0xC012 after fetch, -4 = 0xC00E
+    memory.wram[0x10:0x12] = [0x18, 0xFC]
+    cpu.pc = 0xC010
+    cpu.step()
+    assert cpu.pc == 0xC00E
+
+
+def test_jr_zero_offset(cpu, memory):
+    # JR 0 is a 2-byte jump to the following instruction
+    memory.wram[0:2] = [0x18, 0x00]
+    cpu.pc = 0xC000
+    cpu.step()
+    assert cpu.pc == 0xC002
+
+
+def test_jr_cc_taken_matches_unconditional(cpu, memory):
+    # JR NZ with Z clear must land on the same target as JR
+    memory.wram[0:2] = [0x20, 0x02]
+    cpu.pc = 0xC000
+    cpu.f = 0x00
+    cpu.step()
+    assert cpu.pc == 0xC004
+    assert cpu.cycles == 12
+
+
+def test_jr_cc_not_taken_falls_through(cpu, memory):
+    # JR NZ with Z set skips the operand and continues
+    memory.wram[0:2] = [0x20, 0x02]
+    cpu.pc = 0xC000
+    cpu.f = 0x80
+    cpu.step()
+    assert cpu.pc == 0xC002
+    assert cpu.cycles == 8